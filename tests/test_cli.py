@@ -0,0 +1,92 @@
+import json
+import time
+from datetime import date
+
+import pytest
+
+from todo_core.cli import main
+from todo_core.timelog import TIME_LOG, TimeLog
+
+
+@pytest.fixture
+def run(tmp_path, capsys):
+	def run(*argv):
+		status = main(list(argv), data_dir=str(tmp_path))
+		out, err = capsys.readouterr()
+		return status, out.splitlines(), err
+	return run
+
+
+def test_add_list_complete(run):
+	status, out, _ = run("add", "buy", "milk", "-c", "Home", "-p", "high", "-d", "2026-01-05")
+	assert status == 0
+	task_id = out[0].split()[0]
+	assert out[0].endswith("Home: buy milk")
+	run("add", "write report", "-c", "Work")
+
+	status, out, _ = run("list")
+	assert status == 0
+	assert len(out) == 2
+
+	status, out, _ = run("list", "--json", "-c", "Home")
+	item = json.loads(out[0])
+	assert (item["id"], item["category"], item["priority"], item["deadline"]) == (task_id, "Home", "High", "2026-01-05")
+
+	status, out, _ = run("complete", task_id[:6])
+	assert status == 0
+	assert run("list", "-s", "done")[1] == out
+	assert len(run("list", "-s", "open")[1]) == 1
+	assert run("list", "--search", "REPORT", "-n", "1")[1][0].endswith("Work: write report")
+
+
+def test_complete_unknown_id(run):
+	run("add", "something")
+	status, out, err = run("complete", "zzzz")
+	assert status == 1
+	assert "no task matches 'zzzz'" in err
+
+
+def test_stats(run):
+	_, out, _ = run("add", "one")
+	run("complete", out[0].split()[0])
+	run("add", "two")
+	status, out, _ = run("stats", "--days", "3")
+	assert status == 0
+	assert out[0] == "Tasks: 2  done: 1  open: 1"
+	assert out[2] == "Streak: 1 day(s)  longest: 1"
+	assert f"  {date.today().isoformat()}     1  #" in out
+
+	report = json.loads("\n".join(run("stats", "--json")[1]))
+	assert report["completed_today"] == 1
+	assert report["categories"] == {"General": {"done": 1, "total": 2}}
+
+
+def test_export_import(run, tmp_path):
+	run("add", "keep me", "-c", "Work")
+	export = str(tmp_path / "export.json")
+	assert run("export", export)[1] == [f"Exported 1 tasks to {export}"]
+	run("import", export, "--merge")
+	assert len(run("list")[1]) == 2
+	assert run("import", export)[1] == [f"Imported 1 tasks from {export}"]
+	assert len(run("list")[1]) == 1
+
+
+def test_time(run, tmp_path):
+	_, out, _ = run("add", "focus", "-c", "Work", "-p", "Low")
+	task_id = out[0].split()[0]
+
+	class Task:
+		id, category, priority = task_id, "Work", "Low"
+
+	# Today at 10:00, so the interval never straddles midnight
+	start = time.mktime(date.today().timetuple()) + 10 * 3600
+	TimeLog(str(tmp_path / TIME_LOG)).record(Task, start, start + 90)
+	status, out, _ = run("time", "--all")
+	assert status == 0
+	assert out[0] == "Time tracked in total: 0:01:30"
+	assert "  Work: 0:01:30" in out
+	assert "  Low: 0:01:30" in out
+
+	report = json.loads("\n".join(run("time", "--json", "--days", "1")[1]))
+	assert report["total"] == 90
+	assert report["categories"] == {"Work": 90}
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from todo_core import imagecache
+from todo_core.imagecache import AssetImageCache, FrameTiming
+
+
+class FakeFrame:
+	def __init__(self, width, height, index=0):
+		self.width, self.height, self.index = width, height, index
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+	"""Count decodes; a file holds 4 frames of 10x10 shown 50 ms each."""
+	calls = {"file": 0, "frame": 0}
+
+	def decode_frames(path):
+		calls["file"] += 1
+		return [FakeFrame(10, 10, i) for i in range(4)], [50] * 4
+
+	def decode_frame(path, index):
+		calls["frame"] += 1
+		return FakeFrame(10, 10, index)
+
+	monkeypatch.setattr(imagecache, "decode_frames", decode_frames)
+	monkeypatch.setattr(imagecache, "decode_frame", decode_frame)
+	monkeypatch.setattr(imagecache, "resize_frame", lambda source, w, h: (source.index, w, h))
+	return calls
+
+
+@pytest.fixture
+def asset(tmp_path):
+	path = str(tmp_path / "cat.gif")
+	with open(path, "wb") as f:
+		f.write(b"GIF89a")
+	return path
+
+
+def test_frame_timing():
+	timing = FrameTiming([0, 200, 50])
+	assert timing.durations == [100, 200, 50]
+	assert [timing.frame_at(ms) for ms in (0, 99, 100, 299, 300, 349, 350)] == [0, 0, 1, 1, 2, 2, 0]
+	assert FrameTiming([0]).frame_at(12345) == 0
+
+
+def test_hits_do_not_decode(decodes, asset):
+	cache = AssetImageCache()
+	assert cache.image(asset, 5, scale=2.0) == (1, 20, 20)
+	assert decodes["file"] == 1
+	cache.frames.clear()
+	# The resized image and the timing are still cached: no pixels needed
+	for _ in range(3):
+		assert cache.image(asset, 1, scale=2.0) == (1, 20, 20)
+		assert cache.timing(asset).frame_at(120) == 2
+	assert decodes["file"] == 1
+
+
+def test_oversized_files_decode_one_frame(decodes, asset, capsys):
+	cache = AssetImageCache(frame_bytes=100)
+	for frame in range(8):
+		cache.image(asset, frame)
+	assert decodes["file"] == 1
+	assert decodes["frame"] == 4
+	assert capsys.readouterr().out.count("frame cache") == 1
+
+
+def test_refresh_drops_changed_files(decodes, asset):
+	cache = AssetImageCache()
+	cache.image(asset)
+	assert not cache.refresh(asset)
+	with open(asset, "ab") as f:
+		f.write(b"more")
+	assert cache.refresh(asset)
+	assert len(cache.images) == 0
+	cache.image(asset)
+	assert decodes["file"] == 2
+	os.remove(asset)
+	cache.invalidate(asset)
+	with pytest.raises(FileNotFoundError):
+		cache.image(asset)
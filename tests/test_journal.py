@@ -0,0 +1,111 @@
+import os
+
+from todo_core import journal
+from todo_core.persistence import write_json_atomic
+from todo_core.store import TaskStore
+from todo_core.streaming import load_file
+
+
+def _document(store, state):
+	data = store.to_document()
+	data["stats"] = {"daily_counts": dict(state.get("daily_counts", {}))}
+	return data
+
+
+def _reload(path):
+	store, fields, _ = load_file(path)
+	state = {"daily_counts": dict((fields or {}).get("stats", {}).get("daily_counts", {}))}
+	return store, state, journal.replay(store, path, state)
+
+
+def _open(tmp_path):
+	path = str(tmp_path / "tasks.json")
+	store = TaskStore()
+	state = {}
+	write_json_atomic(path, _document(store, state))
+	j = journal.Journal(path, lambda: _document(store, state), compact_after=1000)
+	j.attach(store)
+	return path, store, state, j
+
+
+def test_replay_restores_changes(tmp_path):
+	path, store, state, j = _open(tmp_path)
+	a = store.add_task("Work", "write report", priority="High")
+	b = store.add_task("Work", "call bob")
+	c = store.add_task("Home", "water plants", deadline="2026-01-02")
+	store.set_done(a.id, True, "2026-01-01")
+	store.update_task(b.id, text="call bob back")
+	store.move_task(c.id, "Work", 0)
+	store.remove_task(b.id)
+	store.set_category_meta("Home", open_state=False, color="#ff0000")
+	j.append({"op": "stats", "day": "2026-01-01", "count": 1})
+	j.append({"op": "theme", "name": "dark"})
+	j.sync()
+	assert j.last_save_time is not None
+
+	# A crash: tasks.json is still the empty snapshot
+	loaded, loaded_state, applied = _reload(path)
+	assert applied >= 10
+	assert loaded.to_document() == store.to_document()
+	assert loaded_state["daily_counts"] == {"2026-01-01": 1}
+	assert loaded_state["theme"] == "dark"
+	# Replaying again on top is harmless
+	assert journal.replay(loaded, path, loaded_state) == applied
+	assert loaded.to_document() == store.to_document()
+	j.close(compact=False)
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+	path, store, state, j = _open(tmp_path)
+	store.add_task("Work", "kept")
+	j.close(compact=False)
+	with open(journal.journal_path(path), "a", encoding="utf-8") as f:
+		f.write('{"op":"add","cat":"Work","ta')
+	loaded, _, applied = _reload(path)
+	assert applied
+	assert [task.text for task in loaded.iter_tasks()] == ["kept"]
+
+
+def test_compaction_writes_snapshot(tmp_path):
+	path, store, state, j = _open(tmp_path)
+	for n in range(5):
+		store.add_task("Work", f"task {n}")
+	assert j.compact()
+	assert j.wait(timeout=5)
+	assert j.last_error is None
+	assert j.records == 0
+	assert not os.path.exists(journal.journal_path(path) + ".1")
+
+	store.add_task("Home", "after compaction")
+	j.sync()
+	loaded, _, applied = _reload(path)
+	assert applied
+	assert loaded.to_document() == store.to_document()
+
+	assert j.close()
+	loaded, _, applied = _reload(path)
+	assert applied == 0
+	assert loaded.to_document() == store.to_document()
+
+
+def test_compaction_after_threshold(tmp_path):
+	path, store, state, j = _open(tmp_path)
+	j.compact_after = 3
+	for n in range(3):
+		store.add_task("Work", f"task {n}")
+	j.sync()
+	assert j.wait(timeout=5)
+	assert j.records == 0
+	loaded, _, applied = _reload(path)
+	assert applied == 0
+	assert len(loaded) == 3
+	j.close()
+
+
+def test_discard_removes_segments(tmp_path):
+	path, store, state, j = _open(tmp_path)
+	store.add_task("Work", "x")
+	j.close(compact=False)
+	journal.discard(path)
+	assert not os.path.exists(journal.journal_path(path))
+	assert _reload(path)[2] == 0
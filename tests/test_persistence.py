@@ -0,0 +1,143 @@
+import json
+import os
+import time
+
+import pytest
+
+from todo_core.autosave import Autosaver
+from todo_core.persistence import (BACKUP_INTERVAL, backup_path, copy_file_atomic, read_json_verified,
+								   write_json_atomic, write_stream_atomic)
+
+
+def _read(path):
+	with open(path, "r", encoding="utf-8") as f:
+		return json.load(f)
+
+
+def _age_backup(path, seconds=BACKUP_INTERVAL + 1):
+	stamp = time.time() - seconds
+	os.utime(backup_path(path, 1), (stamp, stamp))
+
+
+def test_write_json_atomic_round_trip(tmp_path):
+	path = str(tmp_path / "tasks.json")
+	data = {"tasks_by_category": {"Work": [{"text": "Résumé", "done": False}]}}
+	write_json_atomic(path, data)
+	assert _read(path) == data
+	write_json_atomic(path, data, compact=True)
+	assert _read(path) == data
+	with open(path, "r", encoding="utf-8") as f:
+		assert "\n" not in f.read()
+	# Only the file and its first backup, no temp files left behind
+	assert sorted(os.listdir(tmp_path)) == ["tasks.json", "tasks.json.bak1"]
+
+
+def test_failed_write_keeps_old_file(tmp_path):
+	path = str(tmp_path / "tasks.json")
+	write_json_atomic(path, {"n": 1})
+
+	def verify(tmp):
+		raise ValueError("bad")
+
+	with pytest.raises(ValueError):
+		write_stream_atomic(path, lambda f: f.write("{broken"), verify=verify)
+	assert _read(path) == {"n": 1}
+	assert sorted(os.listdir(tmp_path)) == ["tasks.json"]
+
+
+def test_backups_rotate_at_most_once_per_interval(tmp_path):
+	path = str(tmp_path / "tasks.json")
+	write_json_atomic(path, {"n": 1})
+	assert not os.path.exists(backup_path(path, 1))
+	write_json_atomic(path, {"n": 2})
+	assert _read(backup_path(path, 1)) == {"n": 1}
+	# Rapid saves overwrite the main file but leave the backup alone
+	for n in range(3, 10):
+		write_json_atomic(path, {"n": n})
+	assert _read(path) == {"n": 9}
+	assert _read(backup_path(path, 1)) == {"n": 1}
+	assert not os.path.exists(backup_path(path, 2))
+
+	_age_backup(path)
+	write_json_atomic(path, {"n": 10})
+	assert _read(backup_path(path, 1)) == {"n": 9}
+	assert _read(backup_path(path, 2)) == {"n": 1}
+
+
+def test_backups_are_capped(tmp_path):
+	path = str(tmp_path / "tasks.json")
+	for n in range(6):
+		if os.path.exists(backup_path(path, 1)):
+			_age_backup(path)
+		write_json_atomic(path, {"n": n}, backups=2)
+	assert _read(backup_path(path, 1)) == {"n": 4}
+	assert _read(backup_path(path, 2)) == {"n": 3}
+	assert not os.path.exists(backup_path(path, 3))
+
+
+def test_read_falls_back_to_backup(tmp_path):
+	path = str(tmp_path / "tasks.json")
+	write_json_atomic(path, {"n": 1})
+	write_json_atomic(path, {"n": 2})
+	with open(path, "w", encoding="utf-8") as f:
+		f.write('{"n": ')
+	assert read_json_verified(path) == ({"n": 1}, backup_path(path, 1))
+	os.remove(backup_path(path, 1))
+	with pytest.raises(ValueError):
+		read_json_verified(path)
+
+
+def test_autosaver_writes_latest_snapshot(tmp_path):
+	path = str(tmp_path / "tasks.json")
+	saver = Autosaver(interval=60)
+	try:
+		saver.submit(path, {"n": 1})
+		saver.submit(path, {"n": 2})
+		assert saver.flush(timeout=5)
+		assert _read(path) == {"n": 2}
+		assert saver.last_save_time is not None
+
+		other = str(tmp_path / "other.txt")
+		saver.submit_write(other, lambda target: write_stream_atomic(target, lambda f: f.write("hello")))
+		assert saver.flush(timeout=5)
+		with open(other, "r", encoding="utf-8") as f:
+			assert f.read() == "hello"
+	finally:
+		saver.stop(timeout=5)
+
+
+def test_autosaver_reports_errors(tmp_path):
+	saver = Autosaver(interval=60)
+
+	def fail(target):
+		raise OSError("disk full")
+
+	try:
+		saver.submit_write(str(tmp_path / "x"), fail)
+		assert not saver.flush(timeout=5)
+		assert isinstance(saver.last_error, OSError)
+	finally:
+		saver.stop(timeout=5)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_writes_keep_file_mode(tmp_path):
+	path = str(tmp_path / "tasks.json")
+	write_json_atomic(path, {"n": 1})
+	umask = os.umask(0)
+	os.umask(umask)
+	assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask
+	os.chmod(path, 0o640)
+	write_json_atomic(path, {"n": 2})
+	assert os.stat(path).st_mode & 0o777 == 0o640
+
+	src = str(tmp_path / "image.png")
+	with open(src, "wb") as f:
+		f.write(b"png")
+	os.chmod(src, 0o600)
+	dest = str(tmp_path / "assets" / "image.png")
+	copy_file_atomic(src, dest)
+	assert os.stat(dest).st_mode & 0o777 == 0o666 & ~umask
+	os.chmod(dest, 0o644)
+	copy_file_atomic(src, dest)
+	assert os.stat(dest).st_mode & 0o777 == 0o644
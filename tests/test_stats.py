@@ -0,0 +1,88 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from todo_core.stats import DailySeries, set_done, summary
+from todo_core.store import TaskStore
+
+START = date(2025, 12, 1)
+
+
+def _random_counts(seed, days=120):
+	rng = random.Random(seed)
+	return {(START + timedelta(days=rng.randrange(days))).isoformat(): rng.randint(0, 5) for _ in range(days // 2)}
+
+
+def _brute_total(counts, start, end):
+	return sum(n for day, n in counts.items() if start <= date.fromisoformat(day) < end)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_total_and_window_match_brute_force(seed):
+	counts = _random_counts(seed)
+	series = DailySeries(counts)
+	rng = random.Random(seed)
+	for _ in range(200):
+		start = START + timedelta(days=rng.randint(-10, 130))
+		end = start + timedelta(days=rng.randint(0, 60))
+		assert series.total(start, end) == _brute_total(counts, start, end)
+		assert series.window(start, 10) == [counts.get((start + timedelta(days=n)).isoformat(), 0)
+											 for n in range(10)]
+		# Updates land anywhere, including before the current origin
+		day = START + timedelta(days=rng.randint(-20, 140))
+		delta = rng.randint(-2, 3)
+		series.add(day, delta)
+		key = day.isoformat()
+		counts[key] = max(0, counts.get(key, 0) + delta)
+
+
+def test_rollup_and_moving_average():
+	counts = _random_counts(7, days=400)
+	series = DailySeries(counts)
+	end = START + timedelta(days=400)
+	for period in ("week", "month", "year"):
+		rows = series.rollup(period, START, end)
+		assert sum(total for _, total in rows) == _brute_total(counts, START, end)
+		for (first, total), (after, _) in zip(rows[1:], rows[2:]):
+			assert total == _brute_total(counts, first, after)
+	assert all(first.weekday() == 0 for first, _ in series.rollup("week", START, end))
+	with pytest.raises(ValueError):
+		series.rollup("decade", START, end)
+
+	averages = series.moving_average(START, 30, width=7)
+	for n, value in enumerate(averages):
+		day = START + timedelta(days=n)
+		assert value == pytest.approx(_brute_total(counts, day - timedelta(days=6), day + timedelta(days=1)) / 7)
+
+
+def test_streaks():
+	days = ["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-06", "2026-01-07"]
+	series = DailySeries({day: 1 for day in days})
+	assert series.streaks(date(2026, 1, 7)) == (2, 3)
+	# Today has none yet: the streak up to yesterday still counts
+	assert series.streaks(date(2026, 1, 8)) == (2, 3)
+	assert series.streaks(date(2026, 1, 9)) == (0, 3)
+	series.set("2026-01-05", 2)
+	series.set("2026-01-04", 1)
+	assert series.streaks(date(2026, 1, 7)) == (7, 7)
+	assert DailySeries().streaks() == (0, 0)
+
+
+def test_set_done_keeps_counts_and_summary():
+	store = TaskStore()
+	counts = {}
+	a = store.add_task("Work", "a", deadline="2026-01-01")
+	b = store.add_task("Work", "b", deadline="2026-01-03")
+	assert set_done(store, counts, a.id, True, "2026-01-02") == (True, "2026-01-02")
+	assert set_done(store, counts, a.id, True) == (False, None)
+	set_done(store, counts, b.id, True, "2026-01-02")
+	assert counts == {"2026-01-02": 2}
+	assert set_done(store, counts, b.id, False) == (True, "2026-01-02")
+	assert counts == {"2026-01-02": 1}
+
+	report = summary(store, counts, today="2026-01-03", days=3)
+	assert (report["tasks"], report["done"], report["open"]) == (2, 1, 1)
+	assert (report["overdue"], report["due_today"]) == (0, 1)
+	assert report["completed_by_day"] == {"2026-01-01": 0, "2026-01-02": 1, "2026-01-03": 0}
+	assert report["streak"] == {"current": 1, "longest": 1}
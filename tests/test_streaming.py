@@ -0,0 +1,115 @@
+import io
+import json
+import random
+
+import pytest
+
+from todo_core.persistence import backup_path
+from todo_core.store import PRIORITIES, TaskStore
+from todo_core.streaming import document_events, iter_document, load_file, save_file
+
+
+def _store(n=200, seed=1):
+	rng = random.Random(seed)
+	store = TaskStore()
+	for i in range(n):
+		done = rng.random() < 0.3
+		store.add_task(rng.choice(["Work", "Home", "Ünïcode \"quoted\""]), f"task {i} \\ {rng.random()}",
+					   priority=rng.choice(PRIORITIES), done=done,
+					   deadline=rng.choice(["", "2026-03-0%d" % rng.randint(1, 9)]),
+					   completed_date="2026-02-01" if done else None, time_spent=rng.random() * 100)
+	for name in store.category_names():
+		store.sort_category(name)
+	store.set_category_meta("Home", open_state=False, color="#123456")
+	return store
+
+
+def _ids(tasks):
+	# Tasks of the same day come in no particular order
+	return sorted(task.id for task in tasks)
+
+
+EXTRAS = {"theme": "dark", "stats": {"daily_counts": {"2026-02-01": 3}}}
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("max_bytes", [0, 1 << 26])
+def test_save_load_round_trip(tmp_path, compact, max_bytes):
+	path = str(tmp_path / "tasks.json")
+	store = _store()
+	save_file(path, store, EXTRAS, compact=compact)
+	with open(path, "r", encoding="utf-8") as f:
+		data = json.load(f)
+	expected = dict(theme="dark", **store.to_document())
+	expected["stats"] = EXTRAS["stats"]
+	assert data == expected
+
+	loaded, fields, source = load_file(path, max_bytes=max_bytes)
+	assert source == path
+	assert fields == EXTRAS
+	assert loaded.to_document() == store.to_document()
+	for query in ("tasks_due_between", "tasks_completed_between"):
+		assert _ids(getattr(loaded, query)("", "9999")) == _ids(getattr(store, query)("", "9999"))
+
+
+def test_unverified_save_matches_verified(tmp_path):
+	store = _store()
+	save_file(str(tmp_path / "a.json"), store, EXTRAS)
+	save_file(str(tmp_path / "b.json"), store, EXTRAS, verify=False)
+	assert (tmp_path / "a.json").read_bytes() == (tmp_path / "b.json").read_bytes()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_document_matches_document_events(chunk_size):
+	store = _store(50)
+	data = dict(theme="light", **store.to_document())
+	data["stats"] = {"daily_counts": {}}
+	text = json.dumps(data, ensure_ascii=False, indent=2)
+	assert list(iter_document(io.StringIO(text), chunk_size)) == list(document_events(data))
+
+
+@pytest.mark.parametrize("data", [
+	[{"text": "a", "category": "Work"}, {"text": "b"}],
+	{"tasks": [{"text": "a", "category": "Work"}, {"text": "b"}]},
+	{},
+	{"tasks_by_category": {}, "categories": []},
+])
+def test_legacy_and_empty_documents(data):
+	text = json.dumps(data)
+	assert list(iter_document(io.StringIO(text), 3)) == list(document_events(data))
+
+
+def test_unsorted_categories_are_sorted_on_load(tmp_path):
+	path = str(tmp_path / "tasks.json")
+	data = {"tasks_by_category": {"Work": [
+		{"id": "a", "text": "low", "priority": "Low"},
+		{"id": "b", "text": "high", "priority": "High"},
+	]}}
+	with open(path, "w", encoding="utf-8") as f:
+		json.dump(data, f)
+	for max_bytes in (0, 1 << 26):
+		loaded, _, _ = load_file(path, max_bytes=max_bytes)
+		assert loaded.categories["Work"].task_ids == ["b", "a"]
+
+
+def test_load_falls_back_to_backup(tmp_path):
+	path = str(tmp_path / "tasks.json")
+	store = _store(20)
+	save_file(path, store)
+	save_file(path, _store(5, seed=2))
+	with open(path, "w", encoding="utf-8") as f:
+		f.write('{"tasks_by_category": {"Work": [')
+	loaded, _, source = load_file(path)
+	assert source == backup_path(path, 1)
+	assert loaded.to_document() == store.to_document()
+
+
+def test_snapshot_round_trip():
+	store = _store()
+	snapshot = store.snapshot()
+	copy = TaskStore.from_snapshot(snapshot)
+	assert copy.to_document() == store.to_document()
+	# Later changes do not reach the snapshot
+	store.add_task("Work", "new")
+	store.set_done(next(iter(store.tasks)), True, "2026-05-05")
+	assert TaskStore.from_snapshot(snapshot).to_document() == copy.to_document()
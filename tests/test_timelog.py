@@ -0,0 +1,73 @@
+import time
+from datetime import date, datetime
+
+from todo_core.timelog import TimeLog, TimeTotals, format_seconds, split_by_day
+
+
+class Task:
+	def __init__(self, task_id, category="Work", priority="Medium"):
+		self.id, self.category, self.priority = task_id, category, priority
+
+
+def _at(text):
+	return time.mktime(datetime.fromisoformat(text).timetuple())
+
+
+def test_split_by_day_crosses_midnight():
+	parts = list(split_by_day(_at("2026-01-01 23:00"), _at("2026-01-03 01:30")))
+	assert parts == [("2026-01-01", 3600), ("2026-01-02", 86400), ("2026-01-03", 5400)]
+	assert list(split_by_day(_at("2026-01-01 10:00"), _at("2026-01-01 10:00"))) == []
+
+
+def test_totals_match_intervals():
+	totals = TimeTotals()
+	intervals = [
+		("a", "Work", "High", "2026-01-01 09:00", "2026-01-01 10:00"),
+		("b", "Home", "Low", "2026-01-01 23:30", "2026-01-02 00:30"),
+		("a", "Work", "High", "2026-01-02 08:00", "2026-01-02 08:15"),
+		("c", None, None, "2026-01-03 12:00", "2026-01-03 12:00"),
+	]
+	for task, cat, pri, start, end in intervals:
+		totals.add({"task": task, "cat": cat, "pri": pri, "start": _at(start), "end": _at(end)})
+	assert totals.intervals == 3
+	assert totals.total == 3600 + 3600 + 900
+	assert totals.by_task == {"a": 4500, "b": 3600}
+	assert totals.by_day == {"2026-01-01": 5400, "2026-01-02": 2700}
+
+	report = totals.report()
+	assert report["total"] == totals.total
+	assert report["categories"] == {"Work": 4500, "Home": 3600}
+	assert list(report["priorities"]) == ["High", "Low"]
+
+	second = totals.report("2026-01-02", "2026-01-02")
+	assert second == {"total": 2700, "days": {"2026-01-02": 2700},
+					  "categories": {"Home": 1800, "Work": 900}, "priorities": {"Low": 1800, "High": 900}}
+	assert totals.last_days(1, date(2026, 1, 2)) == second
+	assert totals.report(end="2026-01-01")["total"] == 5400
+
+
+def test_log_reloads_and_survives_torn_lines(tmp_path):
+	path = str(tmp_path / "time_log.jsonl")
+	log = TimeLog(path)
+	log.record(Task("a"), _at("2026-01-01 09:00"), _at("2026-01-01 09:30"))
+	log.record(Task("b", "Home"), _at("2026-01-01 10:00"), _at("2026-01-01 10:10"))
+	assert TimeLog(path).totals.by_task == log.totals.by_task == {"a": 1800, "b": 600}
+
+	with open(path, "a", encoding="utf-8") as f:
+		f.write('{"task": "c", "start": 1')
+	log = TimeLog(path)
+	assert log.totals.intervals == 2
+	# The next record starts on a line of its own
+	log.record(Task("c"), _at("2026-01-01 11:00"), _at("2026-01-01 11:01"))
+	assert TimeLog(path).totals.by_task == {"a": 1800, "b": 600, "c": 60}
+
+
+def test_missing_log_is_empty(tmp_path):
+	log = TimeLog(str(tmp_path / "nope" / "time_log.jsonl"))
+	assert log.totals.report() == {"total": 0, "days": {}, "categories": {}, "priorities": {}}
+
+
+def test_format_seconds():
+	assert format_seconds(0) == "0:00:00"
+	assert format_seconds(3725.9) == "1:02:05"
+	assert format_seconds(90000) == "25:00:00"
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from todo_core.cli import main
+from todo_core.workspace import TASKS_DB, TASKS_JSON, Workspace, load_tasks
+
+
+@pytest.fixture
+def run(tmp_path, capsys):
+	def run(backend, *argv):
+		status = main(["--backend", backend] + list(argv), data_dir=str(tmp_path))
+		out, _ = capsys.readouterr()
+		assert status == 0
+		return out.splitlines()
+	return run
+
+
+def _texts(lines):
+	return sorted(line.split(": ", 1)[1] for line in lines)
+
+
+def test_backend_switch_keeps_changes(run, tmp_path):
+	run("json", "add", "from json")
+	run("sqlite", "add", "from sqlite")
+	assert _texts(run("json", "list")) == ["from json", "from sqlite"]
+
+	task_id = run("json", "add", "from json again")[0].split()[0]
+	run("json", "complete", task_id)
+	lines = run("sqlite", "list", "-s", "done")
+	assert _texts(lines) == ["from json again"]
+	assert _texts(run("sqlite", "list")) == ["from json", "from json again", "from sqlite"]
+
+	run("sqlite", "complete", "--undo", task_id)
+	assert _texts(run("json", "list", "-s", "open")) == ["from json", "from json again", "from sqlite"]
+	assert _texts(run("journal", "list")) == ["from json", "from json again", "from sqlite"]
+	# Reading does not move the newer copy back and forth
+	assert _texts(run("sqlite", "list")) == _texts(run("json", "list"))
+
+
+def test_stats_follow_the_newer_file(tmp_path):
+	ws = Workspace(str(tmp_path), backend="sqlite", log=lambda message: None)
+	ws.store.add_task("Work", "x")
+	ws.daily_counts["2026-01-01"] = 4
+	ws.theme = "dark"
+	ws.save()
+	ws.close()
+	store, fields, _ = load_tasks(str(tmp_path / TASKS_JSON), str(tmp_path / TASKS_DB), "json",
+								  log=lambda message: None)
+	assert len(store) == 1
+	assert fields["stats"]["daily_counts"] == {"2026-01-01": 4}
+	assert fields["theme"] == "dark"
+	assert os.path.exists(tmp_path / TASKS_JSON)
@@ -0,0 +1,18 @@
+"""
+GUI-free core of the Todo List Tracker.
+
+Everything in this package runs without a Tk root so it can be shared by the
+desktop app and by scripts.
+"""
+
+from .store import Task, Category, TaskStore, PRIORITIES, normalize_priority, priority_order, new_task_id
+
+__all__ = [
+	"Task",
+	"Category",
+	"TaskStore",
+	"PRIORITIES",
+	"normalize_priority",
+	"priority_order",
+	"new_task_id",
+]
@@ -0,0 +1,195 @@
+"""
+Rule-based task heuristics used by the AI Tasks chat.
+
+Given a suggested task's text (and the topic of the conversation, if any)
+these guess a category, a priority and a deadline. They only look at
+keywords, so they are cheap enough to run on every suggestion and work
+without the GUI, e.g. for "todo add --auto" on the command line.
+"""
+
+from datetime import date, timedelta
+
+
+def extract_tasks(response):
+	"""Return the task suggestions in a chat response (lines starting with "- ")."""
+	tasks = []
+	for line in response.split("\n"):
+		stripped = line.strip()
+		if stripped.startswith("- "):
+			task_text = stripped[2:].strip()
+			if task_text:
+				tasks.append(task_text)
+	return tasks
+
+
+def suggest_category(task_text, context_topic=None):
+	"""Determine appropriate category based on task content and conversation context."""
+	lower_text = task_text.lower()
+	
+	# Fitness/Health category
+	if context_topic == "fitness" or any(word in lower_text for word in [
+		"workout", "exercise", "gym", "fitness", "health", "run", "walk", "cardio",
+		"strength", "yoga", "stretch", "weight", "muscle", "train", "sport",
+		"nutrition", "diet", "meal", "calorie", "water", "sleep"
+	]):
+		return "Fitness"
+	
+	# Learning/Education category
+	if context_topic == "learning" or any(word in lower_text for word in [
+		"learn", "study", "course", "tutorial", "practice", "lesson", "skill",
+		"read", "book", "video", "class", "training", "education", "research",
+		"programming", "code", "python", "language", "instrument"
+	]):
+		return "Learning"
+	
+	# Work/Career category
+	if any(word in lower_text for word in [
+		"project", "meeting", "presentation", "report", "deadline", "client",
+		"email", "call", "interview", "resume", "career", "job", "work",
+		"business", "professional", "office", "team", "manager"
+	]):
+		return "Work"
+	
+	# Writing/Creative category
+	if context_topic == "writing" or any(word in lower_text for word in [
+		"write", "blog", "article", "post", "draft", "edit", "publish",
+		"content", "story", "book", "chapter", "essay", "creative"
+	]):
+		return "Writing"
+	
+	# Home/Organization category
+	if any(word in lower_text for word in [
+		"organize", "clean", "declutter", "tidy", "home", "room", "kitchen",
+		"laundry", "groceries", "shopping", "errand", "maintenance", "repair"
+	]):
+		return "Home"
+	
+	# Personal Development category
+	if any(word in lower_text for word in [
+		"goal", "habit", "routine", "meditate", "journal", "reflect",
+		"mindfulness", "growth", "develop", "improve", "better"
+	]):
+		return "Personal"
+	
+	# Finance category
+	if any(word in lower_text for word in [
+		"budget", "money", "finance", "payment", "bill", "tax", "savings",
+		"invest", "expense", "bank", "insurance"
+	]):
+		return "Finance"
+	
+	# Default: use context topic or AI Generated
+	if context_topic:
+		return context_topic.capitalize()
+	
+	return "AI Generated"
+
+
+def suggest_priority(task_text, context_topic=None):
+	"""Determine task priority based on content analysis."""
+	lower_text = task_text.lower()
+	
+	# High priority indicators
+	high_keywords = [
+		"urgent", "important", "critical", "asap", "immediately", "emergency",
+		"deadline", "must", "required", "essential", "vital", "crucial",
+		"schedule", "book", "appointment", "meeting", "interview",
+		"health check", "doctor", "medical", "safety"
+	]
+	
+	# Low priority indicators
+	low_keywords = [
+		"optional", "consider", "maybe", "eventually", "someday",
+		"explore", "research", "learn about", "read about", "watch",
+		"review", "browse", "organize", "tidy", "label", "sort"
+	]
+	
+	# Check for high priority
+	if any(keyword in lower_text for keyword in high_keywords):
+		return "High"
+	
+	# Check for low priority
+	if any(keyword in lower_text for keyword in low_keywords):
+		return "Low"
+	
+	# Context-based priority
+	# First few steps in a plan are usually higher priority
+	if any(word in lower_text for word in ["start", "begin", "first", "initial", "setup", "install", "create account"]):
+		return "High"
+	
+	# Health/fitness immediate tasks
+	if context_topic == "fitness" and any(word in lower_text for word in ["today", "schedule", "plan"]):
+		return "High"
+	
+	# Default to Medium
+	return "Medium"
+
+
+def suggest_deadline_days(task_text, priority):
+	"""Determine reasonable deadline offset in days based on task content and priority."""
+	lower_text = task_text.lower()
+	
+	# Immediate/today tasks (0-1 days)
+	if any(word in lower_text for word in ["today", "now", "immediately", "asap", "urgent"]):
+		return 0
+	
+	# This week tasks (1-7 days based on priority)
+	if any(word in lower_text for word in ["this week", "soon", "schedule", "book"]):
+		return 3 if priority == "High" else 7
+	
+	# Research/planning tasks (longer timeframe)
+	if any(word in lower_text for word in ["research", "explore", "learn", "study", "read"]):
+		return 14 if priority == "High" else 30
+	
+	# Installation/setup tasks (quick turnaround)
+	if any(word in lower_text for word in ["install", "download", "setup", "get", "buy", "purchase"]):
+		return 2 if priority == "High" else 7
+	
+	# Daily/routine tasks (short deadline)
+	if any(word in lower_text for word in ["daily", "track", "log", "record", "drink water"]):
+		return 1
+	
+	# Weekly tasks
+	if any(word in lower_text for word in ["weekly", "week", "per week"]):
+		return 7
+	
+	# Practice/habit tasks (recurring concept, shorter deadline)
+	if any(word in lower_text for word in ["practice", "exercise", "workout", "meditate"]):
+		return 3 if priority == "High" else 7
+	
+	# Review/feedback tasks (medium timeframe)
+	if any(word in lower_text for word in ["review", "feedback", "check", "monitor"]):
+		return 7 if priority == "High" else 14
+	
+	# Documentation/writing tasks (longer timeframe)
+	if any(word in lower_text for word in ["document", "write", "draft", "article", "blog"]):
+		return 7 if priority == "High" else 21
+	
+	# Project planning/milestone tasks
+	if any(word in lower_text for word in ["plan", "roadmap", "outline", "design", "brainstorm"]):
+		return 5 if priority == "High" else 14
+	
+	# Implementation tasks (medium timeframe)
+	if any(word in lower_text for word in ["implement", "build", "create", "develop", "code"]):
+		return 14 if priority == "High" else 30
+	
+	# Testing/quality tasks
+	if any(word in lower_text for word in ["test", "debug", "fix", "proofread", "edit"]):
+		return 7 if priority == "High" else 14
+	
+	# Completion/finalization tasks
+	if any(word in lower_text for word in ["complete", "finish", "finalize", "publish", "deploy"]):
+		return 7 if priority == "High" else 21
+	
+	# Default deadlines based on priority
+	if priority == "High":
+		return 7  # 1 week
+	elif priority == "Low":
+		return 30  # 1 month
+	else:
+		return 14  # 2 weeks
+
+
+def suggest_deadline(task_text, priority, today=None):
+	"""Return suggest_deadline_days() as an ISO date counted from today."""
+	return ((today or date.today()) + timedelta(days=suggest_deadline_days(task_text, priority))).isoformat()
@@ -0,0 +1,166 @@
+"""
+Importing custom room assets off the GUI thread.
+
+AssetPipeline runs asset jobs on a small thread pool: import_file() copies
+a picked PNG/GIF into the assets folder, checks that Pillow can decode it,
+counts its frames and writes its thumbnail; thumbnail() creates a missing
+or stale thumbnail for an asset that is already imported. Finished jobs go
+onto a queue that the GUI drains from its own thread with poll(), so
+widgets are never touched by the workers.
+
+Thumbnails are small PNGs in a "thumbs" folder next to the assets, named
+after the asset file. One is stale when its asset has a newer mtime.
+"""
+
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from .persistence import copy_file_atomic
+
+THUMBS_DIR = "thumbs"
+THUMB_SIZE = (40, 40)
+
+
+def thumb_path(path):
+	"""Where the thumbnail of the asset at path is kept."""
+	directory, name = os.path.split(path)
+	return os.path.join(directory, THUMBS_DIR, name + ".png")
+
+
+def thumb_is_fresh(path, thumb=None):
+	"""True if the asset's thumbnail exists and is not older than the asset."""
+	thumb = thumb or thumb_path(path)
+	try:
+		return os.stat(thumb).st_mtime_ns >= os.stat(path).st_mtime_ns
+	except OSError:
+		return False
+
+
+def inspect_image(path):
+	"""Decode the first frame of path and return its frame count; raises if it is not a usable image."""
+	from PIL import Image
+
+	with Image.open(path) as img:
+		img.load()
+		return getattr(img, "n_frames", 1)
+
+
+def make_thumbnail(path, thumb=None, size=THUMB_SIZE):
+	"""Write a downscaled PNG of the first frame of path; returns its path."""
+	from PIL import Image
+
+	thumb = thumb or thumb_path(path)
+	os.makedirs(os.path.dirname(thumb), exist_ok=True)
+	with Image.open(path) as img:
+		img.seek(0)
+		small = img.convert("RGBA")
+	small.thumbnail(size, Image.Resampling.LANCZOS)
+	tmp_path = thumb + ".tmp"
+	small.save(tmp_path, "PNG")
+	os.replace(tmp_path, thumb)
+	return thumb
+
+
+class AssetPipeline:
+	"""Thread pool for asset imports and thumbnails, reporting back through a queue.
+
+	Each finished job posts a dict:
+	  kind         "import" or "thumbnail"
+	  path         the asset file (for imports, its new place in assets_dir)
+	  source       the picked file (imports only)
+	  frame_count  frames in the image (imports only)
+	  thumb        thumbnail path, or None if it could not be made
+	  error        the exception that failed the job, or None
+	  context      whatever the caller passed in
+	"""
+
+	def __init__(self, assets_dir, workers=2):
+		self.assets_dir = assets_dir
+		self.results = queue.Queue()
+		self.pending = 0               # jobs submitted and not yet polled
+		self._reserved = set()         # destination names of imports in flight
+		self._thumbs_queued = set()    # asset paths with a thumbnail job in flight
+		self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+
+	def _destination(self, filename):
+		# Pick the name here, on the caller's thread, so two imports never collide
+		base, ext = os.path.splitext(filename)
+		dest = os.path.join(self.assets_dir, filename)
+		counter = 1
+		while os.path.exists(dest) or dest in self._reserved:
+			dest = os.path.join(self.assets_dir, f"{base}_{counter}{ext}")
+			counter += 1
+		self._reserved.add(dest)
+		return dest
+
+	def _submit(self, work, result):
+		self.pending += 1
+
+		def run():
+			try:
+				work(result)
+			except Exception as e:
+				result["error"] = e
+			self.results.put(result)
+
+		self._executor.submit(run)
+
+	def import_file(self, source, context=None):
+		"""Copy source into the assets folder in the background; returns the destination path."""
+		os.makedirs(self.assets_dir, exist_ok=True)
+		dest = self._destination(os.path.basename(source))
+
+		def work(result):
+			copy_file_atomic(source, dest)
+			try:
+				result["frame_count"] = inspect_image(dest)
+			except ImportError:
+				return  # No Pillow to check it with: keep it as a still image
+			except Exception:
+				# Not an image Pillow can read: don't leave it in the assets folder
+				os.remove(dest)
+				raise
+			try:
+				result["thumb"] = make_thumbnail(dest)
+			except Exception as e:
+				print(f"Could not make a thumbnail of {dest}: {e}")
+
+		self._submit(work, {"kind": "import", "path": dest, "source": source, "frame_count": 1,
+							"thumb": None, "error": None, "context": context})
+		return dest
+
+	def thumbnail(self, path, context=None):
+		"""Make path's thumbnail in the background unless it is fresh or already queued.
+
+		Returns True if a job was queued.
+		"""
+		if path in self._thumbs_queued:
+			return False
+		self._thumbs_queued.add(path)
+
+		def work(result):
+			thumb = thumb_path(path)
+			result["thumb"] = thumb if thumb_is_fresh(path, thumb) else make_thumbnail(path, thumb)
+
+		self._submit(work, {"kind": "thumbnail", "path": path, "thumb": None, "error": None,
+							"context": context})
+		return True
+
+	def poll(self):
+		"""Return the results finished so far, without waiting."""
+		done = []
+		while True:
+			try:
+				result = self.results.get_nowait()
+			except queue.Empty:
+				break
+			self.pending -= 1
+			self._reserved.discard(result["path"])
+			if result["kind"] == "thumbnail":
+				self._thumbs_queued.discard(result["path"])
+			done.append(result)
+		return done
+
+	def shutdown(self, wait=False):
+		self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,93 @@
+"""
+Background autosave.
+
+The GUI thread hands over ready-made snapshots (plain dicts/lists, or a
+function that writes a frozen copy of the task store) and a worker thread
+serializes and writes them with the crash-safe writer. Newer snapshots for
+the same file replace older ones that were not written yet, and each file
+is written at most once per interval.
+"""
+
+import threading
+import time
+
+from .persistence import write_json_atomic
+
+
+class Autosaver:
+	"""Coalescing, rate-limited background writer for JSON snapshots."""
+
+	def __init__(self, interval=3.0):
+		self.interval = interval
+		self.last_save_time = None   # time.time() of the last successful write
+		self.last_error = None       # exception from the last failed write, if any
+		self._pending = {}           # path -> write(path)
+		self._writing = False
+		self._last_write = 0.0
+		self._stopping = False
+		self._cond = threading.Condition()
+		self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+		self._thread.start()
+
+	def submit(self, path, data, compact=False):
+		"""Queue a snapshot for path; data must not be mutated afterwards."""
+		self.submit_write(path, lambda target: write_json_atomic(target, data, compact=compact))
+
+	def submit_write(self, path, write):
+		"""Queue write(path) to run on the worker; it must only touch data it owns."""
+		with self._cond:
+			self._pending[path] = write
+			self._cond.notify_all()
+
+	def flush(self, timeout=None):
+		"""Write everything queued now, ignoring the interval.
+
+		Returns True if the queue drained and the last write succeeded.
+		"""
+		deadline = None if timeout is None else time.monotonic() + timeout
+		with self._cond:
+			self._last_write = 0.0
+			self._cond.notify_all()
+			while self._pending or self._writing:
+				remaining = None if deadline is None else deadline - time.monotonic()
+				if remaining is not None and remaining <= 0:
+					return False
+				self._cond.wait(remaining)
+			return self.last_error is None
+
+	def stop(self, timeout=None):
+		"""Flush and stop the worker thread."""
+		ok = self.flush(timeout)
+		with self._cond:
+			self._stopping = True
+			self._cond.notify_all()
+		self._thread.join(timeout)
+		return ok
+
+	def _run(self):
+		while True:
+			with self._cond:
+				while not self._stopping and not self._pending:
+					self._cond.wait()
+				if self._stopping and not self._pending:
+					return
+				# Rate limit: wait out the rest of the interval (flush resets it)
+				wait = self._last_write + self.interval - time.monotonic()
+				if wait > 0 and not self._stopping:
+					self._cond.wait(wait)
+					continue
+				batch, self._pending = self._pending, {}
+				self._writing = True
+				self._last_write = time.monotonic()
+			error = None
+			for path, write in batch.items():
+				try:
+					write(path)
+				except Exception as e:
+					error = e
+			with self._cond:
+				self._writing = False
+				self.last_error = error
+				if error is None:
+					self.last_save_time = time.time()
+				self._cond.notify_all()
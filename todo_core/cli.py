@@ -0,0 +1,257 @@
+"""
+Command line interface: python -m todo_list_tracker <command> ...
+
+Works on the same data directory as the desktop app (tasks.json, its
+journal, or tasks.db depending on the storage setting) without a display.
+
+  add TEXT          add a task (--auto guesses category/priority/deadline)
+  list              list tasks, with filters (--overdue for nightly reports)
+  complete ID...    mark tasks done (--undo to reopen); ids may be prefixes
+  import FILE       replace (or --merge into) the tasks from a tasks.json file
+  export FILE       write all tasks to a tasks.json file
+  stats             completion summary
+  time              time tracked by day, category and priority
+"""
+
+import argparse
+import json
+import sys
+from datetime import date
+
+from . import ai
+from . import stats
+from .store import PRIORITIES
+from .streaming import load_file, save_file
+from .timelog import format_seconds
+from .workspace import Workspace
+
+
+def _parse_day(text):
+	try:
+		return date.fromisoformat(text).isoformat()
+	except ValueError:
+		raise argparse.ArgumentTypeError(f"not a YYYY-MM-DD date: {text!r}")
+
+
+def _priority(text):
+	for name in PRIORITIES:
+		if name.lower() == text.lower():
+			return name
+	raise argparse.ArgumentTypeError(f"priority must be one of {', '.join(PRIORITIES)}")
+
+
+def _task_line(task):
+	deadline = task.deadline or "-"
+	return f"{task.id}  {task.status} {task.priority:<6}  {deadline:<10}  {task.category}: {task.text}"
+
+
+def _find_task(store, ref):
+	"""Resolve a task id or unique id prefix; raises LookupError."""
+	if ref in store:
+		return store.get(ref)
+	matches = [task for task_id, task in store.tasks.items() if task_id.startswith(ref)]
+	if len(matches) != 1:
+		raise LookupError(f"{'no' if not matches else 'more than one'} task matches {ref!r}")
+	return matches[0]
+
+
+def cmd_add(ws, args):
+	text = " ".join(args.text)
+	category, priority, deadline = args.category, args.priority, args.deadline
+	if args.auto:
+		priority = priority or ai.suggest_priority(text)
+		category = category or ai.suggest_category(text)
+		deadline = deadline or ai.suggest_deadline(text, priority)
+	task = ws.store.add_task(category or "General", text, priority=priority or "Medium", deadline=deadline)
+	# The app keeps each category sorted by priority
+	ws.store.sort_category(task.category)
+	ws.save()
+	print(_task_line(task))
+	return 0
+
+
+def _select(ws, args):
+	store = ws.store
+	today = date.today().isoformat()
+	if args.overdue:
+		tasks = stats.overdue_tasks(store, today)
+	elif args.due_from or args.due_before:
+		tasks = store.tasks_due_between(args.due_from or "", args.due_before or "9999-12-31")
+	elif args.category:
+		tasks = store.tasks_in(args.category)
+	else:
+		tasks = store.iter_tasks()
+	for task in tasks:
+		if args.category and task.category != args.category:
+			continue
+		if args.status == "open" and task.done or args.status == "done" and not task.done:
+			continue
+		if args.priority and task.priority != args.priority:
+			continue
+		if args.search and args.search.lower() not in task.text.lower():
+			continue
+		yield task
+
+
+def cmd_list(ws, args):
+	count = 0
+	for task in _select(ws, args):
+		if args.json:
+			item = task.to_dict()
+			item["category"] = task.category
+			print(json.dumps(item, ensure_ascii=False))
+		else:
+			print(_task_line(task))
+		count += 1
+		if args.limit and count >= args.limit:
+			break
+	return 0
+
+
+def cmd_complete(ws, args):
+	status = 0
+	changed = 0
+	for ref in args.ids:
+		try:
+			task = _find_task(ws.store, ref)
+		except LookupError as e:
+			print(f"error: {e}", file=sys.stderr)
+			status = 1
+			continue
+		done, _ = stats.set_done(ws.store, ws.daily_counts, task.id, not args.undo)
+		changed += done
+		print(_task_line(task))
+	if changed:
+		ws.save()
+	return status
+
+
+def cmd_import(ws, args):
+	loaded, fields, _ = load_file(args.file, backups=0)
+	if args.merge:
+		store = ws.store
+		for task in list(loaded.iter_tasks()):
+			if task.id in store:
+				# Same id already here: keep ours, import theirs as a new task
+				task.id = None
+				task = store.add_task(task.category, task.text, done=task.done, priority=task.priority,
+									  deadline=task.deadline, completed_date=task.completed_date,
+									  time_spent=task.time_spent)
+			else:
+				store.insert(task)
+		for name in loaded.category_names():
+			store.sort_category(name)
+		print(f"Merged {len(loaded)} tasks from {args.file}")
+	else:
+		ws.replace(loaded, fields)
+		print(f"Imported {len(loaded)} tasks from {args.file}")
+	ws.save()
+	return 0
+
+
+def cmd_export(ws, args):
+	save_file(args.file, ws.store, ws.extras(), compact=args.compact, backups=0)
+	print(f"Exported {len(ws.store)} tasks to {args.file}")
+	return 0
+
+
+def cmd_stats(ws, args):
+	report = stats.summary(ws.store, ws.daily_counts, days=args.days)
+	if args.json:
+		print(json.dumps(report, ensure_ascii=False, indent=2))
+		return 0
+	print(f"Tasks: {report['tasks']}  done: {report['done']}  open: {report['open']}")
+	print(f"Overdue: {report['overdue']}  due today: {report['due_today']}  completed today: {report['completed_today']}")
+	print(f"Streak: {report['streak']['current']} day(s)  longest: {report['streak']['longest']}")
+	print(f"Completed over the last {args.days} days:")
+	for day, count in report["completed_by_day"].items():
+		print(f"  {day}  {count:>4}  {'#' * min(count, 60)}")
+	print("Categories:")
+	for name, counts in report["categories"].items():
+		print(f"  {name}: {counts['done']}/{counts['total']}")
+	return 0
+
+
+def cmd_time(ws, args):
+	totals = ws.time_log().totals
+	report = totals.report() if args.all else totals.last_days(args.days)
+	if args.json:
+		print(json.dumps(report, ensure_ascii=False, indent=2))
+		return 0
+	span = "in total" if args.all else f"over the last {args.days} days"
+	print(f"Time tracked {span}: {format_seconds(report['total'])}")
+	for day, seconds in report["days"].items():
+		print(f"  {day}  {format_seconds(seconds):>9}")
+	for title, key in (("Categories", "categories"), ("Priorities", "priorities")):
+		print(f"{title}:")
+		for name, seconds in report[key].items():
+			print(f"  {name}: {format_seconds(seconds)}")
+	return 0
+
+
+def build_parser():
+	parser = argparse.ArgumentParser(prog="todo_list_tracker", description="Todo List Tracker command line.")
+	parser.add_argument("--data-dir", help="data directory (default: the app's data folder)")
+	parser.add_argument("--backend", choices=("json", "journal", "sqlite"),
+						help="task storage to use (default: the app's setting)")
+	commands = parser.add_subparsers(dest="command", required=True)
+
+	p = commands.add_parser("add", help="add a task")
+	p.add_argument("text", nargs="+")
+	p.add_argument("-c", "--category")
+	p.add_argument("-p", "--priority", type=_priority)
+	p.add_argument("-d", "--deadline", type=_parse_day)
+	p.add_argument("--auto", action="store_true", help="guess missing category, priority and deadline from the text")
+	p.set_defaults(func=cmd_add)
+
+	p = commands.add_parser("list", help="list tasks")
+	p.add_argument("-c", "--category")
+	p.add_argument("-s", "--status", choices=("open", "done", "all"), default="all")
+	p.add_argument("-p", "--priority", type=_priority)
+	p.add_argument("--search", help="only tasks whose text contains this")
+	p.add_argument("--overdue", action="store_true", help="open tasks past their deadline")
+	p.add_argument("--due-from", type=_parse_day, help="deadline on or after this day")
+	p.add_argument("--due-before", type=_parse_day, help="deadline before this day")
+	p.add_argument("-n", "--limit", type=int, default=0)
+	p.add_argument("--json", action="store_true", help="one JSON object per line")
+	p.set_defaults(func=cmd_list)
+
+	p = commands.add_parser("complete", help="mark tasks done")
+	p.add_argument("ids", nargs="+", help="task ids or unique id prefixes")
+	p.add_argument("--undo", action="store_true", help="mark them not done instead")
+	p.set_defaults(func=cmd_complete)
+
+	p = commands.add_parser("import", help="load tasks from a tasks.json file")
+	p.add_argument("file")
+	p.add_argument("--merge", action="store_true", help="add to the current tasks instead of replacing them")
+	p.set_defaults(func=cmd_import)
+
+	p = commands.add_parser("export", help="write tasks to a tasks.json file")
+	p.add_argument("file")
+	p.add_argument("--compact", action="store_true", help="no indentation")
+	p.set_defaults(func=cmd_export)
+
+	p = commands.add_parser("stats", help="completion summary")
+	p.add_argument("--days", type=int, default=7)
+	p.add_argument("--json", action="store_true")
+	p.set_defaults(func=cmd_stats)
+
+	p = commands.add_parser("time", help="time tracked on tasks")
+	p.add_argument("--days", type=int, default=7)
+	p.add_argument("--all", action="store_true", help="the whole log instead of the last --days days")
+	p.add_argument("--json", action="store_true")
+	p.set_defaults(func=cmd_time)
+	return parser
+
+
+def main(argv=None, data_dir=None):
+	args = build_parser().parse_args(argv)
+	log = lambda message: print(message, file=sys.stderr)
+	ws = Workspace(args.data_dir or data_dir or "data", backend=args.backend, log=log)
+	try:
+		return args.func(ws, args)
+	except (OSError, ValueError) as e:
+		print(f"error: {e}", file=sys.stderr)
+		return 1
+	finally:
+		ws.close()
@@ -0,0 +1,316 @@
+"""
+Decoded-image cache for custom room assets.
+
+Opening a PNG/GIF, seeking to a frame, converting it to RGBA and
+LANCZOS-resizing it costs far more than drawing the result, so
+AssetImageCache keeps both stages in memory: the decoded RGBA frames of
+each file (every frame decoded once per file version) and the resized
+images built from them. Each stage is an LRU cache with a byte budget.
+Lookups try the resized images first and only need the frames on a miss;
+a file whose frames alone are over the frame budget is decoded one frame
+at a time instead.
+
+A file's version is its modification time and size, read once when the
+file is first loaded, so cache hits do no filesystem I/O. A file changed
+in place needs refresh(path) (or invalidate(path)); refresh() drops what
+was cached for it if the version on disk differs. Stretched images
+(Floor assets) are keyed by their target size, so invalidate(size=...)
+drops the ones made for a canvas size that is no longer in use.
+
+Animations keep each frame's duration from the file, and frame_at()
+picks the frame for a point in time, so playback follows the GIF's own
+timing whatever rate the caller redraws at. The timings are kept apart
+from the pixels (timing()), so picking a frame never decodes anything
+once the file has been seen. preload() decodes files in a worker thread
+(after an upload, say) and hands the frames over on the next lookup.
+
+Pillow is only imported when a file is actually decoded.
+"""
+
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
+
+DEFAULT_FRAME_BYTES = 64 << 20
+DEFAULT_IMAGE_BYTES = 48 << 20
+# Browsers show GIF frames with a delay of 10 ms or less for 100 ms; so do we
+DEFAULT_FRAME_MS = 100
+
+
+class LRUCache:
+	"""Least-recently-used mapping holding at most max_bytes of values."""
+
+	def __init__(self, max_bytes):
+		self.max_bytes = max_bytes
+		self.bytes = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self._entries = OrderedDict()  # key -> (value, nbytes)
+
+	def __len__(self):
+		return len(self._entries)
+
+	def get(self, key, default=None):
+		entry = self._entries.get(key)
+		if entry is None:
+			self.misses += 1
+			return default
+		self._entries.move_to_end(key)
+		self.hits += 1
+		return entry[0]
+
+	def put(self, key, value, nbytes):
+		"""Store value, evicting the oldest entries to stay within the budget.
+
+		A value larger than the whole budget is not kept.
+		"""
+		self.pop(key)
+		if nbytes > self.max_bytes:
+			return
+		self._entries[key] = (value, nbytes)
+		self.bytes += nbytes
+		while self.bytes > self.max_bytes:
+			_, (_, size) = self._entries.popitem(last=False)
+			self.bytes -= size
+			self.evictions += 1
+
+	def pop(self, key):
+		entry = self._entries.pop(key, None)
+		if entry is None:
+			return None
+		self.bytes -= entry[1]
+		return entry[0]
+
+	def discard(self, predicate):
+		"""Drop every entry whose key matches predicate; returns how many."""
+		keys = [key for key in self._entries if predicate(key)]
+		for key in keys:
+			self.pop(key)
+		return len(keys)
+
+	def clear(self):
+		self._entries.clear()
+		self.bytes = 0
+
+	def stats(self):
+		return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+				"entries": len(self._entries), "bytes": self.bytes, "max_bytes": self.max_bytes}
+
+
+def file_version(path):
+	"""(mtime_ns, size) of path, or None if it cannot be read."""
+	try:
+		st = os.stat(path)
+	except OSError:
+		return None
+	return (st.st_mtime_ns, st.st_size)
+
+
+def decode_frames(path):
+	"""Decode every frame of an image file.
+
+	Returns (frames, durations): RGBA PIL images and each frame's display
+	time in milliseconds (0 when the file does not say).
+	"""
+	from PIL import Image
+
+	frames = []
+	durations = []
+	with Image.open(path) as img:
+		for index in range(getattr(img, "n_frames", 1)):
+			img.seek(index)
+			frames.append(img.convert("RGBA"))
+			durations.append(int(img.info.get("duration", 0) or 0))
+	return frames, durations
+
+
+def decode_frame(path, index):
+	"""Decode frame index of an image file as an RGBA PIL image."""
+	from PIL import Image
+
+	with Image.open(path) as img:
+		img.seek(index)
+		return img.convert("RGBA")
+
+
+def resize_frame(source, width, height):
+	"""LANCZOS-resize a PIL image to width x height."""
+	from PIL import Image
+
+	return source.resize((width, height), Image.Resampling.LANCZOS)
+
+
+class FrameTiming:
+	"""The time each frame of a file is shown, looping (no pixel data)."""
+
+	def __init__(self, durations):
+		self.durations = [ms if ms > 10 else DEFAULT_FRAME_MS for ms in durations]
+		self.ends = list(accumulate(self.durations))  # ms at which each frame ends
+		self.total_ms = self.ends[-1]
+
+	def __len__(self):
+		return len(self.durations)
+
+	def frame_at(self, ms):
+		"""Index of the frame showing ms milliseconds after playback started."""
+		if len(self.durations) == 1:
+			return 0
+		return bisect_right(self.ends, ms % self.total_ms)
+
+
+class Animation(FrameTiming):
+	"""The decoded frames of one file and the time each is shown, looping."""
+
+	def __init__(self, frames, durations):
+		FrameTiming.__init__(self, durations)
+		self.frames = frames
+		self.nbytes = sum(f.width * f.height * 4 for f in frames)
+
+
+class AssetImageCache:
+	"""Decoded frames and resized images of asset files, by file version."""
+
+	def __init__(self, frame_bytes=DEFAULT_FRAME_BYTES, image_bytes=DEFAULT_IMAGE_BYTES):
+		self.frames = LRUCache(frame_bytes)   # (path, version) -> Animation
+		self.images = LRUCache(image_bytes)   # (path, version, frame, size or scale) -> image
+		self._versions = {}                   # path -> version last seen
+		self._timings = {}                    # (path, version) -> FrameTiming
+		self._oversized = set()               # (path, version) whose frames do not fit the frame budget
+		self._preloaded = {}                  # (path, version) -> Animation decoded by preload()
+		self._lock = threading.Lock()         # guards _preloaded
+
+	def _version(self, path):
+		version = self._versions.get(path)
+		if version is None:
+			# First use: stat the file once
+			version = file_version(path)
+			if version is None:
+				raise FileNotFoundError(path)
+			self._versions[path] = version
+		return version
+
+	def refresh(self, path):
+		"""Check path on disk and drop its cached data if it changed; returns True if it did."""
+		seen = self._versions.get(path)
+		if seen is None or file_version(path) == seen:
+			return False
+		self.invalidate(path)
+		return True
+
+	def decoded(self, path):
+		"""The Animation of path, decoding the file on first use."""
+		key = (path, self._version(path))
+		animation = self.frames.get(key)
+		if animation is None:
+			with self._lock:
+				animation = self._preloaded.pop(key, None)
+			if animation is None:
+				animation = Animation(*decode_frames(path))
+			self._timings[key] = FrameTiming(animation.durations)
+			if animation.nbytes > self.frames.max_bytes:
+				if key not in self._oversized:
+					self._oversized.add(key)
+					print(f"{path}: {animation.nbytes / (1 << 20):.1f} MB of frames is over the "
+						  f"{self.frames.max_bytes / (1 << 20):.1f} MB frame cache; decoding it a frame at a time")
+			else:
+				self.frames.put(key, animation, animation.nbytes)
+		return animation
+
+	def timing(self, path):
+		"""The FrameTiming of path; decodes the file only the first time it is seen."""
+		key = (path, self._version(path))
+		timing = self._timings.get(key)
+		if timing is None:
+			self.decoded(path)  # records the timing
+			timing = self._timings[key]
+		return timing
+
+	def preload(self, paths):
+		"""Decode paths in a background thread; the caller's next lookups pick them up.
+
+		Only the worker touches Pillow here, the caches themselves are left
+		to the thread that calls decoded()/image().
+		"""
+		def work():
+			for path in paths:
+				version = file_version(path)
+				if version is None:
+					continue
+				try:
+					animation = Animation(*decode_frames(path))
+				except Exception as e:
+					print(f"Could not decode {path}: {e}")
+					continue
+				with self._lock:
+					self._preloaded[(path, version)] = animation
+
+		thread = threading.Thread(target=work, name="asset-preload", daemon=True)
+		thread.start()
+		return thread
+
+	def image(self, path, frame=0, scale=1.0, size=None, make=None):
+		"""Return frame of path resized by scale, or stretched to size=(width, height).
+
+		make turns the resized PIL image into what is cached and returned
+		(an ImageTk.PhotoImage for the GUI); by default the PIL image itself.
+		Frame numbers wrap around the file's frame count.
+		"""
+		version = self._version(path)
+		frame %= len(self.timing(path))
+		key = (path, version, frame, tuple(size) if size else float(scale))
+		image = self.images.get(key)
+		if image is not None:
+			return image
+		if (path, version) in self._oversized:
+			source = decode_frame(path, frame)
+		else:
+			source = self.decoded(path).frames[frame]
+		if size:
+			width, height = size
+		else:
+			width, height = int(source.width * scale), int(source.height * scale)
+		width, height = max(1, int(width)), max(1, int(height))
+		resized = resize_frame(source, width, height)
+		image = make(resized) if make else resized
+		self.images.put(key, image, width * height * 4)
+		return image
+
+	def invalidate(self, path=None, size=None):
+		"""Drop cached images of path (all of its data) and/or those stretched to size."""
+		if path is not None and size is None:
+			self.frames.discard(lambda key: key[0] == path)
+			self._versions.pop(path, None)
+			for key in [key for key in self._timings if key[0] == path]:
+				del self._timings[key]
+			self._oversized = {key for key in self._oversized if key[0] != path}
+			with self._lock:
+				for key in [key for key in self._preloaded if key[0] == path]:
+					del self._preloaded[key]
+		if size is not None:
+			size = tuple(size)
+		return self.images.discard(lambda key: (path is None or key[0] == path)
+								   and (size is None or key[3] == size))
+
+	def clear(self):
+		self.frames.clear()
+		self.images.clear()
+		self._versions.clear()
+		self._timings.clear()
+		self._oversized.clear()
+		with self._lock:
+			self._preloaded.clear()
+
+	def stats(self):
+		return {"frames": self.frames.stats(), "images": self.images.stats()}
+
+	def report(self):
+		"""One-line hit/miss summary."""
+		images, frames = self.images, self.frames
+		lookups = images.hits + images.misses
+		rate = f" ({100 * images.hits / lookups:.0f}% hits)" if lookups else ""
+		return (f"Asset images: {images.hits} hits, {images.misses} misses{rate}, "
+				f"{images.evictions} evicted, {images.bytes / (1 << 20):.1f} MB; "
+				f"files decoded: {frames.misses}, {frames.bytes / (1 << 20):.1f} MB")
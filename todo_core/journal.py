@@ -0,0 +1,252 @@
+"""
+Append-only journal storage for tasks.json.
+
+Instead of rewriting the whole document on every change, each store
+mutation is appended as one JSON line to tasks.json.journal. Once enough
+records pile up the journal is compacted: the current segment is frozen as
+tasks.json.journal.1, a snapshot of the full document is taken on the
+calling thread and a worker writes it over tasks.json, after which the
+frozen segment is deleted.
+
+Records describe the resulting state (full task dicts, absolute stats
+counts, final positions) so replaying a segment that the snapshot already
+contains is harmless. After a crash, load tasks.json and call replay() to
+apply whatever the journal still holds.
+"""
+
+import json
+import os
+import threading
+import time
+
+from .persistence import write_json_atomic, _fsync_dir
+from .store import Task
+
+
+def journal_path(snapshot_path):
+	return snapshot_path + ".journal"
+
+
+def _segments(snapshot_path):
+	# Oldest first: a frozen segment awaiting compaction, then the live one
+	path = journal_path(snapshot_path)
+	return [path + ".1", path]
+
+
+def _apply(store, state, record):
+	op = record.get("op")
+	if op == "add":
+		data = record["task"]
+		if data.get("id") in store:
+			store.remove_task(data["id"])
+		store.insert(Task.from_dict(data, record["cat"]), record.get("index"))
+	elif op == "update":
+		data = record["task"]
+		if data["id"] not in store:
+			return False
+		done = bool(data.get("done", False))
+		store.update_task(data["id"], text=data.get("text", ""), done=done,
+						  priority=data.get("priority", "Medium"), deadline=data.get("deadline"),
+						  completed_date=data.get("completed_date") if done else None,
+						  time_spent=float(data.get("time_spent", 0.0)))
+	elif op == "remove":
+		return store.remove_task(record["id"]) is not None
+	elif op == "move":
+		if record["id"] not in store:
+			return False
+		store.move_task(record["id"], record["cat"], record.get("index"))
+	elif op == "order":
+		store.set_category_order(record["cat"], record["ids"])
+	elif op == "category":
+		store.ensure_category(record["name"])
+		store.set_category_meta(record["name"], open_state=record.get("open"), color=record.get("color"))
+	elif op == "stats":
+		state.setdefault("daily_counts", {})[record["day"]] = record["count"]
+	elif op == "theme":
+		state["theme"] = record["name"]
+	else:
+		return False
+	return True
+
+
+def replay(store, snapshot_path, state):
+	"""Apply the journal left next to snapshot_path to store and state.
+
+	store should already hold the snapshot. state is a dict whose "theme"
+	and "daily_counts" entries are updated by theme and stats records.
+	Returns the number of records applied; a torn last line from a crash
+	mid-append is skipped.
+	"""
+	applied = 0
+	with store.muted():
+		for segment in _segments(snapshot_path):
+			try:
+				f = open(segment, "r", encoding="utf-8")
+			except OSError:
+				continue
+			with f:
+				for line in f:
+					line = line.strip()
+					if not line:
+						continue
+					try:
+						if _apply(store, state, json.loads(line)):
+							applied += 1
+					except (ValueError, KeyError, TypeError):
+						continue
+	return applied
+
+
+def discard(snapshot_path):
+	"""Delete the journal files for snapshot_path (after folding them into a save)."""
+	for segment in _segments(snapshot_path):
+		try:
+			os.remove(segment)
+		except OSError:
+			pass
+
+
+class Journal:
+	"""Appends store mutations to a JSON-lines journal and compacts it in the background.
+
+	snapshot_fn is called on the caller's thread and must return a complete
+	tasks.json document that is not mutated afterwards.
+	"""
+
+	def __init__(self, snapshot_path, snapshot_fn, compact_after=2000, compact_json=False):
+		self.snapshot_path = snapshot_path
+		self.path = journal_path(snapshot_path)
+		self.snapshot_fn = snapshot_fn
+		self.compact_after = compact_after
+		self.compact_json = compact_json
+		self.records = 0             # records appended since the last compaction
+		self.last_save_time = None  # time.time() of the last fsynced append or compaction
+		self.last_error = None
+		self._store = None
+		self._unsynced = False
+		self._compact_requested = False
+		self._retry_at = 0.0
+		self._thread = None
+		os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+		self._file = open(self.path, "a", encoding="utf-8")
+
+	# --- Recording ---
+	def attach(self, store):
+		self._store = store
+		store.subscribe(self._on_store_change)
+
+	def detach(self):
+		if self._store is not None:
+			self._store.unsubscribe(self._on_store_change)
+			self._store = None
+
+	def _on_store_change(self, event, item):
+		store = self._store
+		if event == "add":
+			index = store.categories[item.category].task_ids.index(item.id)
+			self.append({"op": "add", "cat": item.category, "index": index, "task": item.to_dict()})
+		elif event == "update":
+			self.append({"op": "update", "task": item.to_dict()})
+		elif event == "remove":
+			self.append({"op": "remove", "id": item.id})
+		elif event == "move":
+			index = store.categories[item.category].task_ids.index(item.id)
+			self.append({"op": "move", "id": item.id, "cat": item.category, "index": index})
+		elif event == "order":
+			self.append({"op": "order", "cat": item.name, "ids": list(item.task_ids)})
+		elif event == "category":
+			self.append({"op": "category", "name": item.name, "open": item.open, "color": item.color})
+		else:
+			# Renames, category reorders, loads: cheaper to snapshot than to log
+			self.request_compaction()
+
+	def append(self, record):
+		"""Append one record; it reaches the OS immediately and the disk on sync()."""
+		self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+		self._file.flush()
+		self._unsynced = True
+		self.records += 1
+		if self.records >= self.compact_after:
+			self._compact_requested = True
+
+	def request_compaction(self):
+		self._compact_requested = True
+
+	def sync(self):
+		"""fsync pending appends and start a requested compaction. Call periodically."""
+		if self._unsynced:
+			os.fsync(self._file.fileno())
+			self._unsynced = False
+			# The appended changes are on disk: that counts as a save
+			self.last_save_time = time.time()
+		if self._compact_requested and time.monotonic() >= self._retry_at:
+			self.compact()
+
+	# --- Compaction ---
+	def compact(self):
+		"""Freeze the live segment, snapshot the document and write it on a worker thread.
+
+		Returns False if a compaction is already running.
+		"""
+		if self._thread is not None and self._thread.is_alive():
+			return False
+		self._compact_requested = False
+		self._file.flush()
+		os.fsync(self._file.fileno())
+		self._file.close()
+		frozen = self.path + ".1"
+		if os.path.exists(frozen):
+			# An earlier compaction failed: keep its records ahead of ours
+			with open(frozen, "a", encoding="utf-8") as out, open(self.path, "r", encoding="utf-8") as inp:
+				out.write(inp.read())
+				out.flush()
+				os.fsync(out.fileno())
+			os.remove(self.path)
+		else:
+			os.replace(self.path, frozen)
+		self._file = open(self.path, "a", encoding="utf-8")
+		self._unsynced = False
+		self.records = 0
+		data = self.snapshot_fn()
+		self._thread = threading.Thread(target=self._write_snapshot, args=(data, frozen),
+										name="journal-compact", daemon=True)
+		self._thread.start()
+		return True
+
+	def _write_snapshot(self, data, frozen):
+		try:
+			write_json_atomic(self.snapshot_path, data, compact=self.compact_json)
+			os.remove(frozen)
+			_fsync_dir(os.path.dirname(os.path.abspath(frozen)))
+		except Exception as e:
+			# The frozen segment stays and is folded into the next attempt
+			self.last_error = e
+			self._retry_at = time.monotonic() + 30
+			self._compact_requested = True
+			return
+		self.last_error = None
+		self.last_save_time = time.time()
+
+	def wait(self, timeout=None):
+		"""Wait for a running compaction; returns True if none is left running."""
+		if self._thread is not None:
+			self._thread.join(timeout)
+			return not self._thread.is_alive()
+		return True
+
+	def close(self, compact=True, timeout=None):
+		"""Stop recording, optionally compact, and close the journal file.
+
+		Returns True if everything is on disk and the last compaction succeeded.
+		"""
+		self.detach()
+		if not self.wait(timeout):
+			return False
+		if compact and (self.records or self._compact_requested or os.path.exists(self.path + ".1")):
+			self.compact()
+			if not self.wait(timeout):
+				return False
+		self._file.flush()
+		os.fsync(self._file.fileno())
+		self._file.close()
+		return self.last_error is None
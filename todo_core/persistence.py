@@ -0,0 +1,176 @@
+"""
+Crash-safe file writes.
+
+Every save goes to a temp file in the target directory, is fsynced and then
+renamed over the target, so a crash or power loss leaves either the old or
+the new file, never a truncated one. The previous versions are kept as
+rotated backups (tasks.json.bak1 is the newest) and readers fall back to
+them when the main file is missing or does not parse. Backups rotate at
+most once per BACKUP_INTERVAL, so frequent autosaves do not push every
+older version out within seconds.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+
+DEFAULT_BACKUPS = 3
+BACKUP_INTERVAL = 10 * 60  # seconds between backup rotations
+
+# Read once: os.umask() can only be queried by setting it, which races with other threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def backup_path(path, n):
+	return f"{path}.bak{n}"
+
+
+def dumps_json(data, compact=False):
+	"""Serialize data; compact output drops indentation and spaces."""
+	if compact:
+		return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+	return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def _fsync_dir(directory):
+	# Make the rename itself durable (not supported on Windows)
+	if os.name != "posix":
+		return
+	try:
+		fd = os.open(directory, os.O_RDONLY)
+	except OSError:
+		return
+	try:
+		os.fsync(fd)
+	except OSError:
+		pass
+	finally:
+		os.close(fd)
+
+
+def _copy_mode(tmp_path, path):
+	"""Give the temp file path's permissions (mkstemp creates it owner-only)."""
+	try:
+		mode = os.stat(path).st_mode & 0o7777
+	except OSError:
+		# A new file gets what open() would have given it
+		mode = 0o666 & ~_UMASK
+	os.chmod(tmp_path, mode)
+
+
+def _rotate_backups(path, backups, min_age=BACKUP_INTERVAL):
+	"""Shift path.bak1..N up by one and keep the current file as path.bak1.
+
+	Nothing happens while path.bak1 is younger than min_age seconds: the
+	file it was taken from then simply gets overwritten.
+	"""
+	if backups <= 0 or not os.path.exists(path):
+		return
+	try:
+		# bak1 keeps the mtime of the save it was taken from
+		if time.time() - os.stat(backup_path(path, 1)).st_mtime < min_age:
+			return
+	except OSError:
+		pass
+	for n in range(backups - 1, 0, -1):
+		src = backup_path(path, n)
+		if os.path.exists(src):
+			os.replace(src, backup_path(path, n + 1))
+	newest = backup_path(path, 1)
+	if os.path.exists(newest):
+		os.remove(newest)
+	try:
+		# A hard link keeps path in place until the new file replaces it
+		os.link(path, newest)
+	except (OSError, AttributeError):
+		shutil.copy2(path, newest)
+
+
+def write_bytes_atomic(path, payload, backups=DEFAULT_BACKUPS):
+	"""Atomically replace path with payload (bytes), keeping rotated backups."""
+	write_stream_atomic(path, lambda f: f.write(payload), backups=backups, binary=True)
+
+
+def write_stream_atomic(path, write, backups=DEFAULT_BACKUPS, verify=None, binary=False):
+	"""Atomically replace path with whatever write(f) writes, keeping rotated backups.
+
+	f is a UTF-8 text file (a binary one with binary=True). verify(tmp_path),
+	if given, checks the finished temp file and raises to abort the save.
+	"""
+	directory = os.path.dirname(os.path.abspath(path))
+	os.makedirs(directory, exist_ok=True)
+	fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+	try:
+		if binary:
+			f = os.fdopen(fd, "wb")
+		else:
+			f = os.fdopen(fd, "w", encoding="utf-8", newline="")
+		with f:
+			write(f)
+			f.flush()
+			os.fsync(f.fileno())
+		if verify is not None:
+			verify(tmp_path)
+		_copy_mode(tmp_path, path)
+		_rotate_backups(path, backups)
+		os.replace(tmp_path, path)
+	except BaseException:
+		try:
+			os.remove(tmp_path)
+		except OSError:
+			pass
+		raise
+	_fsync_dir(directory)
+
+
+def write_json_atomic(path, data, compact=False, backups=DEFAULT_BACKUPS):
+	"""Serialize data and atomically write it to path.
+
+	The serialized text is parsed back before anything touches the disk so a
+	document that would not load again is never written.
+	"""
+	text = dumps_json(data, compact=compact)
+	json.loads(text)
+	write_bytes_atomic(path, text.encode("utf-8"), backups=backups)
+
+
+def copy_file_atomic(src, dest):
+	"""Copy src to dest via a temp file and rename (no backups)."""
+	directory = os.path.dirname(os.path.abspath(dest))
+	os.makedirs(directory, exist_ok=True)
+	fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(dest)}.", suffix=".tmp", dir=directory)
+	try:
+		with os.fdopen(fd, "wb") as out, open(src, "rb") as inp:
+			shutil.copyfileobj(inp, out)
+			out.flush()
+			os.fsync(out.fileno())
+		shutil.copystat(src, tmp_path)
+		_copy_mode(tmp_path, dest)
+		os.replace(tmp_path, dest)
+	except BaseException:
+		try:
+			os.remove(tmp_path)
+		except OSError:
+			pass
+		raise
+	_fsync_dir(directory)
+
+
+def read_json_verified(path, backups=DEFAULT_BACKUPS):
+	"""Load JSON from path, falling back to the newest readable backup.
+
+	Returns (data, source_path). Raises the error from the main file if
+	neither it nor any backup can be read.
+	"""
+	first_error = None
+	for candidate in [path] + [backup_path(path, n) for n in range(1, backups + 1)]:
+		try:
+			with open(candidate, "r", encoding="utf-8") as f:
+				return json.load(f), candidate
+		except (OSError, ValueError) as e:
+			if first_error is None:
+				first_error = e
+	raise first_error
@@ -0,0 +1,301 @@
+"""
+SQLite storage backend for tasks.
+
+The in-memory TaskStore stays the source of truth while the app runs; this
+backend mirrors each store change into data/tasks.db as it happens and
+commits once per autosave tick, so a save never rewrites the whole task
+list. Tasks are indexed by category, status, priority, deadline and
+completion day, which lets views ask for ranges ("tasks due in March",
+"next open High task") without scanning everything.
+
+migrate_json() converts an existing tasks_by_category JSON file once;
+save_store() overwrites a database with a store loaded from elsewhere.
+"""
+
+import os
+import sqlite3
+import time
+
+from .persistence import read_json_verified
+from .store import TaskStore, _PRIORITY_ORDER
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+	name TEXT PRIMARY KEY,
+	position INTEGER NOT NULL,
+	open INTEGER NOT NULL DEFAULT 1,
+	color TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+	id TEXT PRIMARY KEY,
+	category TEXT NOT NULL,
+	position INTEGER NOT NULL,
+	text TEXT NOT NULL,
+	done INTEGER NOT NULL DEFAULT 0,
+	priority TEXT NOT NULL,
+	priority_rank INTEGER NOT NULL,
+	deadline TEXT,
+	completed_date TEXT,
+	time_spent REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_category ON tasks (category, position);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (done, priority_rank);
+CREATE INDEX IF NOT EXISTS tasks_priority ON tasks (priority_rank);
+CREATE INDEX IF NOT EXISTS tasks_deadline ON tasks (deadline) WHERE deadline IS NOT NULL;
+CREATE INDEX IF NOT EXISTS tasks_completed ON tasks (completed_date) WHERE completed_date IS NOT NULL;
+CREATE TABLE IF NOT EXISTS daily_counts (
+	day TEXT PRIMARY KEY,
+	count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+	key TEXT PRIMARY KEY,
+	value TEXT
+);
+"""
+
+_TASK_COLUMNS = "id, category, position, text, done, priority, priority_rank, deadline, completed_date, time_spent"
+
+
+def _task_row(task, position):
+	return (task.id, task.category, position, task.text, int(task.done), task.priority,
+			_PRIORITY_ORDER.get(task.priority, 1), task.deadline or None,
+			task.completed_date if task.done else None, task.time_spent)
+
+
+class SQLiteBackend:
+	"""Write-through mirror of a TaskStore in an SQLite database.
+
+	Use from one thread only (the Tk thread in the app).
+	"""
+
+	def __init__(self, path):
+		self.path = path
+		self.last_save_time = None
+		self.last_error = None
+		self._store = None
+		self._pending = False
+		os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+		self.conn = sqlite3.connect(path)
+		self.conn.execute("PRAGMA journal_mode=WAL")
+		self.conn.execute("PRAGMA synchronous=NORMAL")
+		self.conn.executescript(SCHEMA)
+		self.conn.commit()
+
+	# --- Loading ---
+	def is_empty(self):
+		row = self.conn.execute("SELECT EXISTS (SELECT 1 FROM categories) OR EXISTS (SELECT 1 FROM tasks)").fetchone()
+		return not row[0]
+
+	def load_document(self):
+		"""Return the database contents as a tasks.json document."""
+		conn = self.conn
+		categories = [{"name": name, "open": bool(open_state), "color": color}
+					  for name, open_state, color in
+					  conn.execute("SELECT name, open, color FROM categories ORDER BY position")]
+		by_category = {meta["name"]: [] for meta in categories}
+		rows = conn.execute("SELECT id, category, text, done, priority, deadline, completed_date, time_spent "
+							"FROM tasks ORDER BY category, position")
+		for task_id, category, text, done, priority, deadline, completed_date, time_spent in rows:
+			item = {"id": task_id, "text": text, "done": bool(done), "priority": priority, "deadline": deadline}
+			if done and completed_date:
+				item["completed_date"] = completed_date
+			if time_spent:
+				item["time_spent"] = time_spent
+			by_category.setdefault(category, []).append(item)
+		data = {"tasks_by_category": by_category, "categories": categories}
+		data["stats"] = {"daily_counts": dict(conn.execute("SELECT day, count FROM daily_counts"))}
+		theme = conn.execute("SELECT value FROM meta WHERE key = 'theme'").fetchone()
+		if theme:
+			data["theme"] = theme[0]
+		return data
+
+	# --- Writing ---
+	def attach(self, store):
+		self._store = store
+		store.subscribe(self._on_store_change)
+
+	def detach(self):
+		if self._store is not None:
+			self._store.unsubscribe(self._on_store_change)
+			self._store = None
+
+	def _on_store_change(self, event, item):
+		try:
+			self._apply_change(event, item)
+			self._pending = True
+		except sqlite3.Error as e:
+			self.last_error = e
+
+	def _apply_change(self, event, item):
+		conn = self.conn
+		store = self._store
+		if event == "add":
+			index = store.categories[item.category].task_ids.index(item.id)
+			self._shift(item.category, index, 1)
+			conn.execute(f"INSERT OR REPLACE INTO tasks ({_TASK_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?,?)",
+						 _task_row(item, index))
+		elif event == "update":
+			row = _task_row(item, 0)
+			conn.execute("UPDATE tasks SET text=?, done=?, priority=?, priority_rank=?, deadline=?, "
+						 "completed_date=?, time_spent=? WHERE id=?", row[3:] + (item.id,))
+		elif event == "remove":
+			old = conn.execute("SELECT category, position FROM tasks WHERE id=?", (item.id,)).fetchone()
+			conn.execute("DELETE FROM tasks WHERE id=?", (item.id,))
+			if old:
+				self._shift(old[0], old[1] + 1, -1)
+		elif event == "move":
+			old = conn.execute("SELECT category, position FROM tasks WHERE id=?", (item.id,)).fetchone()
+			if old:
+				conn.execute("UPDATE tasks SET position=-1 WHERE id=?", (item.id,))
+				self._shift(old[0], old[1] + 1, -1)
+			index = store.categories[item.category].task_ids.index(item.id)
+			self._shift(item.category, index, 1)
+			conn.execute("UPDATE tasks SET category=?, position=? WHERE id=?", (item.category, index, item.id))
+		elif event == "order":
+			conn.executemany("UPDATE tasks SET position=? WHERE id=?",
+							 [(i, task_id) for i, task_id in enumerate(item.task_ids)])
+		elif event == "category":
+			position = list(store.categories).index(item.name)
+			conn.execute("INSERT OR IGNORE INTO categories (name, position) VALUES (?, ?)", (item.name, position))
+			conn.execute("UPDATE categories SET open=?, color=? WHERE name=?", (int(item.open), item.color, item.name))
+		else:
+			self.write_store(store)
+
+	def _shift(self, category, start, delta):
+		self.conn.execute("UPDATE tasks SET position = position + ? WHERE category = ? AND position >= ?",
+						  (delta, category, start))
+
+	def write_store(self, store):
+		"""Replace all categories and tasks with the store's contents."""
+		conn = self.conn
+		conn.execute("DELETE FROM tasks")
+		conn.execute("DELETE FROM categories")
+		conn.executemany("INSERT INTO categories (name, position, open, color) VALUES (?,?,?,?)",
+						 [(cat.name, i, int(cat.open), cat.color) for i, cat in enumerate(store.categories.values())])
+		tasks = store.tasks
+		conn.executemany(f"INSERT INTO tasks ({_TASK_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?,?)",
+						 (_task_row(tasks[task_id], i)
+						  for cat in store.categories.values()
+						  for i, task_id in enumerate(cat.task_ids)))
+		self._pending = True
+
+	def append(self, record):
+		"""Store a change the TaskStore does not track: stats or theme records."""
+		op = record.get("op")
+		if op == "stats":
+			self.conn.execute("INSERT OR REPLACE INTO daily_counts (day, count) VALUES (?, ?)",
+							  (record["day"], record["count"]))
+		elif op == "theme":
+			self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('theme', ?)", (record["name"],))
+		else:
+			return
+		self._pending = True
+
+	def write_document_extras(self, theme=None, daily_counts=None):
+		"""Store the theme and replace the daily completion counts."""
+		if theme:
+			self.append({"op": "theme", "name": theme})
+		if daily_counts is not None:
+			self.conn.execute("DELETE FROM daily_counts")
+			self.conn.executemany("INSERT OR REPLACE INTO daily_counts (day, count) VALUES (?, ?)",
+								  list(daily_counts.items()))
+			self._pending = True
+
+	def sync(self):
+		"""Commit pending changes. Call periodically."""
+		if self._pending:
+			self.conn.commit()
+			self._pending = False
+			self.last_save_time = time.time()
+			self.last_error = None
+
+	def close(self, compact=True, timeout=None):
+		"""Commit and close; returns True if everything was written."""
+		self.detach()
+		try:
+			self.sync()
+			if compact:
+				self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+		except sqlite3.Error as e:
+			self.last_error = e
+		self.conn.close()
+		return self.last_error is None
+
+	# --- Range queries ---
+	def _tasks(self, rows):
+		store = self._store
+		tasks = (store.get(task_id) for (task_id,) in rows)
+		return [task for task in tasks if task is not None]
+
+	def tasks_due_between(self, start, end):
+		"""Return tasks whose ISO deadline falls in [start, end), by day."""
+		return self._tasks(self.conn.execute(
+			"SELECT id FROM tasks WHERE deadline >= ? AND deadline < ? ORDER BY deadline", (start, end)))
+
+	def tasks_completed_between(self, start, end):
+		"""Return done tasks whose completed_date falls in [start, end), by day."""
+		return self._tasks(self.conn.execute(
+			"SELECT id FROM tasks WHERE completed_date >= ? AND completed_date < ? ORDER BY completed_date",
+			(start, end)))
+
+	def next_open_task(self, categories=None, priorities=None):
+		"""Return the first open task of the highest priority, in display order."""
+		where = ["t.done = 0"]
+		params = []
+		if priorities is not None:
+			ranks = sorted({_PRIORITY_ORDER.get(p, 1) for p in priorities})
+			where.append(f"t.priority_rank IN ({','.join('?' * len(ranks))})")
+			params.extend(ranks)
+		if categories is not None:
+			categories = list(categories)
+			where.append(f"t.category IN ({','.join('?' * len(categories))})")
+			params.extend(categories)
+		rows = self.conn.execute(
+			"SELECT t.id FROM tasks t JOIN categories c ON c.name = t.category "
+			f"WHERE {' AND '.join(where)} ORDER BY t.priority_rank, c.position, t.position LIMIT 1", params)
+		found = self._tasks(rows)
+		return found[0] if found else None
+
+
+def save_store(db_path, store, theme=None, daily_counts=None):
+	"""Replace the tasks, theme and daily counts in the database at db_path."""
+	backend = SQLiteBackend(db_path)
+	try:
+		backend.write_store(store)
+		backend.write_document_extras(theme, daily_counts)
+		backend.sync()
+	finally:
+		backend.close()
+	if backend.last_error is not None:
+		raise backend.last_error
+
+
+def migrate_json(json_path, db_path):
+	"""One-shot import of a tasks.json document into a new or empty database.
+
+	Returns the number of tasks migrated. Raises ValueError if the database
+	already holds tasks.
+	"""
+	data, _ = read_json_verified(json_path)
+	store = TaskStore()
+	store.load_document(data)
+	backend = SQLiteBackend(db_path)
+	try:
+		if not backend.is_empty():
+			raise ValueError(f"{db_path} already contains tasks")
+		backend.write_store(store)
+		if isinstance(data, dict):
+			backend.write_document_extras(data.get("theme"), data.get("stats", {}).get("daily_counts"))
+		backend.sync()
+	finally:
+		backend.close()
+	return len(store)
+
+
+if __name__ == "__main__":
+	import sys
+	if len(sys.argv) != 3:
+		print("usage: python -m todo_core.sqlite_store TASKS_JSON TASKS_DB")
+		sys.exit(2)
+	count = migrate_json(sys.argv[1], sys.argv[2])
+	print(f"Migrated {count} tasks into {sys.argv[2]}")
@@ -0,0 +1,229 @@
+"""
+Completion statistics.
+
+daily_counts maps an ISO day to the number of tasks completed that day
+(the "stats.daily_counts" part of tasks.json). Completing a task bumps
+the day it was completed on; un-completing it takes that day back down.
+
+DailySeries holds the same counts as a dense array indexed by day ordinal
+with prefix sums, for graphs and totals over long ranges: any range total
+is two lookups, a window of days is one slice, and weekly/monthly/yearly
+rollups, streaks and moving averages are built on those.
+"""
+
+from array import array
+from datetime import date, timedelta
+
+
+def increment(daily_counts, day):
+	"""Count one more completion on day; returns the new count."""
+	daily_counts[day] = daily_counts.get(day, 0) + 1
+	return daily_counts[day]
+
+
+def decrement(daily_counts, day):
+	"""Take back one completion on day; returns the new count (None if day has none)."""
+	if day not in daily_counts:
+		return None
+	daily_counts[day] = max(0, daily_counts[day] - 1)
+	return daily_counts[day]
+
+
+def set_done(store, daily_counts, task_id, done, day=None):
+	"""Mark a task done on day (default today) or not done, keeping daily_counts in step.
+
+	Returns (changed, stats_day): whether the task changed and which day's
+	count changed, if any.
+	"""
+	task = store.get(task_id)
+	if task is None or task.done == bool(done):
+		return False, None
+	if done:
+		day = day or date.today().isoformat()
+		store.set_done(task_id, True, day)
+		increment(daily_counts, day)
+		return True, day
+	stats_day = task.completed_date
+	if stats_day and decrement(daily_counts, stats_day) is None:
+		stats_day = None
+	store.set_done(task_id, False)
+	return True, stats_day
+
+
+def _ordinal(day):
+	if isinstance(day, str):
+		return date.fromisoformat(day).toordinal()
+	if isinstance(day, date):
+		return day.toordinal()
+	return int(day)
+
+
+def _next_period(start, period):
+	"""First day of the period after the one starting on start."""
+	if period == "week":
+		return start + timedelta(days=7)
+	if period == "month":
+		return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+	if period == "year":
+		return date(start.year + 1, 1, 1)
+	raise ValueError(f"period must be week, month or year, not {period!r}")
+
+
+def _period_start(day, period):
+	if period == "week":
+		return day - timedelta(days=day.weekday())
+	if period == "month":
+		return day.replace(day=1)
+	if period == "year":
+		return day.replace(month=1, day=1)
+	raise ValueError(f"period must be week, month or year, not {period!r}")
+
+
+class DailySeries:
+	"""Completions per day as a dense array, with prefix sums for range totals.
+
+	counts[i] is the count on day ordinal origin + i. Prefix sums are
+	rebuilt lazily from the earliest changed day, so a completion today
+	costs nothing until the next query. Days may be dates, ISO strings or
+	ordinals; ranges are [start, end) like range().
+	"""
+
+	def __init__(self, daily_counts=None):
+		self.origin = date.today().toordinal()
+		self.counts = array("l")
+		self._prefix = array("q", [0])  # _prefix[i] == sum(counts[:i]) for i <= _valid
+		self._valid = 0
+		self._longest = None            # cached longest streak
+		days = {}
+		for day, count in (daily_counts or {}).items():
+			try:
+				days[_ordinal(day)] = int(count)
+			except (TypeError, ValueError):
+				continue
+		if days:
+			self.origin = min(days)
+			self.counts = array("l", bytes(array("l").itemsize * (max(days) - self.origin + 1)))
+			for ordinal, count in days.items():
+				self.counts[ordinal - self.origin] = count
+
+	def __len__(self):
+		return len(self.counts)
+
+	def _index(self, day):
+		"""Array index of day, growing the array to cover it."""
+		ordinal = _ordinal(day)
+		if ordinal < self.origin:
+			grow = self.origin - ordinal
+			self.counts = array("l", bytes(self.counts.itemsize * grow)) + self.counts
+			self.origin = ordinal
+			self._valid = 0
+		elif ordinal - self.origin >= len(self.counts):
+			self.counts.extend(bytes(self.counts.itemsize * (ordinal - self.origin + 1 - len(self.counts))))
+		return ordinal - self.origin
+
+	def set(self, day, count):
+		i = self._index(day)
+		if self.counts[i] != count:
+			self.counts[i] = count
+			self._valid = min(self._valid, i)
+			self._longest = None
+
+	def add(self, day, delta=1):
+		i = self._index(day)
+		self.set(day, max(0, self.counts[i] + delta))
+
+	def get(self, day):
+		i = _ordinal(day) - self.origin
+		return self.counts[i] if 0 <= i < len(self.counts) else 0
+
+	def _before(self, ordinal):
+		"""Sum of the counts of all days before ordinal."""
+		n = len(self.counts)
+		if self._valid < n:
+			prefix = self._prefix
+			del prefix[self._valid + 1:]
+			total = prefix[-1]
+			for count in self.counts[self._valid:]:
+				total += count
+				prefix.append(total)
+			self._valid = n
+		return self._prefix[min(max(ordinal - self.origin, 0), n)]
+
+	def total(self, start, end):
+		"""Completions on days start <= day < end."""
+		return self._before(_ordinal(end)) - self._before(_ordinal(start))
+
+	def window(self, start, days):
+		"""Counts of the days days starting at start, as a list (0 outside the data)."""
+		i = _ordinal(start) - self.origin
+		values = [0] * days
+		lo, hi = max(i, 0), min(i + days, len(self.counts))
+		if lo < hi:
+			values[lo - i:hi - i] = self.counts[lo:hi].tolist()
+		return values
+
+	def moving_average(self, start, days, width=7):
+		"""For each of days days from start, the average over the width days ending there."""
+		first = _ordinal(start)
+		before = self._before
+		return [(before(d + 1) - before(d + 1 - width)) / width for d in range(first, first + days)]
+
+	def rollup(self, period, start, end):
+		"""[(first day, total)] per week (from Monday), month or year overlapping [start, end)."""
+		start = date.fromordinal(_ordinal(start))
+		end = date.fromordinal(_ordinal(end))
+		rows = []
+		first = _period_start(start, period)
+		while first < end:
+			after = _next_period(first, period)
+			rows.append((first, self.total(max(first, start), min(after, end))))
+			first = after
+		return rows
+
+	def streaks(self, today=None):
+		"""(current, longest) runs of consecutive days with completions.
+
+		The current streak ends today, or yesterday while today has none yet.
+		"""
+		if self._longest is None:
+			longest = run = 0
+			for count in self.counts:
+				run = run + 1 if count > 0 else 0
+				longest = max(longest, run)
+			self._longest = longest
+		i = _ordinal(today or date.today()) - self.origin
+		if not (0 <= i < len(self.counts) and self.counts[i] > 0):
+			i -= 1
+		current = 0
+		while 0 <= i < len(self.counts) and self.counts[i] > 0:
+			current += 1
+			i -= 1
+		return current, self._longest
+
+
+def overdue_tasks(store, today=None):
+	"""Open tasks whose deadline is before today, oldest deadline first."""
+	today = today or date.today().isoformat()
+	return [task for task in store.tasks_due_between("", today) if not task.done]
+
+
+def summary(store, daily_counts, today=None, days=7):
+	"""Counts for reports: totals, overdue/due today and completions over the last days."""
+	today_date = date.fromisoformat(today) if today else date.today()
+	today = today_date.isoformat()
+	tomorrow = (today_date + timedelta(days=1)).isoformat()
+	done = sum(cat.done for cat in store.categories.values())
+	window = [(today_date - timedelta(days=n)).isoformat() for n in range(days - 1, -1, -1)]
+	current, longest = DailySeries(daily_counts).streaks(today_date)
+	return {
+		"tasks": len(store),
+		"done": done,
+		"open": len(store) - done,
+		"overdue": len(overdue_tasks(store, today)),
+		"due_today": sum(1 for task in store.tasks_due_between(today, tomorrow) if not task.done),
+		"completed_today": daily_counts.get(today, 0),
+		"completed_by_day": {day: daily_counts.get(day, 0) for day in window},
+		"streak": {"current": current, "longest": longest},
+		"categories": {name: {"done": cat.done, "total": len(cat.task_ids)}
+					   for name, cat in store.categories.items()},
+	}
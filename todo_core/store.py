@@ -0,0 +1,606 @@
+"""
+In-memory task model.
+
+The store is the single source of truth for tasks: the Treeview and the
+Kanban/List/Compact views only mirror it, and persistence reads from it.
+Tasks carry stable ids that survive re-sorting, moves and save/load cycles.
+"""
+
+import uuid
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from operator import attrgetter
+
+PRIORITIES = ("High", "Medium", "Low")
+_PRIORITY_ORDER = {"High": 0, "Medium": 1, "Low": 2}
+# Arrow symbols written by older versions of the app
+_LEGACY_PRIORITIES = {"⬆️": "High", "➡️": "Medium", "⬇️": "Low"}
+
+
+def new_task_id():
+	"""Return a short random id for a new task."""
+	return uuid.uuid4().hex[:12]
+
+
+def normalize_priority(priority):
+	"""Map legacy symbols and unknown values onto High/Medium/Low."""
+	if priority in _PRIORITY_ORDER:
+		return priority
+	return _LEGACY_PRIORITIES.get(priority, "Medium")
+
+
+def priority_order(priority):
+	return _PRIORITY_ORDER.get(priority, 1)
+
+
+def _index_day(index, days, day, task_id):
+	ids = index.get(day)
+	if ids is None:
+		ids = index[day] = set()
+		insort(days, day)
+	ids.add(task_id)
+
+
+def _unindex_day(index, days, day, task_id):
+	ids = index.get(day)
+	if ids is not None:
+		ids.discard(task_id)
+		if not ids:
+			del index[day]
+			del days[bisect_left(days, day)]
+
+
+class Task:
+	"""A single task record."""
+
+	__slots__ = ("id", "text", "category", "done", "priority", "deadline", "completed_date", "time_spent")
+
+	def __init__(self, text, category, done=False, priority="Medium", deadline="",
+				 completed_date=None, time_spent=0.0, task_id=None):
+		self.id = task_id or new_task_id()
+		self.text = text
+		self.category = category
+		self.done = bool(done)
+		self.priority = normalize_priority(priority)
+		self.deadline = deadline or ""
+		self.completed_date = completed_date or None
+		self.time_spent = float(time_spent or 0.0)
+
+	@property
+	def status(self):
+		"""Status text shown in the tree's Status column."""
+		return "[x]" if self.done else "[ ]"
+
+	def to_dict(self):
+		data = {
+			"id": self.id,
+			"text": self.text,
+			"done": self.done,
+			"priority": self.priority,
+			"deadline": self.deadline or None,
+		}
+		if self.done and self.completed_date:
+			data["completed_date"] = self.completed_date
+		if self.time_spent:
+			data["time_spent"] = round(self.time_spent, 1)
+		return data
+
+	@classmethod
+	def from_dict(cls, data, category):
+		# Same as cls(...) with the fields of data; spelled out because loads call it per task
+		get = data.get
+		task = cls.__new__(cls)
+		task.id = get("id") or new_task_id()
+		task.text = get("text", "")
+		task.category = category
+		task.done = bool(get("done", False))
+		priority = get("priority", "Medium")
+		task.priority = priority if priority in _PRIORITY_ORDER else normalize_priority(priority)
+		task.deadline = get("deadline") or ""
+		task.completed_date = get("completed_date") or None
+		time_spent = get("time_spent")
+		task.time_spent = float(time_spent) if time_spent else 0.0
+		return task
+
+	@classmethod
+	def from_row(cls, row):
+		"""Rebuild a task from a _task_row() tuple."""
+		task = cls.__new__(cls)
+		(task.id, task.text, task.category, task.done, task.priority, task.deadline,
+		 task.completed_date, task.time_spent) = row
+		return task
+
+	def __repr__(self):
+		return f"Task({self.id!r}, {self.text!r}, category={self.category!r}, done={self.done})"
+
+
+# A task's fields as a tuple in __slots__ order (attrgetter builds it in C)
+_task_row = attrgetter(*Task.__slots__)
+
+
+class Category:
+	"""A named, ordered group of task ids with a running done counter."""
+
+	__slots__ = ("name", "open", "color", "task_ids", "done")
+
+	def __init__(self, name, open_state=True, color=None):
+		self.name = name
+		self.open = bool(open_state)
+		self.color = color
+		self.task_ids = []
+		self.done = 0  # number of completed tasks in task_ids
+
+	@property
+	def total(self):
+		return len(self.task_ids)
+
+	def to_dict(self):
+		return {"name": self.name, "open": self.open, "color": self.color}
+
+
+class TaskStore:
+	"""Tasks indexed by id and by category, in display order.
+
+	Listeners registered with subscribe() are called as callback(event, item)
+	after each change:
+
+	  "add", "update", "remove", "move"  item is the Task
+	  "order"                            item is the Category that was re-sorted
+	  "category"                         item is a Category that was created or
+	                                     whose open state/color changed
+	  "reset"                            item is None; many tasks or the category
+	                                     list changed at once
+	"""
+
+	def __init__(self):
+		self.tasks = {}       # task id -> Task
+		self.categories = {}  # name -> Category, in display order
+		self.deadlines = {}   # ISO day -> set of task ids due that day
+		self.completed = {}   # ISO day -> set of done task ids completed that day
+		# Sorted keys of the two day indexes, for range queries
+		self._deadline_days = []
+		self._completed_days = []
+		self._listeners = []
+		self._muted = False
+
+	# --- Change notification ---
+	def subscribe(self, callback):
+		if callback not in self._listeners:
+			self._listeners.append(callback)
+
+	def unsubscribe(self, callback):
+		if callback in self._listeners:
+			self._listeners.remove(callback)
+
+	def _notify(self, event, item=None):
+		if self._muted:
+			return
+		for callback in list(self._listeners):
+			callback(event, item)
+
+	@contextmanager
+	def muted(self):
+		"""Suppress events inside the block and send a single "reset" after it."""
+		self._muted = True
+		try:
+			yield self
+		finally:
+			self._muted = False
+		self._notify("reset")
+
+	def __len__(self):
+		return len(self.tasks)
+
+	def __contains__(self, task_id):
+		return task_id in self.tasks
+
+	def get(self, task_id):
+		return self.tasks.get(task_id)
+
+	def clear(self):
+		self.tasks.clear()
+		self.categories.clear()
+		self.deadlines.clear()
+		self.completed.clear()
+		self._deadline_days = []
+		self._completed_days = []
+		self._notify("reset")
+
+	# --- Categories ---
+	def category_names(self):
+		return list(self.categories.keys())
+
+	def ensure_category(self, name, open_state=True, color=None):
+		"""Return the category called name, creating it at the end if needed."""
+		cat = self.categories.get(name)
+		if cat is None:
+			cat = Category(name, open_state, color)
+			self.categories[name] = cat
+			self._notify("category", cat)
+		return cat
+
+	def set_category_meta(self, name, open_state=None, color=None):
+		"""Update a category's open state and/or color (None leaves it unchanged)."""
+		cat = self.categories.get(name)
+		if cat is None:
+			return None
+		changed = False
+		if open_state is not None and bool(open_state) != cat.open:
+			cat.open = bool(open_state)
+			changed = True
+		if color is not None and color != cat.color:
+			cat.color = color
+			changed = True
+		if changed:
+			self._notify("category", cat)
+		return cat
+
+	def rename_category(self, old, new):
+		"""Rename a category, merging its tasks into new if that already exists."""
+		if old == new or old not in self.categories:
+			return
+		if new in self.categories:
+			cat = self.categories.pop(old)
+			target = self.categories[new]
+			target.task_ids.extend(cat.task_ids)
+			target.done += cat.done
+		else:
+			# Keep the category's position in the display order
+			target = self.categories[old]
+			target.name = new
+			self.categories = {(new if name == old else name): c for name, c in self.categories.items()}
+		for task_id in target.task_ids:
+			self.tasks[task_id].category = new
+		self._notify("reset")
+
+	def remove_category(self, name):
+		"""Remove a category and all of its tasks; returns the removed tasks."""
+		cat = self.categories.pop(name, None)
+		if cat is None:
+			return []
+		removed = [self.tasks.pop(task_id) for task_id in cat.task_ids]
+		for task in removed:
+			self._unindex_days(task)
+		self._notify("reset")
+		return removed
+
+	def reorder_categories(self, names):
+		"""Reorder categories to follow names; unknown names are ignored."""
+		ordered = {name: self.categories[name] for name in names if name in self.categories}
+		for name, cat in self.categories.items():
+			ordered.setdefault(name, cat)
+		if list(ordered) != list(self.categories):
+			self.categories = ordered
+			self._notify("reset")
+
+	def tasks_in(self, name):
+		cat = self.categories.get(name)
+		if cat is None:
+			return []
+		return [self.tasks[task_id] for task_id in cat.task_ids]
+
+	def category_counts(self, name):
+		"""Return (done, total) for a category in O(1)."""
+		cat = self.categories.get(name)
+		if cat is None:
+			return 0, 0
+		return cat.done, len(cat.task_ids)
+
+	# --- Tasks ---
+	def iter_tasks(self):
+		"""Yield every task in display order."""
+		for cat in self.categories.values():
+			for task_id in cat.task_ids:
+				yield self.tasks[task_id]
+
+	def add_task(self, category, text, index=None, **fields):
+		"""Create a task in category (created if missing) and return it."""
+		task = Task(text, category, **fields)
+		if task.id in self.tasks:
+			task.id = new_task_id()
+		self.insert(task, index)
+		return task
+
+	def insert(self, task, index=None):
+		"""Insert an existing Task record into its category."""
+		cat = self.ensure_category(task.category)
+		self.tasks[task.id] = task
+		self._index_days(task)
+		if index is None:
+			cat.task_ids.append(task.id)
+		else:
+			cat.task_ids.insert(index, task.id)
+		cat.done += task.done
+		self._notify("add", task)
+		return task
+
+	def remove_task(self, task_id):
+		task = self.tasks.pop(task_id, None)
+		if task is None:
+			return None
+		cat = self.categories.get(task.category)
+		if cat is not None:
+			cat.task_ids.remove(task_id)
+			cat.done -= task.done
+		self._unindex_days(task)
+		self._notify("remove", task)
+		return task
+
+	def move_task(self, task_id, category, index=None):
+		"""Move a task to category (at index, default end)."""
+		task = self.tasks[task_id]
+		old = self.categories[task.category]
+		old.task_ids.remove(task_id)
+		old.done -= task.done
+		task.category = category
+		cat = self.ensure_category(category)
+		if index is None:
+			cat.task_ids.append(task_id)
+		else:
+			cat.task_ids.insert(index, task_id)
+		cat.done += task.done
+		self._notify("move", task)
+		return task
+
+	def set_done(self, task_id, done, day=None):
+		"""Mark a task done (recording day) or not done (clearing it)."""
+		task = self.tasks[task_id]
+		done = bool(done)
+		if done != task.done:
+			self.categories[task.category].done += 1 if done else -1
+		self._unindex_days(task)
+		task.done = done
+		task.completed_date = day if done else None
+		self._index_days(task)
+		self._notify("update", task)
+		return task
+
+	def update_task(self, task_id, **fields):
+		task = self.tasks[task_id]
+		self._unindex_days(task)
+		for key, value in fields.items():
+			if key == "priority":
+				value = normalize_priority(value)
+			elif key == "deadline":
+				value = value or ""
+			elif key == "done":
+				value = bool(value)
+				if value != task.done:
+					self.categories[task.category].done += 1 if value else -1
+			setattr(task, key, value)
+		self._index_days(task)
+		self._notify("update", task)
+		return task
+
+	# --- Deadline and completion indexes ---
+	def _index_days(self, task):
+		if task.deadline:
+			_index_day(self.deadlines, self._deadline_days, task.deadline, task.id)
+		if task.done and task.completed_date:
+			_index_day(self.completed, self._completed_days, task.completed_date, task.id)
+
+	def _unindex_days(self, task):
+		if task.deadline:
+			_unindex_day(self.deadlines, self._deadline_days, task.deadline, task.id)
+		if task.completed_date:
+			_unindex_day(self.completed, self._completed_days, task.completed_date, task.id)
+
+	def tasks_due_between(self, start, end):
+		"""Return tasks whose ISO deadline falls in [start, end), by day."""
+		return self._tasks_between(self.deadlines, self._deadline_days, start, end)
+
+	def tasks_completed_between(self, start, end):
+		"""Return done tasks whose completed_date falls in [start, end), by day."""
+		return self._tasks_between(self.completed, self._completed_days, start, end)
+
+	def _tasks_between(self, index, days, start, end):
+		lo = bisect_left(days, start)
+		hi = bisect_left(days, end, lo)
+		return [self.tasks[task_id] for day in days[lo:hi] for task_id in index[day]]
+
+	def next_open_task(self, categories=None, priorities=None):
+		"""Return the first open task of the highest priority, in display order.
+
+		categories limits the search to those names and priorities to a set of
+		High/Medium/Low; None means all.
+		"""
+		best, best_rank = None, None
+		for name in (self.categories if categories is None else categories):
+			cat = self.categories.get(name)
+			if cat is None:
+				continue
+			for task_id in cat.task_ids:
+				task = self.tasks[task_id]
+				if task.done or (priorities is not None and task.priority not in priorities):
+					continue
+				rank = _PRIORITY_ORDER.get(task.priority, 1)
+				if best is None or rank < best_rank:
+					if rank == 0:
+						return task
+					best, best_rank = task, rank
+		return best
+
+	def sort_category(self, name, reverse=False):
+		"""Stable-sort a category by priority (High -> Low, or reverse)."""
+		cat = self.categories.get(name)
+		if cat is None:
+			return
+		tasks = self.tasks
+		before = list(cat.task_ids)
+		cat.task_ids.sort(key=lambda tid: _PRIORITY_ORDER.get(tasks[tid].priority, 1), reverse=reverse)
+		if cat.task_ids != before:
+			self._notify("order", cat)
+
+	def set_category_order(self, name, task_ids):
+		"""Put a category's tasks in the given order.
+
+		Ids that are not in the category are ignored and tasks missing from
+		task_ids keep their relative order at the end.
+		"""
+		cat = self.categories.get(name)
+		if cat is None:
+			return
+		current = set(cat.task_ids)
+		ordered = [task_id for task_id in dict.fromkeys(task_ids) if task_id in current]
+		seen = set(ordered)
+		ordered.extend(task_id for task_id in cat.task_ids if task_id not in seen)
+		if ordered != cat.task_ids:
+			cat.task_ids = ordered
+			self._notify("order", cat)
+
+	# --- Documents ---
+	def load_document(self, data):
+		"""Replace the store contents with a tasks.json document (any supported format)."""
+		with self.muted():
+			self.clear()
+			self._load_document(data)
+
+	def _load_document(self, data):
+		if isinstance(data, list):
+			self._load_task_list(data)
+			return
+		if not isinstance(data, dict):
+			return
+		if "tasks_by_category" in data:
+			for meta in data.get("categories", []):
+				self.ensure_category(meta.get("name", "General"),
+									 open_state=meta.get("open", True), color=meta.get("color"))
+			for name, items in data.get("tasks_by_category", {}).items():
+				self.ensure_category(name)
+				for item in items:
+					self.insert(self._unique(Task.from_dict(item, name)))
+				self.sort_category(name)
+		elif "tasks" in data:
+			self._load_task_list(data.get("tasks", []))
+
+	def load_stream(self, events):
+		"""Replace the store contents from streaming.iter_document() events.
+
+		Tasks are inserted as they arrive, so the whole document never has to
+		be in memory. Returns the other top-level fields (theme, stats, ...)
+		as a dict, or None if the document was a bare list of tasks.
+		"""
+		fields = None
+		order = None
+		sort_names = []
+		unsorted = set()  # categories whose tasks did not arrive in priority order
+		tasks = self.tasks
+		categories = self.categories
+		deadlines = self.deadlines
+		completed = self.completed
+		from_dict = Task.from_dict
+		cat_name = cat = None
+		last_rank = 0
+		with self.muted():
+			self.clear()
+			for event in events:
+				kind = event[0]
+				if kind == "task":
+					# insert(), minus what a muted bulk load does not need
+					task = from_dict(event[2], event[1])
+					if task.id in tasks:
+						task.id = new_task_id()
+					if task.category != cat_name:
+						cat_name = task.category
+						cat = categories.get(cat_name) or self.ensure_category(cat_name)
+						last_rank = 0
+					tasks[task.id] = task
+					cat.task_ids.append(task.id)
+					rank = _PRIORITY_ORDER[task.priority]
+					if rank < last_rank:
+						unsorted.add(cat_name)
+					last_rank = rank
+					# Day indexes are filled here and their sorted keys built once at the end
+					if task.deadline:
+						ids = deadlines.get(task.deadline)
+						if ids is None:
+							ids = deadlines[task.deadline] = set()
+						ids.add(task.id)
+					if task.done:
+						cat.done += 1
+						if task.completed_date:
+							ids = completed.get(task.completed_date)
+							if ids is None:
+								ids = completed[task.completed_date] = set()
+							ids.add(task.id)
+				elif kind == "category":
+					self.ensure_category(event[1])
+					sort_names.append(event[1])
+					if categories[event[1]].task_ids:
+						# Listed twice: the two runs of tasks are not in order together
+						unsorted.add(event[1])
+					cat_name = None
+				elif kind == "document":
+					fields = {} if event[1] == "object" else None
+				elif event[1] == "categories":
+					order = []
+					for meta in event[2]:
+						name = meta.get("name", "General")
+						self.ensure_category(name)
+						self.set_category_meta(name, open_state=meta.get("open", True), color=meta.get("color"))
+						order.append(name)
+				elif fields is not None:
+					fields[event[1]] = event[2]
+			self._deadline_days = sorted(deadlines)
+			self._completed_days = sorted(completed)
+			if order:
+				self.reorder_categories(order)
+			for name in sort_names:
+				if name in unsorted:
+					self.sort_category(name)
+		return fields
+
+	def adopt(self, other):
+		"""Take over the contents of another store (e.g. one loaded off to the side)."""
+		self.tasks = other.tasks
+		self.categories = other.categories
+		self.deadlines = other.deadlines
+		self.completed = other.completed
+		self._deadline_days = other._deadline_days
+		self._completed_days = other._completed_days
+		self._notify("reset")
+
+	def snapshot(self):
+		"""Frozen copy of the categories and tasks as plain tuples.
+
+		Cheap enough for the GUI thread (no dicts per task, unlike
+		to_document()); from_snapshot() turns it back into a store on
+		whichever thread writes it out.
+		"""
+		get_task = self.tasks.__getitem__
+		return [(cat.name, cat.open, cat.color, list(map(_task_row, map(get_task, cat.task_ids))))
+				for cat in self.categories.values()]
+
+	@classmethod
+	def from_snapshot(cls, snapshot):
+		"""A store holding a snapshot()'s tasks, for writing out (no day indexes)."""
+		store = cls()
+		tasks = store.tasks
+		for name, open_state, color, rows in snapshot:
+			cat = store.categories[name] = Category(name, open_state, color)
+			for row in rows:
+				task = tasks[row[0]] = Task.from_row(row)
+				cat.task_ids.append(task.id)
+				cat.done += task.done
+		return store
+
+	def _load_task_list(self, items):
+		# Backward compatibility: flat list of tasks with optional category
+		for item in items:
+			name = item.get("category", "General")
+			self.insert(self._unique(Task.from_dict(item, name)))
+
+	def _unique(self, task):
+		if task.id in self.tasks:
+			task.id = new_task_id()
+		return task
+
+	def to_document(self):
+		"""Return the tasks_by_category/categories part of a tasks.json document."""
+		return {
+			"tasks_by_category": {
+				name: [self.tasks[task_id].to_dict() for task_id in cat.task_ids]
+				for name, cat in self.categories.items()
+			},
+			"categories": [cat.to_dict() for cat in self.categories.values()],
+		}
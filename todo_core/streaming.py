@@ -0,0 +1,322 @@
+"""
+Streaming reader and writer for the tasks.json format.
+
+iter_document() walks a tasks_by_category document (or the older flat
+"tasks" list / bare list formats) and yields one event per category and
+task, decoding a single task at a time from a fixed-size read buffer.
+TaskStore.load_stream() consumes those events, so loading never holds the
+parsed document next to the store.
+
+Files up to FAST_LOAD_BYTES are parsed whole with json.load() (C code,
+several times faster than the scanner) and fed to the store as the same
+events by document_events(); only larger files are scanned incrementally.
+
+write_document() writes a store straight to a file, task by task, in the
+same layout json.dumps would produce, instead of building the whole
+document as a dict first.
+"""
+
+import gc
+import json
+import os
+import re
+
+from .persistence import DEFAULT_BACKUPS, backup_path, write_stream_atomic
+from .store import TaskStore
+
+# Files up to this size are parsed in one go; the parsed document briefly
+# costs several times the file size in memory
+FAST_LOAD_BYTES = 64 << 20
+
+_skip_whitespace = re.compile(r"[ \t\n\r]*").match
+_separator = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*").match
+_scan_value = json.JSONDecoder().scan_once
+
+
+class _Scanner:
+	"""Pulls JSON tokens and values out of a text file through a sliding buffer."""
+
+	def __init__(self, f, chunk_size):
+		self.f = f
+		self.chunk_size = chunk_size
+		self.buf = ""
+		self.pos = 0
+		self.offset = 0  # file offset of buf[0], for error messages
+		self.eof = False
+
+	def _more(self):
+		if self.eof:
+			return False
+		if self.pos:
+			# Drop what was consumed; a value larger than a chunk grows the read
+			self.offset += self.pos
+			self.buf = self.buf[self.pos:]
+			self.pos = 0
+		chunk = self.f.read(max(self.chunk_size, len(self.buf)))
+		if not chunk:
+			self.eof = True
+			return False
+		self.buf += chunk
+		return True
+
+	def peek(self):
+		"""Return the next non-whitespace character ("" at end of input)."""
+		while True:
+			buf = self.buf
+			pos = self.pos = _skip_whitespace(buf, self.pos).end()
+			if pos < len(buf):
+				return buf[pos]
+			if not self._more():
+				return ""
+
+	def expect(self, chars):
+		ch = self.peek()
+		if not ch or ch not in chars:
+			found = repr(ch) if ch else "end of file"
+			raise ValueError(f"Expected one of {chars!r} at offset {self.offset + self.pos}, found {found}")
+		self.pos += 1
+		return ch
+
+	def value(self):
+		self.peek()
+		while True:
+			try:
+				value, end = _scan_value(self.buf, self.pos)
+			except StopIteration:
+				if self._more():
+					continue
+				raise ValueError(f"Expecting value at offset {self.offset + self.pos}") from None
+			except ValueError:
+				if self._more():
+					continue
+				raise
+			if end == len(self.buf) and self._more():
+				# A number at the end of the buffer may continue in the next chunk
+				continue
+			self.pos = end
+			return value
+
+	def items(self):
+		"""Yield the values of the array whose "[" was just consumed."""
+		if self.peek() == "]":
+			self.pos += 1
+			return
+		while True:
+			# Fast path: value and separator both complete in the buffer
+			buf = self.buf
+			try:
+				value, end = _scan_value(buf, self.pos)
+			except (StopIteration, ValueError):
+				value = end = None
+			if end is not None and end < len(buf):
+				self.pos = end
+				yield value
+			else:
+				yield self.value()
+			sep = _separator(self.buf, self.pos)
+			if sep and sep.end() < len(self.buf):
+				self.pos = sep.end()
+				if sep.group(1) == "]":
+					return
+			elif self.expect(",]") == "]":
+				return
+			else:
+				self.peek()
+
+	def string(self):
+		if self.peek() != '"':
+			self.expect('"')
+		return self.value()
+
+
+def _iter_task_list(scanner):
+	# After "[": a flat list of task dicts carrying their category
+	for item in scanner.items():
+		yield ("task", item.get("category", "General"), item)
+
+
+def iter_document(f, chunk_size=1 << 16):
+	"""Yield events for the tasks.json document read from text file f.
+
+	("document", "object" | "list")   first, the top-level shape
+	("category", name)                a tasks_by_category entry starts
+	("task", category, item)          one task dict
+	("field", key, value)             any other top-level key (theme, stats, categories)
+	"""
+	scanner = _Scanner(f, chunk_size)
+	if scanner.expect("{[") == "[":
+		yield ("document", "list")
+		yield from _iter_task_list(scanner)
+	else:
+		yield ("document", "object")
+		if scanner.peek() == "}":
+			scanner.pos += 1
+		else:
+			while True:
+				key = scanner.string()
+				scanner.expect(":")
+				if key == "tasks_by_category" and scanner.peek() == "{":
+					scanner.pos += 1
+					if scanner.peek() == "}":
+						scanner.pos += 1
+					else:
+						while True:
+							name = scanner.string()
+							scanner.expect(":")
+							yield ("category", name)
+							scanner.expect("[")
+							for item in scanner.items():
+								yield ("task", name, item)
+							if scanner.expect(",}") == "}":
+								break
+				elif key == "tasks" and scanner.peek() == "[":
+					scanner.pos += 1
+					yield from _iter_task_list(scanner)
+				else:
+					yield ("field", key, scanner.value())
+				if scanner.expect(",}") == "}":
+					break
+	if scanner.peek():
+		raise ValueError(f"Extra data at offset {scanner.offset + scanner.pos}")
+
+
+def document_events(data):
+	"""Yield the iter_document() events of an already parsed document."""
+	if isinstance(data, list):
+		yield ("document", "list")
+		for item in data:
+			yield ("task", item.get("category", "General"), item)
+		return
+	if not isinstance(data, dict):
+		raise ValueError("Expected a JSON object or array")
+	yield ("document", "object")
+	for key, value in data.items():
+		if key == "tasks_by_category" and isinstance(value, dict):
+			for name, items in value.items():
+				yield ("category", name)
+				for item in items:
+					yield ("task", name, item)
+		elif key == "tasks" and isinstance(value, list):
+			for item in value:
+				yield ("task", item.get("category", "General"), item)
+		else:
+			yield ("field", key, value)
+
+
+def _events(f, size, max_bytes):
+	if size <= max_bytes:
+		return document_events(json.load(f))
+	return iter_document(f)
+
+
+def load_file(path, backups=DEFAULT_BACKUPS, max_bytes=FAST_LOAD_BYTES):
+	"""Load path, or its newest readable backup, into a new TaskStore.
+
+	Files up to max_bytes are parsed with json.load(), larger ones are
+	streamed (max_bytes=0 always streams). Returns (store, fields,
+	source_path) with fields as from TaskStore.load_stream(). Raises the
+	error from the main file if neither it nor any backup can be read.
+	"""
+	first_error = None
+	for candidate in [path] + [backup_path(path, n) for n in range(1, backups + 1)]:
+		store = TaskStore()
+		try:
+			# The cycle collector would rescan the growing store over and over
+			collecting = gc.isenabled()
+			gc.disable()
+			try:
+				with open(candidate, "r", encoding="utf-8") as f:
+					fields = store.load_stream(_events(f, os.fstat(f.fileno()).st_size, max_bytes))
+			finally:
+				if collecting:
+					gc.enable()
+			return store, fields, candidate
+		except (OSError, ValueError) as e:
+			if first_error is None:
+				first_error = e
+	raise first_error
+
+
+def _dump(value, compact, level):
+	if compact:
+		return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+	return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + "  " * level)
+
+
+def write_document(f, store, extras=None, compact=False):
+	"""Write store as a tasks.json document to text file f, one task at a time.
+
+	extras holds the other top-level fields; "theme" is written first and
+	the rest after "categories", matching the app's document layout.
+	Returns the number of tasks written.
+	"""
+	extras = dict(extras or {})
+	newline = "" if compact else "\n"
+	colon = ":" if compact else ": "
+
+	def pad(level):
+		return "" if compact else "  " * level
+
+	fields = 0
+	written = 0
+
+	def field(key):
+		nonlocal fields
+		f.write(("," if fields else "") + newline + pad(1) + _dump(key, compact, 1) + colon)
+		fields += 1
+
+	f.write("{")
+	if "theme" in extras:
+		field("theme")
+		f.write(_dump(extras.pop("theme"), compact, 1))
+	field("tasks_by_category")
+	if not store.categories:
+		f.write("{}")
+	else:
+		f.write("{")
+		tasks = store.tasks
+		for i, cat in enumerate(store.categories.values()):
+			f.write(("," if i else "") + newline + pad(2) + _dump(cat.name, compact, 2) + colon)
+			if not cat.task_ids:
+				f.write("[]")
+				continue
+			f.write("[")
+			for j, task_id in enumerate(cat.task_ids):
+				f.write(("," if j else "") + newline + pad(3) + _dump(tasks[task_id].to_dict(), compact, 3))
+				written += 1
+			f.write(newline + pad(2) + "]")
+		f.write(newline + pad(1) + "}")
+	field("categories")
+	f.write(_dump([cat.to_dict() for cat in store.categories.values()], compact, 1))
+	for key, value in extras.items():
+		field(key)
+		f.write(_dump(value, compact, 1))
+	f.write(newline + "}")
+	return written
+
+
+def _count_tasks(path):
+	with open(path, "r", encoding="utf-8") as f:
+		return sum(1 for event in iter_document(f) if event[0] == "task")
+
+
+def save_file(path, store, extras=None, compact=False, backups=DEFAULT_BACKUPS, verify=True):
+	"""Stream store to path atomically, keeping rotated backups.
+
+	Tasks are counted as they are written. With verify the temp file is
+	also read back with the streaming reader before it replaces path, so a
+	file that would not load again is never installed; autosaves, which
+	write from a snapshot every few seconds, skip that.
+	"""
+	expected = len(store)
+	written = []
+
+	def write(f):
+		written.append(write_document(f, store, extras, compact))
+
+	def check(tmp_path):
+		count = written[0] if not verify else _count_tasks(tmp_path)
+		if count != expected:
+			raise ValueError(f"Wrote {count} of {expected} tasks")
+
+	write_stream_atomic(path, write, backups=backups, verify=check)
@@ -0,0 +1,95 @@
+"""
+Colors derived from a theme.
+
+A theme is a dict of base colors (bg, fg, listbox_bg, button_bg, ...).
+The task tree also shows colors computed from them: the alternating-row
+shade, the overdue highlight, the selection accent and a pastel
+background per category color. derive_palette() works those out once per
+theme, and PaletteCache keeps the palettes of recently used themes, so
+switching back and forth between themes does no color math.
+"""
+
+from collections import OrderedDict
+
+
+def parse_hex(color):
+	"""(r, g, b) of a "#rrggbb" color, or None if it is not one."""
+	if not isinstance(color, str) or len(color) != 7 or not color.startswith("#"):
+		return None
+	try:
+		return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+	except ValueError:
+		return None
+
+
+def to_hex(rgb):
+	return "#{:02x}{:02x}{:02x}".format(*rgb)
+
+
+def blend(color, bg, alpha):
+	"""color laid over bg at alpha opacity; bg itself if either is not a hex color."""
+	rgb, bg_rgb = parse_hex(color), parse_hex(bg)
+	if rgb is None or bg_rgb is None:
+		return bg
+	return to_hex(int(c * alpha + b * (1 - alpha)) for c, b in zip(rgb, bg_rgb))
+
+
+class Palette:
+	"""The colors the app derives from one theme."""
+
+	CATEGORY_ALPHA = 0.25   # category rows: their color at 25% over the list background
+	OVERDUE_COLOR = "#ff0000"
+
+	def __init__(self, theme):
+		self.theme = dict(theme)
+		self.listbox_bg = theme.get("listbox_bg", "#ffffff")
+		bg_rgb = parse_hex(self.listbox_bg) or (255, 255, 255)
+		# A slightly different shade for alternating rows (5% lighter/darker)
+		if sum(bg_rgb) < 384:
+			self.alt_bg = to_hex(min(255, int(c * 1.05)) for c in bg_rgb)
+		else:
+			self.alt_bg = to_hex(max(0, int(c * 0.95)) for c in bg_rgb)
+		self.overdue_bg = blend(self.OVERDUE_COLOR, self.listbox_bg, 0.25)
+		# Strong selection accent chosen by perceived brightness
+		brightness = (0.299 * bg_rgb[0] + 0.587 * bg_rgb[1] + 0.114 * bg_rgb[2]) / 255.0
+		self.accent_bg = "#1976d2" if brightness > 0.5 else "#4a90e2"
+		self.accent_fg = "#ffffff"
+		self._blends = {}
+
+	def blend(self, color, alpha):
+		"""color over the list background at alpha, memoized."""
+		key = (color, alpha)
+		if key not in self._blends:
+			self._blends[key] = blend(color, self.listbox_bg, alpha)
+		return self._blends[key]
+
+	def category_bg(self, color):
+		return self.blend(color, self.CATEGORY_ALPHA)
+
+
+def theme_key(theme):
+	"""Hashable identity of a theme's contents (themes are edited in place)."""
+	return tuple(sorted((key, str(value)) for key, value in theme.items()))
+
+
+def derive_palette(theme):
+	return Palette(theme)
+
+
+class PaletteCache:
+	"""Palettes of the most recently used themes, by theme contents."""
+
+	def __init__(self, max_themes=16):
+		self.max_themes = max_themes
+		self._palettes = OrderedDict()
+
+	def palette(self, theme):
+		key = theme_key(theme)
+		palette = self._palettes.get(key)
+		if palette is None:
+			palette = self._palettes[key] = derive_palette(theme)
+			if len(self._palettes) > self.max_themes:
+				self._palettes.popitem(last=False)
+		else:
+			self._palettes.move_to_end(key)
+		return palette
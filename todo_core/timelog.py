@@ -0,0 +1,139 @@
+"""
+Time tracked on tasks.
+
+Each stretch of stopwatch or Pomodoro work is one interval: the task's id,
+its category and priority at the time, and start/end times in epoch
+seconds. TimeLog appends intervals to a JSON-lines file (time_log.jsonl in
+the data directory) and never rewrites it.
+
+TimeTotals folds intervals into running totals per task and per day, with
+each day split by category and priority. Adding an interval only touches
+the days it covers, so reports are read off the totals; the log file
+itself is read once, when it is opened. An interval that runs past
+midnight counts toward each day it covers (local time).
+"""
+
+import json
+import os
+from datetime import date, datetime, timedelta
+
+TIME_LOG = "time_log.jsonl"
+
+
+def split_by_day(start, end):
+	"""Yield (day_str, seconds) for each local calendar day that start..end covers."""
+	moment = datetime.fromtimestamp(start)
+	stop = datetime.fromtimestamp(end)
+	while moment < stop:
+		midnight = datetime.combine(moment.date() + timedelta(days=1), datetime.min.time())
+		upto = min(midnight, stop)
+		yield moment.date().isoformat(), (upto - moment).total_seconds()
+		moment = upto
+
+
+def _add(counts, key, seconds):
+	counts[key] = counts.get(key, 0.0) + seconds
+
+
+class TimeTotals:
+	"""Seconds tracked per task and per day (and per category/priority within a day)."""
+
+	def __init__(self):
+		self.total = 0.0
+		self.intervals = 0
+		self.by_task = {}      # task id -> seconds
+		self.by_day = {}       # "YYYY-MM-DD" -> seconds
+		self.categories = {}   # day -> {category: seconds}
+		self.priorities = {}   # day -> {priority: seconds}
+
+	def add(self, interval):
+		"""Fold one interval dict (task, cat, pri, start, end) into the totals."""
+		start, end = float(interval["start"]), float(interval["end"])
+		if end <= start:
+			return
+		category = interval.get("cat") or "General"
+		priority = interval.get("pri") or "Medium"
+		self.intervals += 1
+		self.total += end - start
+		_add(self.by_task, interval["task"], end - start)
+		for day, seconds in split_by_day(start, end):
+			_add(self.by_day, day, seconds)
+			_add(self.categories.setdefault(day, {}), category, seconds)
+			_add(self.priorities.setdefault(day, {}), priority, seconds)
+
+	def report(self, start=None, end=None):
+		"""Totals for the days start..end inclusive ("YYYY-MM-DD" strings; None = open-ended).
+
+		Returns {"total", "days", "categories", "priorities"} in seconds, each
+		breakdown sorted by time, most first.
+		"""
+		days = {}
+		categories = {}
+		priorities = {}
+		for day, seconds in self.by_day.items():
+			if start and day < start or end and day > end:
+				continue
+			days[day] = seconds
+			for name, value in self.categories[day].items():
+				_add(categories, name, value)
+			for name, value in self.priorities[day].items():
+				_add(priorities, name, value)
+
+		def by_time(counts):
+			return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+		return {"total": sum(days.values()), "days": dict(sorted(days.items())),
+				"categories": by_time(categories), "priorities": by_time(priorities)}
+
+	def last_days(self, days, today=None):
+		"""report() for the last days days, today included."""
+		today = today or date.today()
+		return self.report((today - timedelta(days=days - 1)).isoformat(), today.isoformat())
+
+
+class TimeLog:
+	"""Append-only log of tracked intervals with totals kept up to date."""
+
+	def __init__(self, path):
+		self.path = path
+		self.totals = TimeTotals()
+		self._newline = False  # the file ends mid-line (torn write) and needs one first
+		self.load()
+
+	def load(self):
+		"""(Re)read the log into fresh totals; unreadable lines are skipped."""
+		self.totals = TimeTotals()
+		self._newline = False
+		try:
+			f = open(self.path, "r", encoding="utf-8")
+		except OSError:
+			return
+		with f:
+			line = ""
+			for line in f:
+				try:
+					self.totals.add(json.loads(line))
+				except (ValueError, KeyError, TypeError):
+					continue
+			self._newline = bool(line) and not line.endswith("\n")
+
+	def record(self, task, start, end):
+		"""Append the interval start..end (epoch seconds) worked on task and count it."""
+		interval = {"task": task.id, "cat": task.category, "pri": task.priority,
+					"start": round(start, 1), "end": round(end, 1)}
+		directory = os.path.dirname(self.path)
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+		with open(self.path, "a", encoding="utf-8") as f:
+			if self._newline:
+				f.write("\n")
+			f.write(json.dumps(interval, ensure_ascii=False) + "\n")
+		self._newline = False
+		self.totals.add(interval)
+		return interval
+
+
+def format_seconds(seconds):
+	"""H:MM:SS"""
+	seconds = int(seconds)
+	return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
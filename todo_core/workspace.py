@@ -0,0 +1,194 @@
+"""
+Opening a data directory without the GUI.
+
+load_tasks() is what the desktop app runs at startup (tasks.db or
+tasks.json plus any journal left behind, whichever was written last), and
+Workspace wraps it with saving for scripts and the command line, so both
+read and write a data directory the same way.
+"""
+
+import os
+
+from . import journal
+from .persistence import read_json_verified
+from .sqlite_store import SQLiteBackend, save_store
+from .store import TaskStore
+from .streaming import load_file, save_file
+from .timelog import TIME_LOG, TimeLog
+
+TASKS_JSON = "tasks.json"
+TASKS_DB = "tasks.db"
+SETTINGS_JSON = "todo_settings.json"
+
+
+def load_settings(path):
+	"""Return the settings dict saved at path ({} if missing or unreadable)."""
+	if not os.path.exists(path):
+		return {}
+	try:
+		data, _ = read_json_verified(path)
+	except Exception:
+		return {}
+	return data if isinstance(data, dict) else {}
+
+
+def _newest_mtime(*paths):
+	"""Latest modification time among the paths that exist (None if none do)."""
+	newest = None
+	for path in paths:
+		try:
+			mtime = os.stat(path).st_mtime
+		except OSError:
+			continue
+		if newest is None or mtime > newest:
+			newest = mtime
+	return newest
+
+
+def _load_json(tasks_file, log):
+	"""tasks_file (or its newest good backup) with the journal replayed on top."""
+	try:
+		# Falls back to the newest good backup if the file is damaged
+		store, fields, source = load_file(tasks_file)
+		if source != tasks_file:
+			log(f"{tasks_file} could not be read; loaded backup {source}")
+	except (OSError, ValueError):
+		store, fields = TaskStore(), None
+	state = {}
+	replayed = 0
+	try:
+		replayed = journal.replay(store, tasks_file, state)
+	except Exception as e:
+		log(f"Could not replay {journal.journal_path(tasks_file)}: {e}")
+	if replayed:
+		log(f"Recovered {replayed} change(s) from {journal.journal_path(tasks_file)}")
+		fields = dict(fields or {})
+		if state.get("theme"):
+			fields["theme"] = state["theme"]
+		if state.get("daily_counts"):
+			counts = dict(fields.get("stats", {}).get("daily_counts", {}))
+			counts.update(state["daily_counts"])
+			fields["stats"] = {"daily_counts": counts}
+	return store, fields, replayed
+
+
+def _load_db(tasks_db):
+	db = SQLiteBackend(tasks_db)
+	try:
+		data = db.load_document()
+	finally:
+		db.close(compact=False)
+	store = TaskStore()
+	store.load_document(data)
+	return store, data
+
+
+def load_tasks(tasks_file, tasks_db, backend="json", log=print):
+	"""Load the task store the way the app does at startup.
+
+	With the "sqlite" backend tasks come from tasks_db; otherwise tasks_file
+	is streamed in and any journal next to it is replayed on top. Each file
+	is only written while its backend is in use, so after a backend switch
+	the other one is stale: if it was written last it is copied over first
+	(tasks_file migrated into tasks_db, or tasks_db exported to tasks_file).
+	Falls back to tasks_file, then to an empty store.
+
+	Returns (store, fields, replayed): fields holds the document's other
+	top-level keys (theme, stats) or None if there were none, and replayed
+	is the number of journal records applied.
+	"""
+	journal_file = journal.journal_path(tasks_file)
+	json_time = _newest_mtime(tasks_file, journal_file, journal_file + ".1")
+	# Commits land in the write-ahead log until it is checkpointed
+	db_time = _newest_mtime(tasks_db, tasks_db + "-wal")
+	if backend == "sqlite":
+		if json_time is not None and (db_time is None or json_time > db_time):
+			store, fields, replayed = _load_json(tasks_file, log)
+			fields = fields or {}
+			try:
+				save_store(tasks_db, store, fields.get("theme"), fields.get("stats", {}).get("daily_counts", {}))
+				log(f"Migrated {len(store)} tasks from {tasks_file} to {tasks_db}")
+			except Exception as e:
+				log(f"Could not write {tasks_db}: {e}")
+			return store, fields, replayed
+		try:
+			store, data = _load_db(tasks_db)
+			return store, data, 0
+		except Exception as e:
+			log(f"Could not read {tasks_db}, loading {tasks_file}: {e}")
+	elif db_time is not None and (json_time is None or db_time > json_time):
+		# Saved in SQLite mode since tasks.json was last written
+		try:
+			store, data = _load_db(tasks_db)
+		except Exception as e:
+			log(f"Could not read {tasks_db}, loading {tasks_file}: {e}")
+		else:
+			try:
+				save_file(tasks_file, store, {key: value for key, value in data.items()
+											  if key not in ("tasks_by_category", "categories")})
+				# Any journal is older than the database and already in it
+				journal.discard(tasks_file)
+				log(f"Exported {len(store)} tasks from {tasks_db} to {tasks_file}")
+			except (OSError, ValueError) as e:
+				log(f"Could not write {tasks_file}: {e}")
+			return store, data, 0
+	return _load_json(tasks_file, log)
+
+
+class Workspace:
+	"""Tasks, completion stats and theme of one data directory."""
+
+	def __init__(self, data_dir, backend=None, log=print):
+		self.data_dir = data_dir
+		self.tasks_file = os.path.join(data_dir, TASKS_JSON)
+		self.tasks_db = os.path.join(data_dir, TASKS_DB)
+		self.settings = load_settings(os.path.join(data_dir, SETTINGS_JSON))
+		self.backend = backend or self.settings.get("storage_backend", "json")
+		self.store, fields, self.replayed = load_tasks(self.tasks_file, self.tasks_db, self.backend, log)
+		fields = fields or {}
+		self.theme = fields.get("theme")
+		self.daily_counts = dict(fields.get("stats", {}).get("daily_counts", {}))
+		self._db = None
+		self._time_log = None
+		if self.backend == "sqlite" and os.path.exists(self.tasks_db):
+			# Changes are written through to the database as they happen
+			try:
+				self._db = SQLiteBackend(self.tasks_db)
+			except Exception as e:
+				log(f"Could not open {self.tasks_db}, saving to {self.tasks_file}: {e}")
+			else:
+				self._db.attach(self.store)
+
+	def time_log(self):
+		"""The TimeLog of this data directory, read on first use."""
+		if self._time_log is None:
+			self._time_log = TimeLog(os.path.join(self.data_dir, TIME_LOG))
+		return self._time_log
+
+	def extras(self):
+		"""The non-task fields of tasks.json."""
+		extras = {"theme": self.theme} if self.theme else {}
+		extras["stats"] = {"daily_counts": dict(self.daily_counts)}
+		return extras
+
+	def replace(self, store, fields=None):
+		"""Swap in a store loaded from elsewhere (and its theme/stats, if given)."""
+		self.store.adopt(store)
+		if fields is not None:
+			self.theme = fields.get("theme") or self.theme
+			self.daily_counts = dict(fields.get("stats", {}).get("daily_counts", {}))
+
+	def save(self):
+		"""Write everything back: commit to tasks.db, or rewrite tasks.json."""
+		if self._db is not None:
+			self._db.write_document_extras(self.theme, self.daily_counts)
+			self._db.sync()
+			return
+		save_file(self.tasks_file, self.store, self.extras(), compact=self.settings.get("compact_json", False))
+		# The snapshot now contains whatever the journal held
+		journal.discard(self.tasks_file)
+
+	def close(self):
+		if self._db is not None:
+			self._db.close()
+			self._db = None
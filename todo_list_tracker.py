@@ -10,9 +10,31 @@ __date__ = "2025-10-25"
 import os
 import sys
 import json
-from datetime import date, timedelta
-import tkinter as tk
-from tkinter import simpledialog, filedialog, messagebox, ttk
+import copy
+import time
+_MODULE_START = time.perf_counter()  # for the startup timing report
+from datetime import date, datetime, timedelta
+try:
+	import tkinter as tk
+	from tkinter import simpledialog, filedialog, messagebox, ttk
+	import tkinter.font as tkfont
+except ImportError:
+	# The command line (python -m todo_list_tracker add ...) works without Tk
+	tk = None
+
+from todo_core import TaskStore, normalize_priority, priority_order
+from todo_core import ai as ai_heuristics
+from todo_core import stats as completion_stats
+from todo_core.persistence import write_json_atomic, read_json_verified
+from todo_core.autosave import Autosaver
+from todo_core.imagecache import AssetImageCache, LRUCache
+from todo_core.themes import Palette, PaletteCache, parse_hex
+from todo_core.timelog import TIME_LOG, TimeLog, format_seconds
+from todo_core.assets import AssetPipeline, THUMB_SIZE, thumb_path as asset_thumb_path, thumb_is_fresh
+from todo_core import journal
+from todo_core import workspace
+from todo_core.sqlite_store import SQLiteBackend
+from todo_core.streaming import load_file, save_file
 
 def get_app_dir():
 	if getattr(sys, 'frozen', False):
@@ -28,11 +50,16 @@ os.makedirs(DATA_DIR, exist_ok=True)
 
 # Default paths
 TASKS_FILE = os.path.join(DATA_DIR, "tasks.json")
+TASKS_DB = os.path.join(DATA_DIR, "tasks.db")
 DEFAULT_THEME = "Light"
 
 class TodoApp:
 	def __init__(self, root):
 		self.root = root
+		# Startup timing report: (step, milliseconds), see _startup_mark
+		self._startup_times = [("imports", (time.perf_counter() - _MODULE_START) * 1000)]
+		self._startup_last = time.perf_counter()
+		self._startup_total_ms = 0.0  # set once the window is first drawn
 		root.title(f"To-Do List Tracker v{__version__}")
         
 		# Set up window close handler
@@ -137,6 +164,10 @@ class TodoApp:
 		
 		# Load custom themes from file
 		self._load_themes_from_file()
+		# Colors derived from each theme, and what apply_theme last gave ttk styles and tree tags
+		self._palettes = PaletteCache()
+		self._style_options = {}
+		self._tag_options = {}
 		
 		# Initialize XP system
 		self.xp = 0
@@ -146,6 +177,14 @@ class TodoApp:
 		self.unlocked_items = set()
 		self.pets = []  # List of active pets {"type": str, "x": int, "y": int, "direction": str}
 		self.custom_assets = []  # List of custom PNG assets {"path": str, "x": float, "y": float, "scale": float}
+		# Decoded frames and resized PhotoImages of custom assets, shared by the room and the designer preview
+		self._asset_image_cache = AssetImageCache()
+		self._asset_clock_start = time.perf_counter()  # GIF assets play from here (see _asset_frame)
+		self.ASSET_REFRESH_SECONDS = 10  # how often room redraws check asset files for edits
+		self._asset_refresh_time = time.monotonic()
+		self._asset_pipeline = None     # background asset import/thumbnail workers (_asset_pipeline_for)
+		self._asset_thumbs = {}         # asset path -> (thumbnail mtime, PhotoImage) for the asset list
+		self._asset_thumb_failed = set()
 		self.STARTER_PETS = ["pet_cat", "pet_dog"]
 		
 		# Define unlock thresholds (level -> unlockable items)
@@ -306,26 +345,57 @@ class TodoApp:
 		tk.Button(self.btn_frame, text="Load Demo", width=12, command=self._seed_test_tasks).pack(side="right")
 		tk.Button(self.btn_frame, text="Save", width=10, command=self.save_tasks).pack(side="right")
 		tk.Button(self.btn_frame, text="Load", width=10, command=self.load_tasks).pack(side="right", padx=(0,6))
+		self.autosave_label = tk.Label(self.btn_frame, text="", font=("", 8), fg="#666666")
+		self.autosave_label.pack(side="right", padx=6)
 
 		# Bindings
 		self.tree.bind("<Double-1>", lambda e: self.toggle_complete())
 		self.tree.bind("<Delete>", lambda e: self.remove_task())
 		self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+		self.tree.bind('<<TreeviewOpen>>', lambda e: self._on_category_open_state(True))
+		self.tree.bind('<<TreeviewClose>>', lambda e: self._on_category_open_state(False))
 		self.tree.bind("<Button-3>", self._on_tree_right_click)  # Right-click context menu
 		# Drag & drop
 		self.tree.bind("<ButtonPress-1>", self._on_tree_press)
 		self.tree.bind("<B1-Motion>", self._on_tree_motion)
 		self.tree.bind("<ButtonRelease-1>", self._on_tree_release)
 
-		# Category tracking and colors
+		# Task model (source of truth) and category tracking
+		self.store = TaskStore()
+		# Autosave: mutations only set these flags; _autosave_tick snapshots
+		# and a worker thread writes at most once per interval
+		self.autosaver = Autosaver(interval=3.0)
+		# Optional task storage backend (settings "storage_backend"): the
+		# append-only journal or the SQLite database; None means JSON autosave
+		self.task_backend = None
+		self._journal_replayed = 0
+		self._tasks_dirty = False
+		self._settings_dirty = False
+		self._pending_view_tasks = set()
+		self._pending_view_reset = False
+		self._view_flush_id = None
+		self.store.subscribe(self._on_store_change)
 		self.categories = {}  # name -> tree item id
-		self.category_colors = {}  # name -> color
+		# (row id, color, background) last applied to each category row
+		self._category_tags = {}
+		# Row tag currently applied to each task row ('oddrow', 'overdue' or None)
+		self._row_tags = {}
+		# (done, total) currently shown in each category label
+		self._count_labels = {}
+		# Categories whose task rows exist in the tree; collapsed categories
+		# only get a placeholder child until they are first expanded
+		self._materialized = set()
+		self._collapse_timers = {}  # name -> after id for dropping rows
+		self.COLLAPSED_ROWS_TTL_MS = 5 * 60 * 1000  # drop rows collapsed this long
+		self._tag_today = date.today().isoformat()
+		self._rollover_after_id = None
 		self._last_category = "General"  # remember last used category
 		self._priority_sort_reverse = False  # False=High->Low, True=Low->High
 		self._category_sort_reverse = False  # False=A->Z, True=Z->A
 		# Stats tracking
 		self.stats_daily = {}  # date_str -> count
-		self.task_meta = {}    # tree item id -> {"last_completed_date": str|None, "deadline": str|None}
+		self._stats_series = None  # stats_daily as a DailySeries for the Stats tab (_daily_series)
+		self._time_log = None  # TimeLog of stopwatch/Pomodoro intervals, read on first use (_get_time_log)
 		self._color_palette = [
 			"#e6194B", "#3cb44b", "#ffe119", "#0082c8", "#f58231",
 			"#911eb4", "#46f0f0", "#f032e6", "#d2f53c", "#fabebe",
@@ -335,7 +405,84 @@ class TodoApp:
 		self._drag_item = None
 		self._drag_over = None
 
-		# --- Stats tab UI (7-day completion graph) ---
+		self._startup_mark("tasks tab")
+
+		# ===== SETTINGS =====
+		self._init_settings()
+		self._load_avatar_progress()
+		self._startup_mark("settings")
+
+		# Every tab except Tasks is built the first time it is selected
+		self._tab_builders = {
+			str(self.daily_tab): self._setup_daily_tab,
+			str(self.ai_tasks_tab): self._setup_ai_tasks_tab,
+			str(self.stats_tab): self._setup_stats_tab,
+			str(self.calendar_tab): self._setup_calendar_tab,
+			str(self.theme_editor_tab): self._setup_theme_editor,
+			str(self.settings_tab): self._setup_settings_tab,
+			str(self.avatar_room_tab): self._setup_avatar_room_tab,
+		}
+		self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+		# Initial load and theme
+		self.load_tasks(startup=True)
+		self._tasks_dirty = False  # freshly loaded from disk
+		self._startup_mark("load tasks")
+		self._setup_storage()
+		self._startup_mark("storage")
+		self._schedule_day_rollover()
+		self.root.after(1000, self._autosave_tick)
+		self.apply_theme()
+		self._refresh_all_category_colors()  # Ensure consistent 25% opacity on all categories
+		self.tree.heading("priority", command=self._sort_all_by_priority)
+		self._startup_mark("theme")
+		# Ensure the window cannot be resized so small that controls are hidden
+		self._update_min_window_size()
+		self._startup_mark("layout")
+		# First idle callback: the window is drawn and accepting input
+		self.root.after_idle(self._startup_finished)
+
+	def _startup_mark(self, step):
+		"""Record how long the startup step that just ended took."""
+		now = time.perf_counter()
+		self._startup_times.append((step, (now - self._startup_last) * 1000))
+		self._startup_last = now
+
+	def _startup_finished(self):
+		self._startup_mark("first draw")
+		self._startup_total_ms = sum(ms for _, ms in self._startup_times)
+		if self.settings.get("startup_report", False):
+			print(self._startup_report())
+
+	def _startup_report(self):
+		"""Where the startup milliseconds went, one step per line."""
+		lines = [f"Startup: {self._startup_total_ms:.0f} ms to interactive"]
+		for step, ms in self._startup_times:
+			lines.append(f"  {step:<24}{ms:8.1f} ms")
+		return "\n".join(lines)
+
+	def _on_tab_changed(self, event=None):
+		"""Build the selected tab the first time it is shown."""
+		try:
+			tab = self.notebook.select()
+		except Exception:
+			return
+		builder = self._tab_builders.pop(str(tab), None)
+		if builder is not None:
+			start = time.perf_counter()
+			builder()
+			# New widgets start with Tk defaults: theme just this tab (styles are already set)
+			self._theme_tab(self.notebook.nametowidget(tab))
+			self._theme_tab_widgets()
+			ms = (time.perf_counter() - start) * 1000
+			self._startup_times.append((f"{self.notebook.tab(tab, 'text')} tab (on first visit)", ms))
+			if self.settings.get("startup_report", False):
+				print(f"Built {self.notebook.tab(tab, 'text')} tab in {ms:.1f} ms")
+		# The avatar scene only animates while its tab is showing
+		self._animate_pets()
+
+	def _setup_stats_tab(self):
+		"""Set up the Stats tab (completion graph over 7, 30, 90 or 365 days)."""
 		self.stats_header = tk.Frame(self.stats_tab)
 		self.stats_header.pack(padx=8, pady=8, fill="x")
 		self.stats_title_label = tk.Label(self.stats_header, text="Task Completion (7 Days)")
@@ -359,6 +506,14 @@ class TodoApp:
 		self.stats_hint_label = tk.Label(self.stats_header, text="Past 3 / Today / Next 3", font=("Arial", 9))
 		self.stats_hint_label.pack(side="left", padx=8)
 		
+		# Graph range; 365 days is shown as weekly totals
+		self.STATS_RANGES = (7, 30, 90, 365)
+		self.stats_range_var = tk.StringVar(value="7 days")
+		stats_range_combo = ttk.Combobox(self.stats_header, textvariable=self.stats_range_var, state="readonly",
+										 values=[f"{n} days" for n in self.STATS_RANGES], width=9)
+		stats_range_combo.pack(side="left", padx=8)
+		stats_range_combo.bind("<<ComboboxSelected>>", lambda e: self._update_stats_view())
+		
 		# Graph type selector
 		self.stats_graph_type = tk.StringVar(value="bar")
 		self.stats_type_frame = tk.Frame(self.stats_header)
@@ -372,14 +527,20 @@ class TodoApp:
 										  highlightthickness=0, bd=0, relief="flat", indicatoron=True, takefocus=0)
 		self.stats_line_radio.pack(side="left", padx=2)
 		
+		# Totals, streaks and rollups for the shown range
+		self.stats_summary_label = tk.Label(self.stats_tab, text="", anchor="w", font=("Arial", 9))
+		self.stats_summary_label.pack(padx=8, fill="x")
+		
 		self.stats_canvas = tk.Canvas(self.stats_tab, height=300, highlightthickness=0)
 		self.stats_canvas.pack(padx=8, pady=(0,8), fill="both", expand=True)
 		self.stats_canvas.bind("<Configure>", lambda e: self._update_stats_view())
 
 		# Stats center date for scrolling
 		self.stats_center_date = date.today()
-		
-		# --- Calendar tab UI (navigable monthly/weekly view) ---
+		self._update_stats_view()
+
+	def _setup_calendar_tab(self):
+		"""Set up the Calendar tab (navigable monthly/weekly view)."""
 		self.cal_header = tk.Frame(self.calendar_tab)
 		self.cal_header.pack(padx=8, pady=8, fill="x")
 		
@@ -417,31 +578,7 @@ class TodoApp:
 		
 		# Calendar navigation state
 		self.cal_current_date = date.today()
-
-		# ===== SETTINGS =====
-		self._init_settings()
-
-		# ===== THEME EDITOR TAB =====
-		self._setup_theme_editor()
-
-		# ===== AI TASKS TAB =====
-		self._setup_ai_tasks_tab()
-
-		# ===== SETTINGS TAB =====
-		self._setup_settings_tab()
-
-		# ===== AVATAR ROOM TAB =====
-		self._setup_avatar_room_tab()
-
-		# Initial load and theme
-		self.load_tasks(startup=True)
-		self.apply_theme()
-		self._refresh_all_category_colors()  # Ensure consistent 25% opacity on all categories
-		self.tree.heading("priority", command=self._sort_all_by_priority)
-		self._update_stats_view()
 		self._update_calendar_view()
-		# Ensure the window cannot be resized so small that controls are hidden
-		self._update_min_window_size()
 
 	def _update_min_window_size(self):
 		"""Compute and set a reasonable minimum window size so controls don't get clipped."""
@@ -484,29 +621,45 @@ class TodoApp:
 							 bg=col_color, pady=10)
 			header.pack(fill="x")
 			
-			# Scrollable task area
+			# Scrollable task area: cards are pooled canvas windows placed at
+			# fixed slots, and only the slots in the viewport are filled
 			canvas = tk.Canvas(col_frame, bg=col_color, highlightthickness=0)
 			scrollbar = ttk.Scrollbar(col_frame, orient="vertical", command=canvas.yview)
-			task_container = tk.Frame(canvas, bg=col_color)
 			
-			canvas.configure(yscrollcommand=scrollbar.set)
+			canvas.configure(yscrollcommand=lambda first, last, c=col_name, sb=scrollbar:
+							 self._kanban_on_scroll(c, sb, first, last))
 			scrollbar.pack(side="right", fill="y")
 			canvas.pack(side="left", fill="both", expand=True)
-			
-			canvas_window = canvas.create_window((0, 0), window=task_container, anchor="nw")
-			task_container.bind("<Configure>", 
-							   lambda e, c=canvas: c.configure(scrollregion=c.bbox("all")))
-			canvas.bind("<Configure>", 
-					   lambda e, c=canvas, w=canvas_window: c.itemconfig(w, width=e.width))
+			canvas.bind("<Configure>", lambda e, c=col_name: self._kanban_render_column(c))
 			
 			self.kanban_columns[col_name] = {
 				"frame": col_frame,
-				"container": task_container,
-				"canvas": canvas
+				"canvas": canvas,
+				"items": [],  # task ids in this column, in store order
+				"pool": [],   # reusable card widgets
 			}
+		self._kanban_column_of = {}  # task id -> column name
+		# Cards have a fixed height so the column can be virtualized by slot;
+		# longer task text is cut to KANBAN_TEXT_LINES with an ellipsis and
+		# shown in full in a tooltip
+		self.KANBAN_SLOT_H = 74  # card height plus gap, in pixels
+		self.KANBAN_WRAP = 200   # text wrap width, in pixels
+		self.KANBAN_TEXT_LINES = 2
+		self._kanban_font = None
+		self._kanban_tip = None
 	
 	def _setup_list_view(self):
 		"""Set up simple list view without tree hierarchy."""
+		# Filter/search box
+		filter_frame = tk.Frame(self.list_view_frame)
+		filter_frame.pack(fill="x", padx=5, pady=(5, 0))
+		tk.Label(filter_frame, text="Filter:").pack(side="left")
+		self.list_filter_var = tk.StringVar()
+		self.list_filter_entry = tk.Entry(filter_frame, textvariable=self.list_filter_var)
+		self.list_filter_entry.pack(side="left", fill="x", expand=True, padx=(4, 0))
+		self._list_filter_after_id = None
+		self.list_filter_var.trace_add("write", lambda *a: self._schedule_list_filter())
+		
 		# Create listbox with task items
 		list_frame = tk.Frame(self.list_view_frame)
 		list_frame.pack(fill="both", expand=True, padx=5, pady=5)
@@ -522,8 +675,9 @@ class TodoApp:
 		# Double-click to toggle complete
 		self.list_view_listbox.bind("<Double-1>", lambda e: self._list_view_toggle_complete())
 		
-		# Store mapping of listbox index to tree item id
+		# Listbox row -> task id, and the reverse index
 		self.list_view_items = []
+		self._list_row_of = {}
 	
 	def _setup_compact_view(self):
 		"""Set up compact view showing only incomplete high-priority tasks."""
@@ -535,22 +689,25 @@ class TodoApp:
 						font=("", 14, "bold"))
 		title.pack(pady=(0, 10))
 		
-		# Canvas for scrollable task cards
+		# Canvas for scrollable task cards; like the Kanban columns only the
+		# cards in the visible window exist, keyed by task id
 		canvas = tk.Canvas(compact_frame, highlightthickness=0)
 		scrollbar = ttk.Scrollbar(compact_frame, orient="vertical", command=canvas.yview)
-		self.compact_container = tk.Frame(canvas)
 		
-		canvas.configure(yscrollcommand=scrollbar.set)
+		canvas.configure(yscrollcommand=lambda first, last: (scrollbar.set(first, last),
+															  self._render_compact_cards()))
 		scrollbar.pack(side="right", fill="y")
 		canvas.pack(side="left", fill="both", expand=True)
-		
-		canvas_window = canvas.create_window((0, 0), window=self.compact_container, anchor="nw")
-		self.compact_container.bind("<Configure>", 
-								   lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-		canvas.bind("<Configure>", 
-				   lambda e, w=canvas_window: canvas.itemconfig(w, width=e.width))
+		canvas.bind("<Configure>", lambda e: self._render_compact_cards())
 		
 		self.compact_canvas = canvas
+		self.compact_empty_text = canvas.create_text(0, 50, text="No high-priority tasks! 🎉",
+													 font=("", 12), fill="#666666", anchor="n", state="hidden")
+		self._compact_items = []   # ids of incomplete High tasks, in store order
+		self._compact_cards = {}   # task id -> card currently shown
+		self._compact_pool = []    # hidden cards ready for reuse
+		self._compact_region = None
+		self.COMPACT_SLOT_H = 112  # card height plus gap, in pixels
 	
 	def _change_view_mode(self):
 		"""Switch between different view modes."""
@@ -581,190 +738,426 @@ class TodoApp:
 		
 		self.current_view = new_view
 	
+	def _kanban_column_for(self, task):
+		if task.done:
+			return "Done"
+		if "progress" in task.text.lower() or "working" in task.text.lower():
+			return "In Progress"
+		return "To Do"
+
 	def _refresh_kanban_view(self):
-		"""Refresh Kanban board with current tasks."""
-		# Clear existing cards
+		"""Re-sort tasks into columns and redraw the visible cards."""
+		self._kanban_column_of = {}
 		for col_data in self.kanban_columns.values():
-			for widget in col_data["container"].winfo_children():
-				widget.destroy()
-		
-		# Get all tasks from tree
-		for cat_id in self.tree.get_children():
-			category_name = self.tree.item(cat_id, "text").split(" (")[0]
-			for task_id in self.tree.get_children(cat_id):
-				task_text = self.tree.item(task_id, "text")
-				status = self.tree.set(task_id, "status")
-				priority = self.tree.set(task_id, "priority")
-				deadline = self.tree.set(task_id, "deadline")
-				
-				# Determine column
-				if status == "[✓]":
-					col_name = "Done"
-				elif "progress" in task_text.lower() or "working" in task_text.lower():
-					col_name = "In Progress"
-				else:
-					col_name = "To Do"
-				
-				# Create task card
-				self._create_kanban_card(col_name, task_id, task_text, category_name, 
-									   priority, deadline, status)
-	
-	def _create_kanban_card(self, column, task_id, text, category, priority, deadline, status):
-		"""Create a task card in the Kanban board."""
-		container = self.kanban_columns[column]["container"]
+			col_data["items"] = []
+		for task in self.store.iter_tasks():
+			col_name = self._kanban_column_for(task)
+			self.kanban_columns[col_name]["items"].append(task.id)
+			self._kanban_column_of[task.id] = col_name
+		for col_name in self.kanban_columns:
+			self._kanban_render_column(col_name)
+
+	def _insert_in_store_order(self, items, task_id):
+		"""Insert task_id into items (a view's task ids, in store order) by bisection; returns its index.
+
+		Probes in other categories compare by category rank; only probes in
+		task_id's own category need its task order, indexed once on first use.
+		"""
+		store = self.store
+		tasks = store.tasks
+		ranks = {name: i for i, name in enumerate(store.categories)}
+		category = tasks[task_id].category
+		rank = ranks[category]
+		index = None
+		lo, hi = 0, len(items)
+		while lo < hi:
+			mid = (lo + hi) // 2
+			other = tasks[items[mid]].category
+			if other != category:
+				before = ranks[other] < rank
+			else:
+				if index is None:
+					index = {tid: i for i, tid in enumerate(store.categories[category].task_ids)}
+				before = index[items[mid]] < index[task_id]
+			if before:
+				lo = mid + 1
+			else:
+				hi = mid
+		items.insert(lo, task_id)
+		return lo
+
+	def _kanban_patch_task(self, task_id):
+		"""Update the board for one changed task without rebuilding the other cards."""
+		task = self.store.get(task_id)
+		old_col = self._kanban_column_of.pop(task_id, None)
+		new_col = self._kanban_column_for(task) if task else None
+		if old_col and old_col != new_col:
+			self.kanban_columns[old_col]["items"].remove(task_id)
+		if new_col and new_col != old_col:
+			self._insert_in_store_order(self.kanban_columns[new_col]["items"], task_id)
+		if new_col:
+			self._kanban_column_of[task_id] = new_col
+		for col_name in {old_col, new_col} - {None}:
+			self._kanban_render_column(col_name, force={task_id})
+
+	def _kanban_on_scroll(self, col_name, scrollbar, first, last):
+		scrollbar.set(first, last)
+		self._kanban_render_column(col_name)
+
+	def _kanban_render_column(self, col_name, force=()):
+		"""Fill the pooled cards for the slots currently in the column's viewport."""
+		col = self.kanban_columns[col_name]
+		canvas = col["canvas"]
+		items = col["items"]
+		slot = self.KANBAN_SLOT_H
+		width = max(canvas.winfo_width(), 50)
+		height = max(canvas.winfo_height(), slot)
+		region = (0, 0, width, max(len(items) * slot, height))
+		if col.get("region") != region:
+			# Only touch the scrollregion when it changes; it re-fires yscrollcommand
+			col["region"] = region
+			canvas.configure(scrollregion=region)
+		top = canvas.canvasy(0)
+		first = max(0, int(top // slot))
+		last = min(len(items), int((top + height) // slot) + 1)
+		visible = last - first
+		pool = col["pool"]
+		while len(pool) < visible:
+			pool.append(self._create_kanban_card(col_name))
+		for n, card in enumerate(pool):
+			if n >= visible:
+				if card["task_id"] is not None:
+					canvas.itemconfigure(card["window"], state="hidden")
+					card["task_id"] = None
+				continue
+			task = self.store.get(items[first + n])
+			canvas.coords(card["window"], 5, (first + n) * slot + 5)
+			canvas.itemconfigure(card["window"], width=width - 10, state="normal")
+			key = (task.text, task.category, task.priority, task.deadline)
+			if card["task_id"] != task.id or card["key"] != key or task.id in force:
+				self._fill_kanban_card(card, task, key)
+
+	def _create_kanban_card(self, column):
+		"""Create a reusable card widget for a Kanban column."""
+		canvas = self.kanban_columns[column]["canvas"]
 		
 		# Card frame
-		card = tk.Frame(container, relief="raised", bd=2, bg="#ffffff", cursor="hand2")
-		card.pack(fill="x", padx=5, pady=5)
+		card = tk.Frame(canvas, relief="raised", bd=2, bg="#ffffff", cursor="hand2")
+		card.pack_propagate(False)
 		
 		# Task text
-		task_label = tk.Label(card, text=text, font=("", 10), bg="#ffffff", 
-							 anchor="w", wraplength=200, justify="left")
+		task_label = tk.Label(card, text="", font=("", 10), bg="#ffffff", 
+							 anchor="w", wraplength=self.KANBAN_WRAP, justify="left")
 		task_label.pack(fill="x", padx=5, pady=(5, 2))
 		
 		# Metadata row
 		meta_frame = tk.Frame(card, bg="#ffffff")
 		meta_frame.pack(fill="x", padx=5, pady=(0, 5))
 		
-		tk.Label(meta_frame, text=f"📁{category}", font=("", 8), bg="#ffffff", 
-				fg="#666666").pack(side="left", padx=(0, 5))
-		tk.Label(meta_frame, text=priority, font=("", 8), bg="#ffffff", 
-				fg="#666666").pack(side="left", padx=(0, 5))
-		if deadline:
-			tk.Label(meta_frame, text=f"📅{deadline}", font=("", 8), bg="#ffffff", 
-					fg="#666666").pack(side="left")
-		
-		# Click to toggle complete
-		card.bind("<Button-1>", lambda e, tid=task_id: self._kanban_toggle_task(tid))
+		cat_label = tk.Label(meta_frame, text="", font=("", 8), bg="#ffffff", fg="#666666")
+		cat_label.pack(side="left", padx=(0, 5))
+		prio_label = tk.Label(meta_frame, text="", font=("", 8), bg="#ffffff", fg="#666666")
+		prio_label.pack(side="left", padx=(0, 5))
+		deadline_label = tk.Label(meta_frame, text="", font=("", 8), bg="#ffffff", fg="#666666")
+		deadline_label.pack(side="left")
+		
+		window = canvas.create_window(5, 5, window=card, anchor="nw",
+									  height=self.KANBAN_SLOT_H - 10, state="hidden")
+		record = {"frame": card, "window": window, "text": task_label, "category": cat_label,
+				  "priority": prio_label, "deadline": deadline_label, "task_id": None, "key": None,
+				  "full_text": None}
+		
+		# Click to toggle complete (the card's task changes as it is recycled)
+		for widget in (card, task_label, meta_frame, cat_label, prio_label, deadline_label):
+			widget.bind("<Button-1>", lambda e, r=record: r["task_id"] and self._kanban_toggle_task(r["task_id"]))
+			widget.bind("<Enter>", lambda e, r=record: self._kanban_show_tip(r, e))
+			widget.bind("<Leave>", lambda e: self._kanban_hide_tip())
+		return record
+
+	def _kanban_elide(self, text):
+		"""text cut to what fits on a card's KANBAN_TEXT_LINES lines, ending in "…"; None if it fits as is."""
+		if self._kanban_font is None:
+			self._kanban_font = tkfont.Font(font=("", 10))
+		measure = self._kanban_font.measure
+		# Word wrapping wastes the end of each line; leave room for it
+		budget = int(self.KANBAN_WRAP * self.KANBAN_TEXT_LINES * 0.85)
+		if "\n" not in text and measure(text) <= budget:
+			return None
+		# Newlines would add lines of their own
+		text = " ".join(text.split())
+		if measure(text) <= budget:
+			return text
+		lo, hi = 0, len(text)
+		while lo < hi:
+			# Longest prefix that fits together with the ellipsis
+			mid = (lo + hi + 1) // 2
+			if measure(text[:mid] + "…") <= budget:
+				lo = mid
+			else:
+				hi = mid - 1
+		cut = text[:lo]
+		if " " in cut[len(cut) // 2:]:
+			cut = cut[:cut.rindex(" ")]
+		return cut.rstrip() + "…"
+
+	def _kanban_show_tip(self, card, event):
+		if not card["full_text"]:
+			return
+		if self._kanban_tip is None:
+			tip = tk.Toplevel(self.root)
+			tip.overrideredirect(True)
+			tip.withdraw()
+			label = tk.Label(tip, bg="#ffffe0", fg="#000000", relief="solid", bd=1,
+							 wraplength=320, justify="left", padx=4, pady=2)
+			label.pack()
+			self._kanban_tip = (tip, label)
+		tip, label = self._kanban_tip
+		label.config(text=card["full_text"])
+		tip.geometry(f"+{event.x_root + 12}+{event.y_root + 12}")
+		tip.deiconify()
+		tip.lift()
+
+	def _kanban_hide_tip(self):
+		if self._kanban_tip is not None:
+			self._kanban_tip[0].withdraw()
+
+	def _fill_kanban_card(self, card, task, key):
+		card["task_id"] = task.id
+		card["key"] = key
+		elided = self._kanban_elide(task.text)
+		card["full_text"] = task.text if elided else None
+		card["text"].config(text=elided or task.text)
+		card["category"].config(text=f"📁{task.category}")
+		card["priority"].config(text=task.priority)
+		card["deadline"].config(text=f"📅{task.deadline}" if task.deadline else "")
 	
 	def _kanban_toggle_task(self, task_id):
 		"""Toggle task completion from Kanban view."""
-		# Select the task in tree
-		self.tree.selection_set(task_id)
-		self.toggle_complete()
-		# Refresh Kanban view
-		self._refresh_kanban_view()
+		self._toggle_tasks([task_id])
 	
+	def _list_row_text(self, task):
+		# Format: [✓] Task Name | Category | Priority | Deadline
+		display = f"{task.status} {task.text} | {task.category} | {task.priority}"
+		if task.deadline:
+			display += f" | {task.deadline}"
+		return display
+
+	def _list_matches(self, task):
+		"""True if task passes the List view filter (case-insensitive substring)."""
+		needle = self.list_filter_var.get().strip().lower()
+		if not needle:
+			return True
+		return needle in task.text.lower() or needle in task.category.lower() or needle in task.priority.lower()
+
+	def _schedule_list_filter(self):
+		# Debounce typing in the filter box
+		if self._list_filter_after_id:
+			self.root.after_cancel(self._list_filter_after_id)
+		self._list_filter_after_id = self.root.after(150, self._apply_list_filter)
+
+	def _apply_list_filter(self):
+		self._list_filter_after_id = None
+		if self.current_view == "List":
+			self._refresh_list_view()
+
 	def _refresh_list_view(self):
-		"""Refresh list view with all tasks."""
-		self.list_view_listbox.delete(0, "end")
-		self.list_view_items = []
-		
-		for cat_id in self.tree.get_children():
-			category_name = self.tree.item(cat_id, "text").split(" (")[0]
-			
-			for task_id in self.tree.get_children(cat_id):
-				task_text = self.tree.item(task_id, "text")
-				status = self.tree.set(task_id, "status")
-				priority = self.tree.set(task_id, "priority")
-				deadline = self.tree.set(task_id, "deadline")
-				
-				# Format: [✓] Task Name | Category | Priority | Deadline
-				display = f"{status} {task_text} | {category_name} | {priority}"
-				if deadline:
-					display += f" | {deadline}"
-				
-				self.list_view_listbox.insert("end", display)
-				self.list_view_items.append(task_id)
+		"""Rebuild the list from the store, keeping scroll position and selection."""
+		lb = self.list_view_listbox
+		top = lb.yview()[0]
+		selected = {self.list_view_items[i] for i in lb.curselection() if i < len(self.list_view_items)}
+		lb.delete(0, "end")
+		self.list_view_items = [t.id for t in self.store.iter_tasks() if self._list_matches(t)]
+		self._list_row_of = {task_id: row for row, task_id in enumerate(self.list_view_items)}
+		tasks = self.store.tasks
+		if self.list_view_items:
+			lb.insert("end", *[self._list_row_text(tasks[task_id]) for task_id in self.list_view_items])
+		for task_id in selected:
+			row = self._list_row_of.get(task_id)
+			if row is not None:
+				lb.selection_set(row)
+		lb.yview_moveto(top)
+
+	def _list_reindex(self, start):
+		for row in range(start, len(self.list_view_items)):
+			self._list_row_of[self.list_view_items[row]] = row
+
+	def _list_patch_task(self, task_id):
+		"""Update, insert or delete the single row of a changed task in place."""
+		lb = self.list_view_listbox
+		task = self.store.get(task_id)
+		row = self._list_row_of.get(task_id)
+		wanted = task is not None and self._list_matches(task)
+		top = lb.yview()[0]
+		if row is not None and wanted:
+			was_selected = lb.selection_includes(row)
+			lb.delete(row)
+			lb.insert(row, self._list_row_text(task))
+			if was_selected:
+				lb.selection_set(row)
+		elif row is not None:
+			lb.delete(row)
+			del self.list_view_items[row]
+			del self._list_row_of[task_id]
+			self._list_reindex(row)
+		elif wanted:
+			row = self._insert_in_store_order(self.list_view_items, task_id)
+			lb.insert(row, self._list_row_text(task))
+			self._list_reindex(row)
+		else:
+			return
+		lb.yview_moveto(top)
 	
 	def _list_view_toggle_complete(self):
-		"""Toggle completion for selected item in list view."""
-		selection = self.list_view_listbox.curselection()
-		if not selection:
-			return
-		
-		idx = selection[0]
-		if idx < len(self.list_view_items):
-			task_id = self.list_view_items[idx]
-			self.tree.selection_set(task_id)
-			self.toggle_complete()
-			self._refresh_list_view()
+		"""Toggle completion for the selected items in list view."""
+		task_ids = [self.list_view_items[i] for i in self.list_view_listbox.curselection()
+					if i < len(self.list_view_items)]
+		if task_ids:
+			self._toggle_tasks(task_ids)
 	
+	def _compact_wants(self, task):
+		return task is not None and not task.done and task.priority == "High"
+
 	def _refresh_compact_view(self):
-		"""Refresh compact view showing high-priority incomplete tasks."""
-		# Clear existing cards
-		for widget in self.compact_container.winfo_children():
-			widget.destroy()
-		
-		high_priority_tasks = []
-		
-		# Collect high-priority incomplete tasks
-		for cat_id in self.tree.get_children():
-			category_name = self.tree.item(cat_id, "text").split(" (")[0]
-			for task_id in self.tree.get_children(cat_id):
-				status = self.tree.set(task_id, "status")
-				priority = self.tree.set(task_id, "priority")
-				
-				if status != "[✓]" and "🔴" in priority:  # High priority and incomplete
-					task_text = self.tree.item(task_id, "text")
-					deadline = self.tree.set(task_id, "deadline")
-					high_priority_tasks.append((task_id, task_text, category_name, deadline))
-		
-		if not high_priority_tasks:
-			tk.Label(self.compact_container, text="No high-priority tasks! 🎉", 
-					font=("", 12), fg="#666666").pack(pady=50)
-			return
-		
-		# Create task cards
-		for task_id, text, category, deadline in high_priority_tasks:
-			self._create_compact_card(task_id, text, category, deadline)
-	
-	def _create_compact_card(self, task_id, text, category, deadline):
-		"""Create a compact task card."""
-		card = tk.Frame(self.compact_container, relief="solid", bd=2, bg="#fff5f5")
-		card.pack(fill="x", padx=10, pady=8)
+		"""Recompute which tasks the compact view shows and redraw the visible cards."""
+		self._compact_items = [t.id for t in self.store.iter_tasks() if self._compact_wants(t)]
+		self._render_compact_cards()
+
+	def _compact_patch_task(self, task_id):
+		"""Add, drop or refresh the card of one changed task."""
+		task = self.store.get(task_id)
+		shown = task_id in self._compact_items
+		if self._compact_wants(task):
+			if not shown:
+				self._insert_in_store_order(self._compact_items, task_id)
+		elif shown:
+			self._compact_items.remove(task_id)
+		self._render_compact_cards(force={task_id})
+
+	def _render_compact_cards(self, force=()):
+		"""Show cards for the items in the visible scroll window, recycling the rest."""
+		canvas = self.compact_canvas
+		items = self._compact_items
+		slot = self.COMPACT_SLOT_H
+		width = max(canvas.winfo_width(), 100)
+		height = max(canvas.winfo_height(), slot)
+		region = (0, 0, width, max(len(items) * slot, height))
+		if self._compact_region != region:
+			self._compact_region = region
+			canvas.configure(scrollregion=region)
+		canvas.coords(self.compact_empty_text, width / 2, 50)
+		canvas.itemconfigure(self.compact_empty_text, state="hidden" if items else "normal")
+		top = canvas.canvasy(0)
+		first = max(0, int(top // slot))
+		last = min(len(items), int((top + height) // slot) + 1)
+		wanted = {items[i]: i for i in range(first, last)}
+		# Cards whose task left the window go back to the pool
+		for task_id in [tid for tid in self._compact_cards if tid not in wanted]:
+			card = self._compact_cards.pop(task_id)
+			canvas.itemconfigure(card["window"], state="hidden")
+			self._compact_pool.append(card)
+		for task_id, idx in wanted.items():
+			task = self.store.get(task_id)
+			key = (task.text, task.category, task.deadline)
+			card = self._compact_cards.get(task_id)
+			if card is None:
+				card = self._compact_pool.pop() if self._compact_pool else self._create_compact_card()
+				self._compact_cards[task_id] = card
+				card["key"] = None
+			if card["key"] != key or task_id in force:
+				self._fill_compact_card(card, task, key)
+			canvas.coords(card["window"], 10, idx * slot + 8)
+			canvas.itemconfigure(card["window"], width=width - 20, state="normal")
+
+	def _create_compact_card(self):
+		"""Create a reusable compact task card."""
+		card = tk.Frame(self.compact_canvas, relief="solid", bd=2, bg="#fff5f5")
+		card.pack_propagate(False)
 		
 		# Header with category
 		header = tk.Frame(card, bg="#ffebee")
 		header.pack(fill="x")
-		tk.Label(header, text=f"🔴 {category}", font=("", 9, "bold"), 
-				bg="#ffebee", fg="#c62828").pack(side="left", padx=10, pady=5)
-		if deadline:
-			tk.Label(header, text=f"📅 {deadline}", font=("", 9), 
-					bg="#ffebee", fg="#666666").pack(side="right", padx=10, pady=5)
+		cat_label = tk.Label(header, text="", font=("", 9, "bold"), 
+							 bg="#ffebee", fg="#c62828")
+		cat_label.pack(side="left", padx=10, pady=5)
+		deadline_label = tk.Label(header, text="", font=("", 9), 
+								  bg="#ffebee", fg="#666666")
+		deadline_label.pack(side="right", padx=10, pady=5)
 		
 		# Task text
-		text_label = tk.Label(card, text=text, font=("", 11), bg="#fff5f5", 
+		text_label = tk.Label(card, text="", font=("", 11), bg="#fff5f5", 
 							 anchor="w", wraplength=600, justify="left")
-		text_label.pack(fill="x", padx=15, pady=10)
+		text_label.pack(fill="x", padx=15, pady=(6, 2))
 		
 		# Complete button
 		btn_frame = tk.Frame(card, bg="#fff5f5")
-		btn_frame.pack(fill="x", padx=10, pady=(0, 10))
+		btn_frame.pack(fill="x", padx=10, pady=(0, 6))
 		
+		record = {"frame": card, "category": cat_label, "deadline": deadline_label,
+				  "text": text_label, "task_id": None, "key": None}
 		complete_btn = tk.Button(btn_frame, text="✓ Mark Complete", 
-								command=lambda tid=task_id: self._compact_toggle_task(tid))
+								command=lambda r=record: r["task_id"] and self._compact_toggle_task(r["task_id"]))
 		complete_btn.pack(side="right")
+		record["window"] = self.compact_canvas.create_window(10, 8, window=card, anchor="nw",
+															  height=self.COMPACT_SLOT_H - 16, state="hidden")
+		return record
+
+	def _fill_compact_card(self, card, task, key):
+		card["task_id"] = task.id
+		card["key"] = key
+		card["category"].config(text=f"🔴 {task.category}")
+		card["deadline"].config(text=f"📅 {task.deadline}" if task.deadline else "")
+		card["text"].config(text=task.text)
 	
 	def _compact_toggle_task(self, task_id):
 		"""Toggle task completion from compact view."""
-		self.tree.selection_set(task_id)
-		self.toggle_complete()
-		self._refresh_compact_view()
-	
-	def _refresh_current_view(self):
-		"""Refresh whichever view is currently active."""
-		if not hasattr(self, 'current_view'):
+		self._toggle_tasks([task_id])
+
+	def _on_store_change(self, event, item):
+		"""Store listener: queue changes for the visible card views and flush once when idle."""
+		self._tasks_dirty = True
+		if event == "category" or self.current_view not in ("Kanban", "Compact", "List"):
 			return
-		
+		if event in ("add", "update", "remove"):
+			self._pending_view_tasks.add(item.id)
+		else:
+			# move/order/reset change the display order
+			self._pending_view_reset = True
+		if self._view_flush_id is None:
+			self._view_flush_id = self.root.after_idle(self._flush_view_changes)
+
+	def _flush_view_changes(self):
+		self._view_flush_id = None
+		reset, self._pending_view_reset = self._pending_view_reset, False
+		task_ids, self._pending_view_tasks = self._pending_view_tasks, set()
+		# Removed tasks first, so the views only hold live ids when others are inserted
+		task_ids = sorted(task_ids, key=lambda task_id: task_id in self.store)
 		if self.current_view == "Kanban":
-			self._refresh_kanban_view()
-		elif self.current_view == "List":
-			self._refresh_list_view()
+			if reset:
+				self._refresh_kanban_view()
+			else:
+				for task_id in task_ids:
+					self._kanban_patch_task(task_id)
 		elif self.current_view == "Compact":
-			self._refresh_compact_view()
-		# Tree view updates automatically
-
+			if reset:
+				self._refresh_compact_view()
+			else:
+				for task_id in task_ids:
+					self._compact_patch_task(task_id)
+		elif self.current_view == "List":
+			if reset:
+				self._refresh_list_view()
+			else:
+				for task_id in task_ids:
+					self._list_patch_task(task_id)
+	
 	def _setup_daily_tab(self):
 		"""Create the Daily tab with a stopwatch and next-task-by-priority controls."""
 		import time as _time
 		self._daily_timer_running = False
 		self._daily_timer_last = None
 		self._daily_elapsed = 0.0
-		self._daily_current_task = None  # tree item id
-		# Per-task accumulated time (seconds)
-		if not hasattr(self, 'task_time_spent'):
-			self.task_time_spent = {}
+		self._daily_run_start = None  # time.time() the running, counting stretch began (for the time log)
+		self._daily_current_task = None  # task id (accumulated time lives on the task)
 		# Daily mode: stopwatch or pomodoro
 		self._daily_mode_var = tk.StringVar(value="stopwatch")
 		self._pomodoro_state = "work"  # work or break
@@ -829,6 +1222,18 @@ class TodoApp:
 		info = tk.Label(self.daily_tab, text="Daily mode picks the highest-priority incomplete task. Time is tracked per task while the timer runs.", anchor="w")
 		info.pack(fill="x", padx=8)
 
+		# Time tracked, from the interval log
+		self.TIME_REPORT_RANGES = (("Today", 1), ("7 days", 7), ("30 days", 30), ("All time", 0))
+		time_frame = tk.LabelFrame(self.daily_tab, text="Time Tracked")
+		time_frame.pack(fill="x", padx=8, pady=(8, 8))
+		self.daily_time_range_var = tk.StringVar(value="7 days")
+		time_range = ttk.Combobox(time_frame, textvariable=self.daily_time_range_var, width=10, state="readonly",
+								  values=[label for label, _ in self.TIME_REPORT_RANGES])
+		time_range.pack(side="left", anchor="n", padx=4, pady=2)
+		time_range.bind("<<ComboboxSelected>>", lambda e: self._update_time_report())
+		self.daily_time_label = tk.Label(time_frame, text="", anchor="w", justify="left")
+		self.daily_time_label.pack(side="left", fill="x", expand=True, padx=6)
+
 		# Completed today list
 		done_frame = tk.LabelFrame(self.daily_tab, text="Completed Today")
 		done_frame.pack(fill="both", expand=True, padx=8, pady=(0,8))
@@ -840,6 +1245,9 @@ class TodoApp:
 
 		# Internal timer loop
 		self._daily_after_id = None
+		# Fill the category filter (the tab may be built after tasks were loaded)
+		self._update_category_choices()
+		self._update_time_report()
 
 	def _daily_format(self, secs):
 		secs = int(secs)
@@ -859,10 +1267,11 @@ class TodoApp:
 		# total for current task
 		if self._daily_current_task:
 			if self._daily_mode_var.get() == "pomodoro":
-				current_run = 0  # we do not add countdown to total; we add only when paused
+				current_run = 0 if self._pomodoro_state == "break" else self._daily_elapsed
 			else:
 				current_run = self._daily_elapsed
-			total = int(self.task_time_spent.get(self._daily_current_task, 0) + current_run)
+			task = self.store.get(self._daily_current_task)
+			total = int((task.time_spent if task else 0) + current_run)
 			self.daily_total_label.config(text=f"Total for task: {self._daily_format(total)}")
 		else:
 			self.daily_total_label.config(text="Total for task: 00:00:00")
@@ -880,10 +1289,14 @@ class TodoApp:
 			self._daily_timer_last = now
 		if self._daily_mode_var.get() == "pomodoro":
 			# countdown
+			if self._pomodoro_state == "work":
+				self._daily_elapsed += dt
 			self._pomodoro_remaining = max(0, int(self._pomodoro_remaining - dt))
 			if self._pomodoro_remaining <= 0:
 				# switch phase
 				if self._pomodoro_state == "work":
+					# The work session is over: log it as one interval
+					self._daily_commit_run(now)
 					self._pomodoro_state = "break"
 					self._pomodoro_remaining = max(1, int(self._pomodoro_break_min_var.get()) * 60)
 					# Beep to signal phase change
@@ -894,6 +1307,7 @@ class TodoApp:
 						pass
 				else:
 					self._pomodoro_state = "work"
+					self._daily_run_start = now
 					self._pomodoro_remaining = max(1, int(self._pomodoro_work_min_var.get()) * 60)
 					# Beep to signal phase change
 					try:
@@ -936,6 +1350,8 @@ class TodoApp:
 		if self._daily_mode_var.get() == "pomodoro" and self._pomodoro_remaining <= 0:
 			self._pomodoro_state = "work"
 			self._pomodoro_remaining = max(1, int(self._pomodoro_work_min_var.get()) * 60)
+		if self._daily_counting():
+			self._daily_run_start = self._daily_timer_last
 		if not self._daily_after_id:
 			self._daily_after_id = self.root.after(1000, self._daily_tick)
 		# Update UI
@@ -945,8 +1361,64 @@ class TodoApp:
 			pass
 		self._daily_update_tab_indicator()
 
+	def _daily_counting(self):
+		"""True while the timer is adding time to the current task (not on a Pomodoro break)."""
+		return self._daily_mode_var.get() != "pomodoro" or self._pomodoro_state == "work"
+
+	def _get_time_log(self):
+		if self._time_log is None:
+			self._time_log = TimeLog(os.path.join(DATA_DIR, TIME_LOG))
+		return self._time_log
+
+	def _daily_commit_run(self, end=None):
+		"""Add the time run so far to the current task and log it as one interval.
+
+		The interval is the real stretch the timer counted, from
+		_daily_run_start to end (default now): each start/pause or Pomodoro
+		work session is logged on its own, so pauses and breaks stay out of it.
+		"""
+		elapsed = self._daily_elapsed
+		self._daily_elapsed = 0.0
+		start, self._daily_run_start = self._daily_run_start, None
+		task = self.store.get(self._daily_current_task) if self._daily_current_task else None
+		if task is None or elapsed <= 0:
+			return
+		self.store.update_task(task.id, time_spent=task.time_spent + elapsed)
+		if start is not None:
+			try:
+				self._get_time_log().record(task, start, end or time.time())
+			except Exception as e:
+				print(f"Could not log time for task {task.id}: {e}")
+		self._update_time_report()
+
+	def _update_time_report(self):
+		"""Show the tracked time for the chosen range, by category and priority."""
+		if not hasattr(self, 'daily_time_label'):
+			return
+		try:
+			totals = self._get_time_log().totals
+		except Exception as e:
+			self.daily_time_label.config(text=f"Time log unavailable: {e}")
+			return
+		days = dict(self.TIME_REPORT_RANGES).get(self.daily_time_range_var.get(), 7)
+		report = totals.last_days(days) if days else totals.report()
+		if not report["total"]:
+			self.daily_time_label.config(text="No time tracked yet")
+			return
+
+		def breakdown(counts):
+			return ", ".join(f"{name} {format_seconds(seconds)}" for name, seconds in counts.items())
+
+		self.daily_time_label.config(text=f"Total: {format_seconds(report['total'])}\n"
+										   f"By category: {breakdown(report['categories'])}\n"
+										   f"By priority: {breakdown(report['priorities'])}")
+
 	def _daily_pause(self):
 		# accumulate elapsed into task total
+		now = time.time()
+		if self._daily_timer_running and self._daily_timer_last is not None and self._daily_counting():
+			# Time since the last tick
+			self._daily_elapsed += max(0.0, now - self._daily_timer_last)
 		self._daily_timer_running = False
 		if self._daily_after_id:
 			try:
@@ -954,14 +1426,7 @@ class TodoApp:
 			except Exception:
 				pass
 			self._daily_after_id = None
-		if self._daily_current_task:
-			prev = self.task_time_spent.get(self._daily_current_task, 0.0)
-			self.task_time_spent[self._daily_current_task] = prev + self._daily_elapsed
-			# also store into task_meta for persistence in-memory
-			if self._daily_current_task not in self.task_meta:
-				self.task_meta[self._daily_current_task] = {}
-			self.task_meta[self._daily_current_task]['time_spent'] = self.task_time_spent[self._daily_current_task]
-		self._daily_elapsed = 0.0
+		self._daily_commit_run(now)
 		self._daily_timer_last = None
 		self._daily_update_labels()
 		# Update UI
@@ -979,35 +1444,26 @@ class TodoApp:
 			self._pomodoro_state = "work"
 		self._daily_update_labels()
 
-	def _daily_set_current(self, item_id):
+	def _daily_set_current(self, task_id):
 		self._daily_pause()
-		self._daily_current_task = item_id
-		if not item_id:
+		task = self.store.get(task_id) if task_id else None
+		self._daily_current_task = task.id if task else None
+		if task is None:
 			self.daily_task_label.config(text="None")
 			self._daily_update_labels()
 			return
-		text = self.tree.item(item_id, 'text')
-		vals = self.tree.item(item_id, 'values') or []
-		priority = vals[1] if len(vals) > 1 else "Medium"
-		self.daily_task_label.config(text=f"{text} [{priority}]")
+		self.daily_task_label.config(text=f"{task.text} [{task.priority}]")
 		self._daily_update_labels()
 
-	def _daily_is_incomplete(self, item_id):
-		vals = self.tree.item(item_id, 'values') or []
-		status = vals[0] if len(vals) > 0 else "[ ]"
-		return status not in ("[x]", "[✓]")
-
 	def _daily_pick_next_task(self):
-		# Gather all incomplete tasks and sort by priority High > Medium > Low,
+		# Pick the first incomplete task by priority High > Medium > Low,
 		# honoring filters for category and included priorities
-		candidates = []
-		# Determine category scope
+		# Determine category scope (None = all categories)
 		cat_filter = getattr(self, 'daily_cat_var', None).get() if hasattr(self, 'daily_cat_var') else "All"
-		cat_ids = []
-		if cat_filter and cat_filter != "All" and cat_filter in self.categories:
-			cat_ids = [self.categories[cat_filter]]
+		if cat_filter and cat_filter != "All" and cat_filter in self.store.categories:
+			cat_names = [cat_filter]
 		else:
-			cat_ids = list(self.categories.values())
+			cat_names = None
 		# Determine included priorities
 		inc_high = getattr(self, 'daily_inc_high', None).get() if hasattr(self, 'daily_inc_high') else True
 		inc_med = getattr(self, 'daily_inc_med', None).get() if hasattr(self, 'daily_inc_med') else True
@@ -1018,22 +1474,8 @@ class TodoApp:
 		if inc_low: include_set.add("Low")
 		if not include_set:
 			include_set = {"High", "Medium", "Low"}
-		for cat_id in cat_ids:
-			for child in self.tree.get_children(cat_id):
-				if self._daily_is_incomplete(child):
-					vals = self.tree.item(child, 'values') or []
-					priority = vals[1] if len(vals) > 1 else "Medium"
-					if priority not in include_set:
-						continue
-					order = self._priority_order(priority)
-					candidates.append((order, child))
-		if not candidates:
-			self._daily_set_current(None)
-			return
-		# lower order should be higher priority if _priority_order returns 0/1/2; ensure sorting
-		candidates.sort(key=lambda x: x[0])
-		next_item = candidates[0][1]
-		self._daily_set_current(next_item)
+		task = self._task_query().next_open_task(cat_names, include_set)
+		self._daily_set_current(task.id if task is not None else None)
 
 	def _daily_complete_task(self):
 		# mark current complete and pick next
@@ -1043,23 +1485,10 @@ class TodoApp:
 		# accumulate any running time before completion
 		self._daily_pause()
 		# record completion in the Daily list
-		try:
-			text = self.tree.item(self._daily_current_task, 'text')
-			total = int(self.task_time_spent.get(self._daily_current_task, 0))
-			self.daily_done_list.insert('end', f"✓ {text} ({self._daily_format(total)})")
-		except Exception:
-			pass
-		# Temporarily select the item to reuse toggle_complete
-		prev_sel = self.tree.selection()
-		try:
-			self.tree.selection_set((self._daily_current_task,))
-			self.toggle_complete()
-		finally:
-			# restore previous selection
-			try:
-				self.tree.selection_set(prev_sel)
-			except Exception:
-				pass
+		task = self.store.get(self._daily_current_task)
+		if task is not None:
+			self.daily_done_list.insert('end', f"✓ {task.text} ({self._daily_format(task.time_spent)})")
+			self._toggle_tasks([task.id])
 		# pick next
 		self._daily_pick_next_task()
 		# Auto-start the next task
@@ -1088,15 +1517,16 @@ class TodoApp:
 		self.custom_theme_name_entry = tk.Entry(name_frame, textvariable=self.custom_theme_name_var, width=20)
 		self.custom_theme_name_entry.pack(side="left")
 		
-		# Set up Daily tab UI
-		self._setup_daily_tab()
-
 		# Color pickers frame
 		colors_frame = tk.Frame(self.theme_editor_tab)
 		colors_frame.pack(padx=10, pady=10, fill="both", expand=True)
 		
 		# Store color entries
 		self.theme_color_vars = {}
+		self._theme_swatches = {}
+		# Editor changes recolor only the preview panel, at most once per THEME_PREVIEW_MS
+		self.THEME_PREVIEW_MS = 33
+		self._theme_preview_id = None
 
 		# Tip label
 		tk.Label(colors_frame, text="Tip: Set 'Gradient End' to enable a gradient. Leave blank or same as base for solid.",
@@ -1115,11 +1545,12 @@ class TodoApp:
 			entry = tk.Entry(row_frame, textvariable=var, width=10)
 			entry.pack(side="left", padx=(0, 5))
 			
-			preview = tk.Label(row_frame, text="      ", bg=var.get(), relief="raised", bd=2,
+			preview = tk.Label(row_frame, text="      ", relief="raised", bd=2,
 						   width=4, cursor="hand2")
 			preview.pack(side="left")
 			preview.bind("<Button-1>", lambda e, k=key: self._pick_theme_color(k))
-			var.trace_add("write", lambda *args, p=preview, v=var: p.config(bg=v.get()))
+			self._theme_swatches[key] = preview
+			var.trace_add("write", self._schedule_theme_preview)
 
 		# Grouped sections for clearer organization
 		sections = [
@@ -1151,13 +1582,16 @@ class TodoApp:
 			for key, label_text in fields:
 				add_color_row(lf, key, label_text)
 		
+		self._setup_theme_sandbox(colors_frame)
+		self._render_theme_preview()
+		
 		# Buttons frame
 		btn_frame = tk.Frame(self.theme_editor_tab)
 		btn_frame.pack(padx=10, pady=(10, 15), fill="x")
 		
 		tk.Button(btn_frame, text="Load from Current Theme", width=22, 
 				 command=self._load_current_theme_to_editor).pack(side="left", padx=3)
-		tk.Button(btn_frame, text="Preview Theme", width=15, 
+		tk.Button(btn_frame, text="Apply to App", width=15, 
 				 command=self._preview_custom_theme).pack(side="left", padx=3)
 		tk.Button(btn_frame, text="Save Theme", width=15, 
 				 command=self._save_custom_theme).pack(side="left", padx=3)
@@ -1166,6 +1600,75 @@ class TodoApp:
 		tk.Button(btn_frame, text="Import Theme File", width=15, 
 				 command=self._import_theme_file).pack(side="left", padx=3)
 
+	def _setup_theme_sandbox(self, parent):
+		"""A small panel of sample widgets that shows the editor's colors live."""
+		sandbox = tk.LabelFrame(parent, text="Preview")
+		sandbox.pack(fill="x", pady=6)
+		# Background (gradient) strip
+		canvas = tk.Canvas(sandbox, height=14, highlightthickness=0, bd=0)
+		canvas.pack(fill="x")
+		canvas.bind("<Configure>", self._schedule_theme_preview)
+		row = tk.Frame(sandbox)
+		row.pack(fill="x", padx=6, pady=6)
+		label = tk.Label(row, text="Sample text")
+		label.pack(side="left", padx=(0, 6))
+		button = tk.Button(row, text="Button", takefocus=0)
+		button.pack(side="left", padx=(0, 6))
+		entry = tk.Entry(row, width=12)
+		entry.insert(0, "New task")
+		entry.pack(side="left", padx=(0, 6))
+		# Plain, alternating and overdue rows
+		listbox = tk.Listbox(row, height=3, width=18, activestyle="none", takefocus=0)
+		for text in ("Task", "Next task", "Overdue task"):
+			listbox.insert("end", text)
+		listbox.pack(side="left")
+		self._theme_sandbox = {"frame": sandbox, "canvas": canvas, "row": row, "label": label,
+							   "button": button, "entry": entry, "list": listbox}
+
+	def _theme_editor_draft(self):
+		"""The editor's colors as a theme; entries that aren't #rrggbb keep the current theme's."""
+		draft = dict(self.current_theme)
+		for key, var in self.theme_color_vars.items():
+			value = var.get().strip()
+			if parse_hex(value):
+				draft[key] = value
+			elif key.endswith("_gradient") and not value:
+				draft.pop(key, None)  # blank gradient end: solid color
+		return draft
+
+	def _schedule_theme_preview(self, *args):
+		"""Coalesce editor changes into one preview redraw per THEME_PREVIEW_MS."""
+		if self._theme_preview_id is None:
+			self._theme_preview_id = self.root.after(self.THEME_PREVIEW_MS, self._render_theme_preview)
+
+	def _render_theme_preview(self):
+		"""Recolor the swatches and the preview panel from the editor (not the rest of the app)."""
+		self._theme_preview_id = None
+		if not self._theme_sandbox["frame"].winfo_exists():
+			return
+		draft = self._theme_editor_draft()
+		for key, swatch in self._theme_swatches.items():
+			# A blank gradient end shows the solid color it falls back to
+			self._set_colors(swatch, bg=draft.get(key) or draft.get(key[:-len("_gradient")], "#ffffff"))
+		sandbox = self._theme_sandbox
+		bg, fg = draft.get("bg", "#ffffff"), draft.get("fg", "#000000")
+		for name in ("frame", "row"):
+			self._set_colors(sandbox[name], bg=bg)
+		self._set_colors(sandbox["frame"], fg=fg)
+		self._set_colors(sandbox["label"], bg=bg, fg=fg)
+		self._set_colors(sandbox["button"], bg=draft.get("button_bg", bg), fg=draft.get("button_fg", fg),
+						 activebackground=draft.get("button_bg", bg), activeforeground=draft.get("button_fg", fg))
+		self._set_colors(sandbox["entry"], bg=draft.get("entry_bg", "#ffffff"), fg=draft.get("entry_fg", "#000000"),
+						 insertbackground=fg)
+		listbox = sandbox["list"]
+		self._set_colors(listbox, bg=draft.get("listbox_bg", "#ffffff"), fg=draft.get("listbox_fg", "#000000"))
+		palette = Palette(draft)
+		listbox.itemconfigure(1, background=palette.alt_bg)
+		listbox.itemconfigure(2, background=palette.overdue_bg)
+		canvas = sandbox["canvas"]
+		canvas.delete("all")
+		self._draw_canvas_gradient(canvas, bg, draft.get("bg_gradient"), vertical=False)
+
 	def _pick_theme_color(self, key):
 		"""Open quick 1-click color picker for theme color."""
 		self._open_quick_color_picker(key)
@@ -1196,7 +1699,11 @@ class TodoApp:
 		return f"#{r:02x}{g:02x}{b:02x}"
 
 	def _open_quick_color_picker(self, key):
-		"""Show a lightweight, 1-click color picker with a hue/sat field; click sets color immediately."""
+		"""Show a lightweight, 1-click color picker with a hue/sat field.
+
+		Click (or drag and release) to set the color; the theme editor's
+		preview follows while dragging, Escape puts the old color back.
+		"""
 		picker = tk.Toplevel(self.root)
 		picker.title("Pick Color")
 		picker.transient(self.root)
@@ -1212,32 +1719,47 @@ class TodoApp:
 		cv = tk.Canvas(picker, width=W, height=H, highlightthickness=0, bd=0, cursor="crosshair")
 		cv.pack()
 
-		# Draw a reliable hue-saturation mosaic using rectangles (fast and portable)
+		# Hue-saturation mosaic: one block color per pixel of a small image, zoomed up
 		BLOCK = 8  # block size in pixels
-		cols = max(1, W // BLOCK)
-		rws = max(1, H // BLOCK)
-		for by in range(rws):
-			s = by / (rws - 1) if rws > 1 else 0
-			for bx in range(cols):
-				h = (bx / (cols - 1)) * 360.0 if cols > 1 else 0
-				color_hex = self._hsv_to_hex(h, s, 1.0)
-				x0 = bx * BLOCK
-				y0 = by * BLOCK
-				x1 = min(W, x0 + BLOCK)
-				y1 = min(H, y0 + BLOCK)
-				cv.create_rectangle(x0, y0, x1, y1, outline=color_hex, fill=color_hex)
-
-		def on_click(event):
+		if not hasattr(self, '_hue_sat_image'):
+			cols = max(1, W // BLOCK)
+			rws = max(1, H // BLOCK)
+			rows = []
+			for by in range(rws):
+				s = by / (rws - 1) if rws > 1 else 0
+				row = [self._hsv_to_hex((bx / (cols - 1)) * 360.0 if cols > 1 else 0, s, 1.0) for bx in range(cols)]
+				rows.append("{" + " ".join(row) + "}")
+			blocks = tk.PhotoImage(master=self.root, width=cols, height=rws)
+			blocks.put(" ".join(rows))
+			self._hue_sat_image = blocks.zoom(BLOCK)
+		cv.create_image(0, 0, image=self._hue_sat_image, anchor="nw")
+
+		var = self.theme_color_vars[key]
+		original = var.get()
+
+		def color_at(event):
 			x = max(0, min(W - 1, event.x))
 			y = max(0, min(H - 1, event.y))
 			h = (x / (W - 1)) * 360.0
 			s = y / (H - 1)
-			color = self._hsv_to_hex(h, s, 1.0)
-			self.theme_color_vars[key].set(color)
+			return self._hsv_to_hex(h, s, 1.0)
+
+		def on_drag(event):
+			# The preview panel follows the pointer (throttled by its trace)
+			var.set(color_at(event))
+
+		def on_release(event):
+			var.set(color_at(event))
+			picker.destroy()
+
+		def on_cancel(event=None):
+			var.set(original)
 			picker.destroy()
 
-		cv.bind("<Button-1>", on_click)
-		picker.bind("<Escape>", lambda e: picker.destroy())
+		cv.bind("<Button-1>", on_drag)
+		cv.bind("<B1-Motion>", on_drag)
+		cv.bind("<ButtonRelease-1>", on_release)
+		picker.bind("<Escape>", on_cancel)
 		# Position near mouse and show now
 		picker.update_idletasks()
 		try:
@@ -1250,6 +1772,9 @@ class TodoApp:
 		self.settings = {
 			"ai_task_prefix": True,  # Add # prefix to AI-generated tasks
 			"ai_smart_categories": True,  # Automatically categorize AI tasks
+			"compact_json": False,  # Write save files without indentation
+			"storage_backend": "json",  # "json", "journal" (tasks.json.journal) or "sqlite" (tasks.db)
+			"startup_report": False,  # Print where startup time goes to the console
 		}
 		# Load settings from file if exists
 		self._load_settings()
@@ -1259,20 +1784,112 @@ class TodoApp:
 		settings_file = os.path.join(DATA_DIR, "todo_settings.json")
 		if os.path.exists(settings_file):
 			try:
-				with open(settings_file, 'r', encoding='utf-8') as f:
-					loaded = json.load(f)
-					self.settings.update(loaded)
+				loaded, _ = read_json_verified(settings_file)
+				self.settings.update(loaded)
 			except Exception:
 				pass
 	
 	def _save_settings(self):
-		"""Save settings to file."""
-		settings_file = os.path.join(DATA_DIR, "todo_settings.json")
+		"""Mark settings for saving; the autosave worker writes them shortly."""
+		self._settings_dirty = True
+
+	def _tasks_extras(self):
+		"""The non-task fields of tasks.json, copied."""
+		return {"theme": self.theme_var.get(), "stats": {"daily_counts": dict(self.stats_daily)}}
+
+	def _tasks_document(self):
+		"""Snapshot of everything stored in tasks.json (safe to hand to another thread)."""
+		extras = self._tasks_extras()
+		data = {"theme": extras["theme"]}
+		data.update(self.store.to_document())
+		data["stats"] = extras["stats"]
+		return data
+
+	def _setup_storage(self):
+		"""Start the configured task backend and fold in journal records recovered at startup."""
+		if self.settings.get("storage_backend", "json") != "json":
+			self._open_task_backend(resync=bool(self._journal_replayed))
+		elif self._journal_replayed:
+			# Left over from journal mode (or a crash): save once, then drop it
+			if self.save_tasks(TASKS_FILE, show_error=False):
+				journal.discard(TASKS_FILE)
+		self._journal_replayed = 0
+
+	def _open_task_backend(self, resync=False):
+		"""Open the journal or SQLite backend chosen in settings and attach it to the store.
+		
+		With resync the current state is written through it in full.
+		"""
+		kind = self.settings.get("storage_backend", "json")
 		try:
-			with open(settings_file, 'w', encoding='utf-8') as f:
-				json.dump(self.settings, f, indent=2)
-		except Exception:
-			pass
+			if kind == "journal":
+				backend = journal.Journal(TASKS_FILE, self._tasks_document,
+										  compact_json=self.settings.get("compact_json", False))
+			elif kind == "sqlite":
+				backend = SQLiteBackend(TASKS_DB)
+			else:
+				return
+		except Exception as e:
+			print(f"{kind} storage unavailable, using full saves: {e}")
+			return
+		self.task_backend = backend
+		backend.attach(self.store)
+		if resync:
+			if hasattr(backend, "request_compaction"):
+				backend.request_compaction()
+			else:
+				backend.write_store(self.store)
+				backend.write_document_extras(self.theme_var.get(), self.stats_daily)
+
+	def _task_query(self):
+		"""Whatever answers range queries: the SQLite backend if active, else the store."""
+		backend = self.task_backend
+		return backend if hasattr(backend, "next_open_task") else self.store
+
+	def _backend_append(self, record):
+		"""Record a change the store does not know about (stats, theme)."""
+		if self.task_backend is not None:
+			try:
+				self.task_backend.append(record)
+			except Exception as e:
+				self.task_backend.last_error = e
+
+	def _queue_autosave(self):
+		"""Snapshot dirty state on the Tk thread and hand it to the autosave worker."""
+		compact = self.settings.get("compact_json", False)
+		if self._tasks_dirty:
+			self._tasks_dirty = False
+			# Journal/SQLite backends record every change as it happens
+			if self.task_backend is None:
+				# Copy the store here; the worker streams the copy to disk
+				snapshot, extras = self.store.snapshot(), self._tasks_extras()
+				self.autosaver.submit_write(TASKS_FILE, lambda path: save_file(
+					path, TaskStore.from_snapshot(snapshot), extras, compact=compact, verify=False))
+		if self._settings_dirty:
+			self._settings_dirty = False
+			settings_file = os.path.join(DATA_DIR, "todo_settings.json")
+			self.autosaver.submit(settings_file, copy.deepcopy(self.settings), compact)
+
+	def _autosave_tick(self):
+		self._queue_autosave()
+		saved = self.autosaver.last_save_time
+		backend_error = None
+		if self.task_backend is not None:
+			try:
+				self.task_backend.sync()
+			except Exception as e:
+				self.task_backend.last_error = e
+			backend_error = self.task_backend.last_error
+			saved = max(saved or 0, self.task_backend.last_save_time or 0) or None
+		if self.autosaver.last_error is not None or backend_error is not None:
+			text = "Autosave failed"
+		elif saved:
+			text = "Saved " + time.strftime("%H:%M:%S", time.localtime(saved))
+		else:
+			text = ""
+		if self.autosave_label.cget("text") != text:
+			self.autosave_label.config(text=text)
+		self.root.after(1000, self._autosave_tick)
 	
 	def _setup_settings_tab(self):
 		"""Set up the Settings tab."""
@@ -1317,13 +1934,50 @@ class TodoApp:
 								font=("", 9), fg="#666666", wraplength=500, justify="left")
 		category_desc.pack(anchor="w", padx=20, pady=(5, 0))
 		
-		# General Settings Section (placeholder for future settings)
+		# General Settings Section
 		general_frame = tk.LabelFrame(main_frame, text="General Settings", font=("", 11, "bold"))
 		general_frame.pack(fill="x", pady=(0, 15))
 		
-		general_info = tk.Label(general_frame, text="More settings coming soon...",
-							   font=("", 9), fg="#666666")
-		general_info.pack(padx=15, pady=15)
+		compact_frame = tk.Frame(general_frame)
+		compact_frame.pack(fill="x", padx=15, pady=10)
+		
+		self.compact_json_var = tk.BooleanVar(value=self.settings.get("compact_json", False))
+		compact_check = tk.Checkbutton(compact_frame, text="Compact save files",
+									   variable=self.compact_json_var, font=("", 10),
+									   command=self._on_setting_change)
+		compact_check.pack(anchor="w")
+		
+		compact_desc = tk.Label(compact_frame, text="Writes tasks and settings without indentation. Files are smaller and save faster but are harder to read by hand.",
+								font=("", 9), fg="#666666", wraplength=500, justify="left")
+		compact_desc.pack(anchor="w", padx=20, pady=(5, 0))
+		
+		storage_frame = tk.Frame(general_frame)
+		storage_frame.pack(fill="x", padx=15, pady=10)
+		
+		tk.Label(storage_frame, text="Task storage", font=("", 10)).pack(anchor="w")
+		self.storage_backend_var = tk.StringVar(value=self.settings.get("storage_backend", "json"))
+		for value, text in (("json", "JSON file (tasks.json, rewritten on save)"),
+							("journal", "Journal (appends each change to tasks.json.journal)"),
+							("sqlite", "SQLite database (tasks.db, indexed)")):
+			tk.Radiobutton(storage_frame, text=text, value=value, variable=self.storage_backend_var,
+						   font=("", 10), command=self._on_setting_change).pack(anchor="w", padx=20)
+		
+		storage_desc = tk.Label(storage_frame, text="Journal and SQLite storage save each change without rewriting the whole task list. Switching to SQLite imports tasks.json the first time. Takes effect after a restart.",
+								font=("", 9), fg="#666666", wraplength=500, justify="left")
+		storage_desc.pack(anchor="w", padx=20, pady=(5, 0))
+		
+		report_frame = tk.Frame(general_frame)
+		report_frame.pack(fill="x", padx=15, pady=10)
+		
+		self.startup_report_var = tk.BooleanVar(value=self.settings.get("startup_report", False))
+		report_check = tk.Checkbutton(report_frame, text="Print startup timing report",
+									  variable=self.startup_report_var, font=("", 10),
+									  command=self._on_setting_change)
+		report_check.pack(anchor="w")
+		
+		report_desc = tk.Label(report_frame, text=f"Prints how long each startup step took to the console on the next launch, and each tab's build time on its first visit. This launch: {self._startup_total_ms:.0f} ms to interactive.",
+							   font=("", 9), fg="#666666", wraplength=500, justify="left")
+		report_desc.pack(anchor="w", padx=20, pady=(5, 0))
 		
 		# Save button
 		save_btn = tk.Button(main_frame, text="Save Settings", width=20, font=("", 10, "bold"),
@@ -1334,12 +1988,28 @@ class TodoApp:
 		"""Handle setting change."""
 		self.settings["ai_task_prefix"] = self.ai_prefix_var.get()
 		self.settings["ai_smart_categories"] = self.ai_smart_cat_var.get()
+		self.settings["compact_json"] = self.compact_json_var.get()
+		self.settings["storage_backend"] = self.storage_backend_var.get()
+		self.settings["startup_report"] = self.startup_report_var.get()
+		if hasattr(self.task_backend, "compact_json"):
+			self.task_backend.compact_json = self.settings["compact_json"]
 	
 	def _save_settings_and_confirm(self):
 		"""Save settings and show confirmation."""
 		self._save_settings()
+		self._queue_autosave()
 		messagebox.showinfo("Settings", "Settings saved successfully!")
 	
+	def _load_avatar_progress(self):
+		"""Load saved XP, unlocks, pets and placed items (needed before the Avatar Room is built)."""
+		if hasattr(self, 'settings'):
+			self.xp = self.settings.get('xp', 0)
+			self.level = self.settings.get('level', 1)
+			self.tasks_completed = self.settings.get('tasks_completed', 0)
+			self.unlocked_items = set(self.settings.get('unlocked_items', []))
+			self.pets = self.settings.get('pets', [])
+			self._placed_items = self.settings.get('placed_items', [])
+
 	def _setup_avatar_room_tab(self):
 		"""Set up the Avatar Room tab with customizable avatar and virtual environment."""
 		# Initialize avatar state with normalized coordinates (0.0 to 1.0)
@@ -1355,14 +2025,6 @@ class TodoApp:
 		# Load saved avatar settings if they exist
 		if hasattr(self, 'settings') and 'avatar' in self.settings:
 			self._avatar_state.update(self.settings['avatar'])
-		# Load saved XP data
-		if hasattr(self, 'settings'):
-			self.xp = self.settings.get('xp', 0)
-			self.level = self.settings.get('level', 1)
-			self.tasks_completed = self.settings.get('tasks_completed', 0)
-			self.unlocked_items = set(self.settings.get('unlocked_items', []))
-			self.pets = self.settings.get('pets', [])
-			self._placed_items = self.settings.get('placed_items', [])
 		
 		
 		# Main container
@@ -1405,16 +2067,7 @@ class TodoApp:
 		# Canvas for rendering room and avatar (responsive to window size)
 		self.avatar_canvas = tk.Canvas(canvas_frame, bg="#f0f0f0", highlightthickness=2)
 		self.avatar_canvas.pack(fill="both", expand=True)
-		
-		# Bind canvas resize event with heavy debouncing to prevent resize flashing
-		self._resize_debounce_id = None
-		def _on_canvas_resize(event):
-			if hasattr(self, '_resize_debounce_id') and self._resize_debounce_id:
-				self.avatar_canvas.after_cancel(self._resize_debounce_id)
-			# Don't redraw on resize - let the animation loop handle it
-			# This prevents flashing during window resize
-			self._resize_debounce_id = None
-		self.avatar_canvas.bind("<Configure>", _on_canvas_resize)
+
 
 		# Initialize animation states for avatar/scene
 		import time, random
@@ -1432,6 +2085,15 @@ class TodoApp:
 			"type": None,
 			"ticks_left": 0
 		}
+		# Scene animation loop (see _animate_pets): one pending after() at most,
+		# stopped while the Avatar Room is hidden or the window is minimized
+		self.SCENE_TICK_MS = 120  # one simulation step
+		self.SCENE_MAX_CATCHUP = 4  # steps a late frame may make up
+		self._avatar_animation_id = None
+		self._scene_last_tick = None
+		self._scene_lag = 0.0  # wall-clock seconds not yet simulated
+		self.root.bind("<Map>", self._on_root_map_change, add="+")
+		self.root.bind("<Unmap>", self._on_root_map_change, add="+")
 		# Window animation state
 		self._scene_window = {
 			"sun_t": 0.0,
@@ -1718,6 +2380,7 @@ class TodoApp:
 		self._request_redraw()
 		# Start scene animation (pets/window/avatar idle)
 		self._animate_pets()
+
 	def _update_xp_display(self):
 		"""Update the XP progress bar and stats display."""
 		if not hasattr(self, 'xp_bar_canvas'):
@@ -1757,7 +2420,13 @@ class TodoApp:
 	
 	
 	def _draw_avatar_room(self):
-		"""Draw the virtual room environment and avatar."""
+		"""Build the room scene on a cleared canvas.
+
+		Everything is created once here, in stacking order. The sun, clouds,
+		animated assets, avatar and pets are tagged items that the animation
+		loop moves with _update_scene(); the rest stays as drawn until the
+		next edit (_request_redraw) or resize.
+		"""
 		canvas = self.avatar_canvas
 		# Don't clear here - let animation loop handle it to avoid double-clear flashing
 		
@@ -1770,6 +2439,22 @@ class TodoApp:
 			width = 600
 		if height < 10:
 			height = 400
+		old_size = getattr(self, '_scene_size', None)
+		if old_size and old_size != (width, height):
+			# Floor images stretched to the old size will not be asked for again
+			self._asset_image_cache.invalidate(size=self._floor_size(*old_size))
+		if time.monotonic() - self._asset_refresh_time >= self.ASSET_REFRESH_SECONDS:
+			# Pick up asset files edited in place since they were cached
+			self._asset_refresh_time = time.monotonic()
+			for asset in self.custom_assets:
+				if asset.get("path"):
+					self._asset_image_cache.refresh(asset["path"])
+		self._scene_size = (width, height)
+		self._scene_avatar = None
+		self._scene_pets = []
+		# Images shown on the canvas must stay referenced: item id -> PhotoImage
+		self._asset_room_images = {}
+		self._scene_animated_assets = []  # (asset, item id, frame shown)
 		
 		# Get custom room colors or use defaults
 		if not hasattr(self, '_room_colors'):
@@ -1875,69 +2560,30 @@ class TodoApp:
 			spacing = remaining_space // (num_windows + 1)
 			start_x = spacing
 		
+		# Sun and clouds are created hidden between sky and frame, and placed
+		# (clipped to their window) by _update_window_items()
+		self._scene_sun = None
+		self._scene_clouds = {}  # cloud index -> (three oval ids, window rect)
+		clouds = self._scene_window.get("clouds", []) if hasattr(self, '_scene_window') else []
 		for i in range(num_windows):
 			window_x = start_x + i * (window_w + spacing)
+			window_rect = (window_x, window_y, window_w, window_h)
 			
 			# Draw sky background first
 			canvas.create_rectangle(window_x, window_y, window_x + window_w, window_y + window_h,
 								   fill="#87ceeb", outline="")
 			
-			# Draw animated sun and clouds (clipped to window)
 			if hasattr(self, '_scene_window'):
 				# Only draw sun in the middle window (or first window if only 1)
 				if i == num_windows // 2:
-					sun_t = self._scene_window.get("sun_t", 0.0)
-					# Sun moves in an arc across the window
-					sun_x = window_x + int(window_w * (0.2 + 0.6 * sun_t))
-					sun_y = window_y + int(window_h * (0.3 + 0.2 * abs(sun_t - 0.5)))
-					sun_r = int(min(window_w, window_h) * 0.15)
-					# Only draw sun if it's within window bounds
-					if window_x <= sun_x <= window_x + window_w and window_y <= sun_y <= window_y + window_h:
-						canvas.create_oval(sun_x - sun_r, sun_y - sun_r, sun_x + sun_r, sun_y + sun_r, 
-										  fill="#ffff00", outline="#ffa500", width=1)
-				
-				# Draw different clouds for each window
-				clouds = self._scene_window.get("clouds", [])
+					sun_id = canvas.create_oval(0, 0, 0, 0, fill="#ffff00", outline="#ffa500", width=1, state="hidden")
+					self._scene_sun = (sun_id, window_rect)
 				# Each window gets a different subset of clouds based on its index
-				for cloud_idx, cloud in enumerate(clouds):
-					# Distribute clouds across windows (cloud 0 -> window 0, cloud 1 -> window 1, etc., wrapping)
-					if cloud_idx % num_windows != i:
-						continue
-					
-					cloud_x_norm = cloud["x"]
-					# Only draw clouds that are within or near the window (0 to 1 range)
-					if -0.3 <= cloud_x_norm <= 1.3:
-						cloud_x = window_x + int(window_w * cloud_x_norm)
-						cloud_y = window_y + int(window_h * cloud.get("y", 0.25))
-						cloud_w = int(window_w * 0.2)
-						cloud_h = int(window_h * 0.15)
-						
-						# Clip cloud components to window bounds
-						x1 = max(window_x, cloud_x)
-						x2 = min(window_x + window_w, cloud_x + cloud_w)
-						y1 = max(window_y, cloud_y - cloud_h//3)
-						y2 = min(window_y + window_h, cloud_y + cloud_h)
-						
-						# Only draw if visible within window
-						if x1 < x2 and y1 < y2:
-							# Simple cloud shape (3 circles) - only draw portions inside window
-							if cloud_x + cloud_w//2 > window_x and cloud_x < window_x + window_w:
-								canvas.create_oval(max(window_x, cloud_x), max(window_y, cloud_y), 
-												  min(window_x + window_w, cloud_x + cloud_w//2), 
-												  min(window_y + window_h, cloud_y + cloud_h), 
-												  fill="#ffffff", outline="")
-							if cloud_x + 3*cloud_w//4 > window_x and cloud_x + cloud_w//4 < window_x + window_w:
-								canvas.create_oval(max(window_x, cloud_x + cloud_w//4), 
-												  max(window_y, cloud_y - cloud_h//3), 
-												  min(window_x + window_w, cloud_x + 3*cloud_w//4), 
-												  min(window_y + window_h, cloud_y + 2*cloud_h//3), 
-												  fill="#ffffff", outline="")
-							if cloud_x + cloud_w > window_x and cloud_x + cloud_w//2 < window_x + window_w:
-								canvas.create_oval(max(window_x, cloud_x + cloud_w//2), 
-												  max(window_y, cloud_y), 
-												  min(window_x + window_w, cloud_x + cloud_w), 
-												  min(window_y + window_h, cloud_y + cloud_h), 
-												  fill="#ffffff", outline="")
+				for cloud_idx in range(len(clouds)):
+					if cloud_idx % num_windows == i:
+						ids = [canvas.create_oval(0, 0, 0, 0, fill="#ffffff", outline="", state="hidden")
+							   for _ in range(3)]
+						self._scene_clouds[cloud_idx] = (ids, window_rect)
 			
 			# Window frame on top
 			canvas.create_rectangle(window_x, window_y, window_x + window_w, window_y + window_h,
@@ -1963,6 +2609,68 @@ class TodoApp:
 		# Draw avatar and pets above rugs/furniture
 		self._draw_avatar()
 		self._draw_pets()
+		self._update_window_items()
+
+	def _update_scene(self):
+		"""Bring the animated items up to date; rebuilds the room if the canvas was resized."""
+		canvas = self.avatar_canvas
+		width = canvas.winfo_width() if canvas.winfo_width() > 10 else 600
+		height = canvas.winfo_height() if canvas.winfo_height() > 10 else 400
+		if getattr(self, '_scene_avatar', None) is None or self._scene_size != (width, height):
+			canvas.delete("all")
+			self._draw_avatar_room()
+			return
+		self._update_window_items()
+		self._update_asset_items()
+		self._update_avatar_items()
+		self._update_pet_items()
+
+	def _update_window_items(self):
+		"""Place the sun and clouds for the current window animation state."""
+		canvas = self.avatar_canvas
+		if self._scene_sun is not None:
+			sun_id, (window_x, window_y, window_w, window_h) = self._scene_sun
+			sun_t = self._scene_window.get("sun_t", 0.0)
+			# Sun moves in an arc across the window
+			sun_x = window_x + int(window_w * (0.2 + 0.6 * sun_t))
+			sun_y = window_y + int(window_h * (0.3 + 0.2 * abs(sun_t - 0.5)))
+			sun_r = int(min(window_w, window_h) * 0.15)
+			# Only show sun if it's within window bounds
+			if window_x <= sun_x <= window_x + window_w and window_y <= sun_y <= window_y + window_h:
+				canvas.coords(sun_id, sun_x - sun_r, sun_y - sun_r, sun_x + sun_r, sun_y + sun_r)
+				canvas.itemconfigure(sun_id, state="normal")
+			else:
+				canvas.itemconfigure(sun_id, state="hidden")
+		clouds = self._scene_window.get("clouds", []) if hasattr(self, '_scene_window') else []
+		for cloud_idx, (ids, (window_x, window_y, window_w, window_h)) in self._scene_clouds.items():
+			parts = [None, None, None]
+			if cloud_idx < len(clouds) and -0.3 <= clouds[cloud_idx]["x"] <= 1.3:
+				cloud = clouds[cloud_idx]
+				cloud_x = window_x + int(window_w * cloud["x"])
+				cloud_y = window_y + int(window_h * cloud.get("y", 0.25))
+				cloud_w = int(window_w * 0.2)
+				cloud_h = int(window_h * 0.15)
+				right = window_x + window_w
+				bottom = window_y + window_h
+				# Only show if visible within window
+				if (max(window_x, cloud_x) < min(right, cloud_x + cloud_w)
+						and max(window_y, cloud_y - cloud_h//3) < min(bottom, cloud_y + cloud_h)):
+					# Simple cloud shape (3 circles) - clipped to the window
+					if cloud_x + cloud_w//2 > window_x and cloud_x < right:
+						parts[0] = (max(window_x, cloud_x), max(window_y, cloud_y),
+									min(right, cloud_x + cloud_w//2), min(bottom, cloud_y + cloud_h))
+					if cloud_x + 3*cloud_w//4 > window_x and cloud_x + cloud_w//4 < right:
+						parts[1] = (max(window_x, cloud_x + cloud_w//4), max(window_y, cloud_y - cloud_h//3),
+									min(right, cloud_x + 3*cloud_w//4), min(bottom, cloud_y + 2*cloud_h//3))
+					if cloud_x + cloud_w > window_x and cloud_x + cloud_w//2 < right:
+						parts[2] = (max(window_x, cloud_x + cloud_w//2), max(window_y, cloud_y),
+									min(right, cloud_x + cloud_w), min(bottom, cloud_y + cloud_h))
+			for item_id, rect in zip(ids, parts):
+				if rect is None:
+					canvas.itemconfigure(item_id, state="hidden")
+				else:
+					canvas.coords(item_id, *rect)
+					canvas.itemconfigure(item_id, state="normal")
 	
 	def _draw_placed_items(self, layer=None):
 		"""Draw placed built-in furniture/rug/poster items."""
@@ -2165,85 +2873,119 @@ class TodoApp:
 		width = canvas.winfo_width() if canvas.winfo_width() > 10 else 600
 		height = canvas.winfo_height() if canvas.winfo_height() > 10 else 400
 		
-		try:
-			from PIL import Image, ImageTk
-			
-			# Keep references to prevent garbage collection
-			if not hasattr(self, '_asset_room_images'):
-				self._asset_room_images = []
-			self._asset_room_images.clear()
+		# Determine allowed categories based on layer
+		if layer == "floor":
+			allowed = {"Floor"}
+		elif layer == "surface":
+			allowed = {"Rug", "Furniture"}
+		elif layer == "wall":
+			allowed = {"Poster"}
+		else:
+			allowed = None  # draw all
+
+		wall_depth = int(height * 0.2)
+		for asset in self.custom_assets:
+			category = asset.get("category", "Rug")
+			if allowed is not None and category not in allowed:
+				continue
+			if not asset.get("path"):
+				continue
+			# One unreadable asset must not hide the ones after it
+			try:
+				x = int(asset.get("x", 0.5) * width)
+				y = int(asset.get("y", 0.5) * height)
+				frame = self._asset_frame(asset)
+				photo = self._room_asset_photo(asset, width, height, frame)
+			except ImportError:
+				return  # PIL not installed
+			except Exception:
+				continue  # Error loading this asset
 			
-			# Determine allowed categories based on layer
-			if layer == "floor":
-				allowed = {"Floor"}
-			elif layer == "surface":
-				allowed = {"Rug", "Furniture"}
-			elif layer == "wall":
-				allowed = {"Poster"}
+			# Floor assets stretch across the floor area
+			if category == "Floor":
+				item_id = canvas.create_image(0, wall_depth, image=photo, anchor="nw")
 			else:
-				allowed = None  # draw all
+				item_id = canvas.create_image(x, y, image=photo, anchor="center")
+			self._asset_room_images[item_id] = photo
+			if asset.get("is_animated", False):
+				self._scene_animated_assets.append([asset, item_id, frame])
 
-			wall_depth = int(height * 0.2)
-			for asset in self.custom_assets:
-				category = asset.get("category", "Rug")
-				if allowed is not None and category not in allowed:
-					continue
-				filepath = asset.get("path")
-				if not filepath:
+	def _room_asset_photo(self, asset, width, height, frame=0):
+		"""Return a PhotoImage of one frame of a custom asset, sized for the room."""
+		from PIL import ImageTk
+		
+		if asset.get("category", "Rug") == "Floor":
+			# Floor assets stretch across the floor area
+			return self._asset_image_cache.image(asset["path"], frame, size=self._floor_size(width, height),
+												 make=ImageTk.PhotoImage)
+		# Scale image normally for rugs/furniture/posters
+		return self._asset_image_cache.image(asset["path"], frame, scale=asset.get("scale", 1.0),
+											 make=ImageTk.PhotoImage)
+
+	@staticmethod
+	def _floor_size(width, height):
+		"""Size of the floor area below the back wall, which Floor assets fill."""
+		return (int(width), max(1, int(height - int(height * 0.2))))
+
+	def _asset_frame(self, asset):
+		"""Frame an animated asset shows now, going by the clock and the GIF's frame durations."""
+		if not asset.get("is_animated", False):
+			return 0
+		timing = self._asset_image_cache.timing(asset["path"])
+		return timing.frame_at((time.perf_counter() - self._asset_clock_start) * 1000)
+
+	def _update_asset_items(self):
+		"""Show the current frame of animated custom assets."""
+		if not self._scene_animated_assets:
+			return
+		width, height = self._scene_size
+		for entry in self._scene_animated_assets:
+			asset, item_id, shown = entry
+			try:
+				frame = self._asset_frame(asset)
+				if frame == shown:
 					continue
-				
-				x = int(asset.get("x", 0.5) * width)
-				y = int(asset.get("y", 0.5) * height)
-				scale = asset.get("scale", 1.0)
-				
-				# Load image
-				img = Image.open(filepath)
-				
-				# Handle animated GIFs
-				if asset.get("is_animated", False):
-					frame_idx = asset.get("current_frame", 0)
-					try:
-						img.seek(frame_idx)
-					except EOFError:
-						asset["current_frame"] = 0
-						img.seek(0)
-				
-				# Convert RGBA if needed (for transparency)
-				if img.mode != 'RGBA':
-					img = img.convert('RGBA')
-				
-				# Floor assets stretch across the floor area
-				if category == "Floor":
-					new_width = int(width)
-					new_height = max(1, int(height - wall_depth))
-					img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-					photo = ImageTk.PhotoImage(img)
-					self._asset_room_images.append(photo)
-					canvas.create_image(0, wall_depth, image=photo, anchor="nw")
-				else:
-					# Scale image normally for rugs/furniture/posters
-					new_width = int(img.width * scale)
-					new_height = int(img.height * scale)
-					img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-					photo = ImageTk.PhotoImage(img)
-					self._asset_room_images.append(photo)
-					canvas.create_image(x, y, image=photo, anchor="center")
-		except ImportError:
-			pass  # PIL not installed
-		except Exception:
-			pass  # Error loading asset
+				photo = self._room_asset_photo(asset, width, height, frame)
+			except Exception:
+				continue
+			self.avatar_canvas.itemconfigure(item_id, image=photo)
+			self._asset_room_images[item_id] = photo
+			entry[2] = frame
 	
+	def _avatar_pose(self):
+		"""Where the avatar is and which animation offsets apply, in canvas pixels."""
+		width, height = self._scene_size
+		event_type = self._random_event.get("type") if hasattr(self, '_random_event') else None
+		bob = 0
+		if hasattr(self, '_avatar_walk_phase'):
+			import math
+			bob = int(2 * math.sin(self._avatar_walk_phase))  # Small head bob up/down
+		blink = False
+		if hasattr(self, '_blink_state'):
+			# Eyes closed during the first half of a blink
+			blink = self._blink_state.get("active", False) and self._blink_state.get("progress", 0.0) < 0.5
+		return {
+			"x": int(self._avatar_state["x"] * width),
+			"y": int(self._avatar_state["y"] * height),
+			"bob": bob,
+			"jump": -8 if event_type == "jump" else 0,  # whole body lifts, shadow stays
+			"wave": -10 if event_type == "wave" else 0,  # right arm raised
+			"blink": blink,
+			"surprised": event_type == "jump",  # "o" mouth instead of a smile
+		}
+
 	def _draw_avatar(self):
-		"""Draw the avatar character with current clothing."""
+		"""Create the avatar's items with the current clothing.
+
+		Items are tagged by what moves together: "avatar" (everything),
+		"avatar_body" (all but the shadow, for jumps), "avatar_head" (head,
+		face and hat, for the walk bob) and "avatar_rarm" (for waving). Both
+		eye and mouth variants are created; _update_avatar_items() moves the
+		groups and shows the right variants.
+		"""
 		canvas = self.avatar_canvas
-		
-		# Get canvas dimensions
-		width = canvas.winfo_width() if canvas.winfo_width() > 10 else 600
-		height = canvas.winfo_height() if canvas.winfo_height() > 10 else 400
-		
-		# Convert normalized position to pixel coordinates
-		x = int(self._avatar_state["x"] * width)
-		y = int(self._avatar_state["y"] * height)
+		pose = self._avatar_pose()
+		x, y = pose["x"], pose["y"]
 		
 		# Get clothing colors
 		shirt_colors = {
@@ -2272,188 +3014,186 @@ class TodoApp:
 		
 		shirt_color = shirt_colors.get(self._avatar_state["shirt"], "#4169e1")
 		pants_color = pants_colors.get(self._avatar_state["pants"], "#1e90ff")
+		body = ("avatar", "avatar_body")
+		rarm = ("avatar", "avatar_body", "avatar_rarm")
+		head = ("avatar", "avatar_body", "avatar_head")
 		
-		# Shadow (using gray instead of transparent black)
-		shadow_y_offset = 0
-		if hasattr(self, '_random_event') and self._random_event.get("type") == "jump":
-			shadow_y_offset = 0  # Shadow stays on ground during jump
-		else:
-			shadow_y_offset = 0
-		canvas.create_oval(x - 25, y + 45 + shadow_y_offset, x + 25, y + 55 + shadow_y_offset, fill="#c0c0c0", outline="")
-		
-		# Legs (pants) - apply jump offset to entire body
-		body_y_offset = 0
-		if hasattr(self, '_random_event') and self._random_event.get("type") == "jump":
-			body_y_offset = -8
+		# Shadow (using gray instead of transparent black); stays on the ground during a jump
+		canvas.create_oval(x - 25, y + 45, x + 25, y + 55, fill="#c0c0c0", outline="", tags=("avatar",))
 		
+		# Legs (pants)
 		if "shorts" in self._avatar_state["pants"]:
 			# Shorts - shorter legs
-			canvas.create_rectangle(x - 12, y + 15 + body_y_offset, x - 2, y + 35 + body_y_offset, fill=pants_color, outline="#000000", width=1)
-			canvas.create_rectangle(x + 2, y + 15 + body_y_offset, x + 12, y + 35 + body_y_offset, fill=pants_color, outline="#000000", width=1)
+			canvas.create_rectangle(x - 12, y + 15, x - 2, y + 35, fill=pants_color, outline="#000000", width=1, tags=body)
+			canvas.create_rectangle(x + 2, y + 15, x + 12, y + 35, fill=pants_color, outline="#000000", width=1, tags=body)
 			# Lower legs showing
-			canvas.create_rectangle(x - 12, y + 35 + body_y_offset, x - 2, y + 50 + body_y_offset, fill="#fdbcb4", outline="#000000", width=1)
-			canvas.create_rectangle(x + 2, y + 35 + body_y_offset, x + 12, y + 50 + body_y_offset, fill="#fdbcb4", outline="#000000", width=1)
+			canvas.create_rectangle(x - 12, y + 35, x - 2, y + 50, fill="#fdbcb4", outline="#000000", width=1, tags=body)
+			canvas.create_rectangle(x + 2, y + 35, x + 12, y + 50, fill="#fdbcb4", outline="#000000", width=1, tags=body)
 		else:
 			# Full pants
-			canvas.create_rectangle(x - 12, y + 15 + body_y_offset, x - 2, y + 50 + body_y_offset, fill=pants_color, outline="#000000", width=1)
-			canvas.create_rectangle(x + 2, y + 15 + body_y_offset, x + 12, y + 50 + body_y_offset, fill=pants_color, outline="#000000", width=1)
-		
-		# Shoes (with jump animation)
-		shoe_y_offset = 0
-		if hasattr(self, '_random_event') and self._random_event.get("type") == "jump":
-			# Lift avatar for jump
-			shoe_y_offset = -8
-		
-		canvas.create_oval(x - 15, y + 48 + shoe_y_offset, x - 5, y + 54 + shoe_y_offset, fill="#000000", outline="#000000")
-		canvas.create_oval(x + 5, y + 48 + shoe_y_offset, x + 15, y + 54 + shoe_y_offset, fill="#000000", outline="#000000")
-		
-		# Body (shirt) - also needs jump offset
-		canvas.create_rectangle(x - 18, y - 10 + body_y_offset, x + 18, y + 20 + body_y_offset, fill=shirt_color, outline="#000000", width=2)
-		
-		# Arms (with wave animation for random events)
-		arm_left_y_offset = 0
-		arm_right_y_offset = 0
-		if hasattr(self, '_random_event') and self._random_event.get("type") == "wave":
-			# Raise right arm for wave
-			arm_right_y_offset = -10
-		
-		canvas.create_rectangle(x - 25, y - 5 + arm_left_y_offset + body_y_offset, x - 18, y + 15 + arm_left_y_offset + body_y_offset, 
-							   fill=shirt_color, outline="#000000", width=1)
-		canvas.create_rectangle(x + 18, y - 5 + arm_right_y_offset + body_y_offset, x + 25, y + 15 + arm_right_y_offset + body_y_offset, 
-							   fill=shirt_color, outline="#000000", width=1)
-		# Hands
-		canvas.create_oval(x - 28, y + 12 + arm_left_y_offset + body_y_offset, x - 20, y + 20 + arm_left_y_offset + body_y_offset, 
-						  fill="#fdbcb4", outline="#000000", width=1)
-		canvas.create_oval(x + 20, y + 12 + arm_right_y_offset + body_y_offset, x + 28, y + 20 + arm_right_y_offset + body_y_offset, 
-						  fill="#fdbcb4", outline="#000000", width=1)
-		
-		# Neck
-		canvas.create_rectangle(x - 6, y - 15 + body_y_offset, x + 6, y - 10 + body_y_offset, fill="#fdbcb4", outline="#000000", width=1)
-		
-		# Head (with optional bobbing from walk animation)
-		head_y_offset = 0
-		if hasattr(self, '_avatar_walk_phase'):
-			import math
-			head_y_offset = int(2 * math.sin(self._avatar_walk_phase))  # Small bob up/down
-		
-		head_top = y - 40 + head_y_offset + body_y_offset
-		head_bottom = y - 15 + head_y_offset + body_y_offset
-		canvas.create_oval(x - 15, head_top, x + 15, head_bottom, fill="#fdbcb4", outline="#000000", width=2)
+			canvas.create_rectangle(x - 12, y + 15, x - 2, y + 50, fill=pants_color, outline="#000000", width=1, tags=body)
+			canvas.create_rectangle(x + 2, y + 15, x + 12, y + 50, fill=pants_color, outline="#000000", width=1, tags=body)
 		
-		# Face with blinking animation
-		eye_y_top = y - 32 + head_y_offset + body_y_offset
-		eye_y_bottom = y - 28 + head_y_offset + body_y_offset
+		# Shoes
+		canvas.create_oval(x - 15, y + 48, x - 5, y + 54, fill="#000000", outline="#000000", tags=body)
+		canvas.create_oval(x + 5, y + 48, x + 15, y + 54, fill="#000000", outline="#000000", tags=body)
 		
-		# Check if blinking
-		blink_active = False
-		blink_progress = 0.0
-		if hasattr(self, '_blink_state'):
-			blink_active = self._blink_state.get("active", False)
-			blink_progress = self._blink_state.get("progress", 0.0)
+		# Body (shirt)
+		canvas.create_rectangle(x - 18, y - 10, x + 18, y + 20, fill=shirt_color, outline="#000000", width=2, tags=body)
 		
-		if blink_active and blink_progress < 0.5:
-			# Eyes closing (draw horizontal lines instead of ovals)
-			canvas.create_line(x - 8, eye_y_top + 2, x - 4, eye_y_top + 2, fill="#000000", width=2)
-			canvas.create_line(x + 4, eye_y_top + 2, x + 8, eye_y_top + 2, fill="#000000", width=2)
-		else:
-			# Eyes open
-			canvas.create_oval(x - 8, eye_y_top, x - 4, eye_y_bottom, fill="#000000", outline="")
-			canvas.create_oval(x + 4, eye_y_top, x + 8, eye_y_bottom, fill="#000000", outline="")
-		
-		# Mouth (change based on random events)
-		mouth_y_top = y - 28 + head_y_offset + body_y_offset
-		mouth_y_bottom = y - 20 + head_y_offset + body_y_offset
-		mouth_style = "smile"  # default
-		if hasattr(self, '_random_event'):
-			event_type = self._random_event.get("type")
-			if event_type == "jump":
-				mouth_style = "o"  # Surprised expression
+		# Arms
+		canvas.create_rectangle(x - 25, y - 5, x - 18, y + 15, fill=shirt_color, outline="#000000", width=1, tags=body)
+		canvas.create_rectangle(x + 18, y - 5, x + 25, y + 15, fill=shirt_color, outline="#000000", width=1, tags=rarm)
+		# Hands
+		canvas.create_oval(x - 28, y + 12, x - 20, y + 20, fill="#fdbcb4", outline="#000000", width=1, tags=body)
+		canvas.create_oval(x + 20, y + 12, x + 28, y + 20, fill="#fdbcb4", outline="#000000", width=1, tags=rarm)
 		
-		if mouth_style == "o":
-			canvas.create_oval(x - 4, mouth_y_top, x + 4, mouth_y_top + 8, fill="#000000", outline="")
-		else:
-			# Smile
-			canvas.create_arc(x - 6, mouth_y_top, x + 6, mouth_y_bottom, start=200, extent=140, outline="#000000", width=2, style="arc")
+		# Neck
+		canvas.create_rectangle(x - 6, y - 15, x + 6, y - 10, fill="#fdbcb4", outline="#000000", width=1, tags=body)
+		
+		# Head
+		canvas.create_oval(x - 15, y - 40, x + 15, y - 15, fill="#fdbcb4", outline="#000000", width=2, tags=head)
+		
+		# Eyes: open, and closed (horizontal lines) for blinking
+		eye_y_top = y - 32
+		eye_y_bottom = y - 28
+		eyes_open = head + ("avatar_eyes_open",)
+		eyes_closed = head + ("avatar_eyes_closed",)
+		canvas.create_oval(x - 8, eye_y_top, x - 4, eye_y_bottom, fill="#000000", outline="", tags=eyes_open)
+		canvas.create_oval(x + 4, eye_y_top, x + 8, eye_y_bottom, fill="#000000", outline="", tags=eyes_open)
+		canvas.create_line(x - 8, eye_y_top + 2, x - 4, eye_y_top + 2, fill="#000000", width=2, state="hidden", tags=eyes_closed)
+		canvas.create_line(x + 4, eye_y_top + 2, x + 8, eye_y_top + 2, fill="#000000", width=2, state="hidden", tags=eyes_closed)
+		
+		# Mouth: smile, and a surprised "o" during jumps
+		mouth_y_top = y - 28
+		mouth_y_bottom = y - 20
+		canvas.create_arc(x - 6, mouth_y_top, x + 6, mouth_y_bottom, start=200, extent=140, outline="#000000", width=2, style="arc",
+						  tags=head + ("avatar_smile",))
+		canvas.create_oval(x - 4, mouth_y_top, x + 4, mouth_y_top + 8, fill="#000000", outline="", state="hidden",
+						   tags=head + ("avatar_mouth_o",))
 		
 		# Hat
 		hat = self._avatar_state["hat"]
-		hat_y_offset = head_y_offset + body_y_offset
 		if hat == "baseball_cap":
 			# Cap top
-			canvas.create_arc(x - 16, y - 45 + hat_y_offset, x + 16, y - 30 + hat_y_offset, start=0, extent=180, fill="#ff4500", outline="#000000", width=2, style="pieslice")
+			canvas.create_arc(x - 16, y - 45, x + 16, y - 30, start=0, extent=180, fill="#ff4500", outline="#000000", width=2, style="pieslice", tags=head)
 			# Bill
-			canvas.create_polygon(x - 16, y - 37 + hat_y_offset, x - 25, y - 35 + hat_y_offset, x - 25, y - 33 + hat_y_offset, x - 16, y - 35 + hat_y_offset, fill="#ff4500", outline="#000000", width=1)
+			canvas.create_polygon(x - 16, y - 37, x - 25, y - 35, x - 25, y - 33, x - 16, y - 35, fill="#ff4500", outline="#000000", width=1, tags=head)
 		elif hat == "beanie":
-			canvas.create_arc(x - 16, y - 48 + hat_y_offset, x + 16, y - 28 + hat_y_offset, start=0, extent=180, fill="#4b0082", outline="#000000", width=2, style="pieslice")
-			canvas.create_oval(x - 3, y - 48 + hat_y_offset, x + 3, y - 42 + hat_y_offset, fill="#9370db", outline="#000000", width=1)  # Pom-pom
+			canvas.create_arc(x - 16, y - 48, x + 16, y - 28, start=0, extent=180, fill="#4b0082", outline="#000000", width=2, style="pieslice", tags=head)
+			canvas.create_oval(x - 3, y - 48, x + 3, y - 42, fill="#9370db", outline="#000000", width=1, tags=head)  # Pom-pom
 		elif hat == "top_hat":
-			canvas.create_rectangle(x - 12, y - 55 + hat_y_offset, x + 12, y - 40 + hat_y_offset, fill="#000000", outline="#000000", width=2)
-			canvas.create_rectangle(x - 16, y - 42 + hat_y_offset, x + 16, y - 38 + hat_y_offset, fill="#000000", outline="#000000", width=2)
+			canvas.create_rectangle(x - 12, y - 55, x + 12, y - 40, fill="#000000", outline="#000000", width=2, tags=head)
+			canvas.create_rectangle(x - 16, y - 42, x + 16, y - 38, fill="#000000", outline="#000000", width=2, tags=head)
 		elif hat == "crown":
 			# Crown base
-			canvas.create_rectangle(x - 14, y - 45 + hat_y_offset, x + 14, y - 38 + hat_y_offset, fill="#ffd700", outline="#ff8c00", width=2)
+			canvas.create_rectangle(x - 14, y - 45, x + 14, y - 38, fill="#ffd700", outline="#ff8c00", width=2, tags=head)
 			# Crown points
-			canvas.create_polygon(x - 14, y - 45 + hat_y_offset, x - 10, y - 50 + hat_y_offset, x - 6, y - 45 + hat_y_offset, fill="#ffd700", outline="#ff8c00", width=1)
-			canvas.create_polygon(x - 4, y - 45 + hat_y_offset, x, y - 52 + hat_y_offset, x + 4, y - 45 + hat_y_offset, fill="#ffd700", outline="#ff8c00", width=1)
-			canvas.create_polygon(x + 6, y - 45 + hat_y_offset, x + 10, y - 50 + hat_y_offset, x + 14, y - 45 + hat_y_offset, fill="#ffd700", outline="#ff8c00", width=1)
+			canvas.create_polygon(x - 14, y - 45, x - 10, y - 50, x - 6, y - 45, fill="#ffd700", outline="#ff8c00", width=1, tags=head)
+			canvas.create_polygon(x - 4, y - 45, x, y - 52, x + 4, y - 45, fill="#ffd700", outline="#ff8c00", width=1, tags=head)
+			canvas.create_polygon(x + 6, y - 45, x + 10, y - 50, x + 14, y - 45, fill="#ffd700", outline="#ff8c00", width=1, tags=head)
 			# Jewels
-			canvas.create_oval(x - 2, y - 42 + hat_y_offset, x + 2, y - 40 + hat_y_offset, fill="#ff0000", outline="")
+			canvas.create_oval(x - 2, y - 42, x + 2, y - 40, fill="#ff0000", outline="", tags=head)
 		elif hat == "hat_wizard":
 			# Wizard hat (purple cone with brim)
-			canvas.create_polygon(x - 8, y - 45 + hat_y_offset, x, y - 65 + hat_y_offset, x + 8, y - 45 + hat_y_offset, fill="#6a0dad", outline="#000000", width=2)
-			canvas.create_oval(x - 14, y - 42 + hat_y_offset, x + 14, y - 38 + hat_y_offset, fill="#4b0082", outline="#000000", width=2)
+			canvas.create_polygon(x - 8, y - 45, x, y - 65, x + 8, y - 45, fill="#6a0dad", outline="#000000", width=2, tags=head)
+			canvas.create_oval(x - 14, y - 42, x + 14, y - 38, fill="#4b0082", outline="#000000", width=2, tags=head)
 		elif hat == "hat_sombrero":
 			# Sombrero (wide brim, small top)
-			canvas.create_oval(x - 20, y - 40 + hat_y_offset, x + 20, y - 36 + hat_y_offset, fill="#d2b48c", outline="#000000", width=2)
-			canvas.create_arc(x - 10, y - 50 + hat_y_offset, x + 10, y - 34 + hat_y_offset, start=0, extent=180, fill="#f4a460", outline="#000000", width=2, style="pieslice")
+			canvas.create_oval(x - 20, y - 40, x + 20, y - 36, fill="#d2b48c", outline="#000000", width=2, tags=head)
+			canvas.create_arc(x - 10, y - 50, x + 10, y - 34, start=0, extent=180, fill="#f4a460", outline="#000000", width=2, style="pieslice", tags=head)
 		elif hat == "hat_viking":
 			# Viking helmet (gray with horns)
-			canvas.create_arc(x - 16, y - 45 + hat_y_offset, x + 16, y - 30 + hat_y_offset, start=0, extent=180, fill="#c0c0c0", outline="#000000", width=2, style="pieslice")
-			canvas.create_polygon(x - 16, y - 40 + hat_y_offset, x - 26, y - 55 + hat_y_offset, x - 20, y - 40 + hat_y_offset, fill="#fff8dc", outline="#000000", width=1)
-			canvas.create_polygon(x + 16, y - 40 + hat_y_offset, x + 26, y - 55 + hat_y_offset, x + 20, y - 40 + hat_y_offset, fill="#fff8dc", outline="#000000", width=1)
+			canvas.create_arc(x - 16, y - 45, x + 16, y - 30, start=0, extent=180, fill="#c0c0c0", outline="#000000", width=2, style="pieslice", tags=head)
+			canvas.create_polygon(x - 16, y - 40, x - 26, y - 55, x - 20, y - 40, fill="#fff8dc", outline="#000000", width=1, tags=head)
+			canvas.create_polygon(x + 16, y - 40, x + 26, y - 55, x + 20, y - 40, fill="#fff8dc", outline="#000000", width=1, tags=head)
 		elif hat == "hat_halo":
 			# Halo (golden ring above head)
-			canvas.create_oval(x - 12, y - 58 + hat_y_offset, x + 12, y - 54 + hat_y_offset, fill="#ffd700", outline="#ff8c00", width=2)
+			canvas.create_oval(x - 12, y - 58, x + 12, y - 54, fill="#ffd700", outline="#ff8c00", width=2, tags=head)
 		# If hat == "none", draw nothing
+		
+		# Drawn at rest; apply the current pose
+		self._scene_avatar = dict(pose, bob=0, jump=0, wave=0, blink=False, surprised=False)
+		self._update_avatar_items()
+
+	def _update_avatar_items(self):
+		"""Move the avatar's item groups to the current pose."""
+		shown = getattr(self, '_scene_avatar', None)
+		if shown is None:
+			return
+		canvas = self.avatar_canvas
+		pose = self._avatar_pose()
+		if pose["x"] != shown["x"] or pose["y"] != shown["y"]:
+			canvas.move("avatar", pose["x"] - shown["x"], pose["y"] - shown["y"])
+		if pose["jump"] != shown["jump"]:
+			canvas.move("avatar_body", 0, pose["jump"] - shown["jump"])
+		if pose["bob"] != shown["bob"]:
+			canvas.move("avatar_head", 0, pose["bob"] - shown["bob"])
+		if pose["wave"] != shown["wave"]:
+			canvas.move("avatar_rarm", 0, pose["wave"] - shown["wave"])
+		if pose["blink"] != shown["blink"]:
+			canvas.itemconfigure("avatar_eyes_open", state="hidden" if pose["blink"] else "normal")
+			canvas.itemconfigure("avatar_eyes_closed", state="normal" if pose["blink"] else "hidden")
+		if pose["surprised"] != shown["surprised"]:
+			canvas.itemconfigure("avatar_smile", state="hidden" if pose["surprised"] else "normal")
+			canvas.itemconfigure("avatar_mouth_o", state="normal" if pose["surprised"] else "hidden")
+		self._scene_avatar = pose
 	
 	def _draw_pets(self):
-		"""Draw all pets in the room."""
+		"""Create the items of all pets in the room, tagged "pet" and "pet<index>"."""
+		self._scene_pets = []
 		if not hasattr(self, 'pets'):
 			return
 		canvas = self.avatar_canvas
+		width, height = self._scene_size
 		
-		# Get canvas dimensions
-		width = canvas.winfo_width() if canvas.winfo_width() > 10 else 600
-		height = canvas.winfo_height() if canvas.winfo_height() > 10 else 400
-		
-		for pet in self.pets:
+		for index, pet in enumerate(self.pets):
 			# Convert normalized position to pixel coordinates
 			x = int(pet.get("x", 0.5) * width)
 			y = int(pet.get("y", 0.5) * height)
 			ptype = pet.get("type", "pet_cat")
+			tags = ("pet", f"pet{index}")
 			if ptype == "pet_cat":
 				# Body
-				canvas.create_oval(x - 12, y - 8, x + 12, y + 8, fill="#ffa500", outline="#000000")
+				canvas.create_oval(x - 12, y - 8, x + 12, y + 8, fill="#ffa500", outline="#000000", tags=tags)
 				# Head
-				canvas.create_oval(x + 8, y - 10, x + 20, y + 2, fill="#ffa500", outline="#000000")
+				canvas.create_oval(x + 8, y - 10, x + 20, y + 2, fill="#ffa500", outline="#000000", tags=tags)
 				# Ears
-				canvas.create_polygon(x + 10, y - 10, x + 14, y - 16, x + 18, y - 10, fill="#ffdab9", outline="#000000")
+				canvas.create_polygon(x + 10, y - 10, x + 14, y - 16, x + 18, y - 10, fill="#ffdab9", outline="#000000", tags=tags)
 				# Tail
-				canvas.create_arc(x - 20, y - 10, x - 4, y + 10, start=200, extent=140, style="arc", outline="#000000", width=2)
+				canvas.create_arc(x - 20, y - 10, x - 4, y + 10, start=200, extent=140, style="arc", outline="#000000", width=2, tags=tags)
 			elif ptype == "pet_dog":
-				canvas.create_oval(x - 14, y - 9, x + 14, y + 9, fill="#8b4513", outline="#000000")
-				canvas.create_oval(x + 6, y - 10, x + 20, y + 4, fill="#a0522d", outline="#000000")
-				canvas.create_polygon(x + 8, y - 8, x + 12, y - 14, x + 10, y - 6, fill="#8b4513", outline="#000000")
+				canvas.create_oval(x - 14, y - 9, x + 14, y + 9, fill="#8b4513", outline="#000000", tags=tags)
+				canvas.create_oval(x + 6, y - 10, x + 20, y + 4, fill="#a0522d", outline="#000000", tags=tags)
+				canvas.create_polygon(x + 8, y - 8, x + 12, y - 14, x + 10, y - 6, fill="#8b4513", outline="#000000", tags=tags)
 			elif ptype == "pet_bird":
-				canvas.create_oval(x - 8, y - 8, x + 8, y + 8, fill="#87ceeb", outline="#000000")
-				canvas.create_polygon(x + 6, y, x + 12, y - 2, x + 12, y + 2, fill="#ffa500", outline="#000000")
+				canvas.create_oval(x - 8, y - 8, x + 8, y + 8, fill="#87ceeb", outline="#000000", tags=tags)
+				canvas.create_polygon(x + 6, y, x + 12, y - 2, x + 12, y + 2, fill="#ffa500", outline="#000000", tags=tags)
 			elif ptype == "pet_dragon":
-				canvas.create_oval(x - 16, y - 10, x + 16, y + 10, fill="#228b22", outline="#000000")
-				canvas.create_polygon(x - 8, y - 10, x, y - 20, x + 8, y - 10, fill="#006400", outline="#000000")
-				canvas.create_polygon(x - 16, y, x - 24, y - 4, x - 24, y + 4, fill="#006400", outline="#000000")
+				canvas.create_oval(x - 16, y - 10, x + 16, y + 10, fill="#228b22", outline="#000000", tags=tags)
+				canvas.create_polygon(x - 8, y - 10, x, y - 20, x + 8, y - 10, fill="#006400", outline="#000000", tags=tags)
+				canvas.create_polygon(x - 16, y, x - 24, y - 4, x - 24, y + 4, fill="#006400", outline="#000000", tags=tags)
 			else:
 				# Default small pet
-				canvas.create_oval(x - 6, y - 6, x + 6, y + 6, fill="#cccccc", outline="#000000")
+				canvas.create_oval(x - 6, y - 6, x + 6, y + 6, fill="#cccccc", outline="#000000", tags=tags)
+			self._scene_pets.append((ptype, x, y))
+
+	def _update_pet_items(self):
+		"""Move each pet's items to its position; recreate them if pets were added or removed."""
+		canvas = self.avatar_canvas
+		pets = getattr(self, 'pets', [])
+		if [p[0] for p in self._scene_pets] != [pet.get("type", "pet_cat") for pet in pets]:
+			canvas.delete("pet")
+			self._draw_pets()
+			return
+		width, height = self._scene_size
+		for index, pet in enumerate(pets):
+			ptype, shown_x, shown_y = self._scene_pets[index]
+			x = int(pet.get("x", 0.5) * width)
+			y = int(pet.get("y", 0.5) * height)
+			if x != shown_x or y != shown_y:
+				canvas.move(f"pet{index}", x - shown_x, y - shown_y)
+				self._scene_pets[index] = (ptype, x, y)
 
 	def _move_avatar(self, direction):
 		"""Move avatar in the specified direction."""
@@ -2504,8 +3244,11 @@ class TodoApp:
 		self._avatar_state["y"] = y
 		self._avatar_state["direction"] = direction
 		
-		# Request redraw instead of calling directly to avoid flashing
-		self._request_redraw()
+		# Only the avatar's items move; the rest of the room stays as drawn
+		if getattr(self, '_scene_avatar', None) is not None:
+			self._update_avatar_items()
+		else:
+			self._request_redraw()
 		
 		# Save avatar position
 		self._save_avatar_state()
@@ -2655,9 +3398,8 @@ class TodoApp:
 		self.pets.append(pet)
 		self._save_pets_state()
 		
-		# Start pet animation if avatar room is active
-		if hasattr(self, 'avatar_canvas'):
-			self._animate_pets()
+		# Make sure the scene is animating if the avatar room is showing
+		self._animate_pets()
 
 	def _save_pets_state(self):
 		"""Persist pets to settings."""
@@ -3171,13 +3913,7 @@ class TodoApp:
 		list_frame = tk.Frame(left_frame)
 		list_frame.pack(fill="both", expand=True)
 		
-		scrollbar = tk.Scrollbar(list_frame)
-		scrollbar.pack(side="right", fill="y")
-		
-		self.asset_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set, height=12)
-		self.asset_listbox.pack(side="left", fill="both", expand=True)
-		scrollbar.config(command=self.asset_listbox.yview)
-		self.asset_listbox.bind("<<ListboxSelect>>", self._on_asset_select)
+		self._build_asset_list(list_frame)
 		
 		# Asset controls
 		controls_frame = tk.Frame(left_frame)
@@ -3229,6 +3965,9 @@ class TodoApp:
 		self.asset_preview_canvas.pack(fill="both", expand=True)
 		# Redraw preview whenever the canvas is resized
 		self.asset_preview_canvas.bind("<Configure>", lambda e: self._preview_assets())
+		# Hit/miss counts of the decoded-image cache, refreshed with the preview
+		self.asset_cache_label = tk.Label(right_frame, text="", font=("", 8), fg="gray", anchor="w")
+		self.asset_cache_label.pack(side="bottom", fill="x", before=self.asset_preview_canvas)
 		
 		# Load saved assets
 		if hasattr(self, 'settings') and 'custom_assets' in self.settings:
@@ -3272,13 +4011,7 @@ class TodoApp:
 		list_frame = tk.Frame(left_frame)
 		list_frame.pack(fill="both", expand=True)
 		
-		scrollbar = tk.Scrollbar(list_frame)
-		scrollbar.pack(side="right", fill="y")
-		
-		self.asset_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set, height=12)
-		self.asset_listbox.pack(side="left", fill="both", expand=True)
-		scrollbar.config(command=self.asset_listbox.yview)
-		self.asset_listbox.bind("<<ListboxSelect>>", self._on_asset_select)
+		self._build_asset_list(list_frame)
 		
 		# Asset controls
 		controls_frame = tk.Frame(left_frame)
@@ -3330,6 +4063,9 @@ class TodoApp:
 		self.asset_preview_canvas.pack(fill="both", expand=True)
 		# Redraw preview whenever the canvas is resized so the room stretches with the window
 		self.asset_preview_canvas.bind("<Configure>", lambda e: self._preview_assets())
+		# Hit/miss counts of the decoded-image cache, refreshed with the preview
+		self.asset_cache_label = tk.Label(right_frame, text="", font=("", 8), fg="gray", anchor="w")
+		self.asset_cache_label.pack(side="bottom", fill="x", before=self.asset_preview_canvas)
 		
 		# Load saved assets
 		if hasattr(self, 'settings') and 'custom_assets' in self.settings:
@@ -3342,7 +4078,6 @@ class TodoApp:
 		"""Upload a PNG or GIF file and add it to custom assets."""
 		from tkinter import filedialog, simpledialog
 		import os
-		import shutil
 		
 		filepath = filedialog.askopenfilename(
 			title="Select PNG or GIF Asset",
@@ -3374,39 +4109,50 @@ class TodoApp:
 		
 		self.root.wait_window(category_window)
 		
-		# Create assets directory if it doesn't exist
-		assets_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "custom_assets")
-		os.makedirs(assets_dir, exist_ok=True)
-		
-		# Copy file to assets directory
-		filename = os.path.basename(filepath)
-		dest_path = os.path.join(assets_dir, filename)
-		
-		# Handle duplicate filenames
-		base, ext = os.path.splitext(filename)
-		counter = 1
-		while os.path.exists(dest_path):
-			filename = f"{base}_{counter}{ext}"
-			dest_path = os.path.join(assets_dir, filename)
-			counter += 1
-		
-		shutil.copy2(filepath, dest_path)
-		
-		# Check if it's an animated GIF
-		is_animated = False
-		frame_count = 1
-		try:
-			from PIL import Image
-			img = Image.open(dest_path)
-			if hasattr(img, 'n_frames'):
-				frame_count = img.n_frames
-				is_animated = frame_count > 1
-			img.close()
-		except:
-			pass
+		# Copy, check and thumbnail the file in the background; _on_asset_imported adds it
+		self._asset_pipeline_for().import_file(filepath, context={"category": selected_category.get()})
+		self._schedule_asset_poll()
+	
+	def _asset_pipeline_for(self):
+		"""The asset import/thumbnail workers, started on first use."""
+		if getattr(self, '_asset_pipeline', None) is None:
+			assets_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "custom_assets")
+			self._asset_pipeline = AssetPipeline(assets_dir)
+		return self._asset_pipeline
+	
+	def _schedule_asset_poll(self):
+		if getattr(self, '_asset_poll_id', None) is None:
+			self._asset_poll_id = self.root.after(100, self._poll_asset_pipeline)
+	
+	def _poll_asset_pipeline(self):
+		"""Apply finished asset jobs on the Tk thread; keeps polling while any are running."""
+		self._asset_poll_id = None
+		pipeline = self._asset_pipeline
+		if pipeline is None:
+			return
+		for result in pipeline.poll():
+			if result["kind"] == "import":
+				self._on_asset_imported(result)
+			else:
+				self._on_asset_thumbnail(result)
+		if pipeline.pending:
+			self._schedule_asset_poll()
+	
+	def _asset_list_shown(self):
+		return hasattr(self, 'asset_tree') and self.asset_tree.winfo_exists()
+	
+	def _on_asset_imported(self, result):
+		"""Add an uploaded asset once the pipeline has copied and checked it."""
+		if result["error"] is not None:
+			messagebox.showerror("Upload Failed",
+								 f"Could not add {os.path.basename(result['source'])}:\n{result['error']}")
+			return
+		dest_path = result["path"]
+		frame_count = result["frame_count"]
+		is_animated = frame_count > 1
 		
 		# Add to custom assets list with wall-aware positioning
-		category = selected_category.get()
+		category = result["context"]["category"]
 		
 		# Default position depends on category
 		if category in ("Rug", "Furniture"):
@@ -3423,7 +4169,7 @@ class TodoApp:
 		
 		asset = {
 			"path": dest_path,
-			"name": filename,
+			"name": os.path.basename(dest_path),
 			"x": default_x,
 			"y": default_y,
 			"scale": 1.0,
@@ -3432,23 +4178,84 @@ class TodoApp:
 			"frame_count": frame_count,
 			"current_frame": 0
 		}
+		# A re-import may have replaced a file that is still cached
+		self._asset_image_cache.refresh(dest_path)
+		if is_animated:
+			# Decode the frames off the GUI thread before the room first needs them
+			self._asset_image_cache.preload([dest_path])
 		self.custom_assets.append(asset)
 		self._save_assets()
-		self._refresh_asset_list()
-		self._preview_assets()
+		if self._asset_list_shown():
+			self._refresh_asset_list()
+			self._preview_assets()
 		if hasattr(self, 'avatar_canvas'):
 			self._request_redraw()  # Refresh avatar room
 	
+	def _on_asset_thumbnail(self, result):
+		"""Show a thumbnail the pipeline finished on the asset list rows that use it."""
+		if result["error"] is not None:
+			# Don't queue it again on every refresh
+			self._asset_thumb_failed.add(result["path"])
+			return
+		if not self._asset_list_shown():
+			return
+		for iid in self.asset_tree.get_children():
+			asset = self.custom_assets[int(iid)]
+			if asset.get("path") == result["path"]:
+				self.asset_tree.item(iid, image=self._asset_thumb(asset))
+	
+	def _asset_thumb(self, asset):
+		"""The list thumbnail of an asset, or "" while it is being made.
+
+		Thumbnails are PNG files kept next to the assets, so Tk loads them
+		without Pillow; missing or stale ones are queued on the pipeline.
+		"""
+		path = asset.get("path")
+		if not path or path in self._asset_thumb_failed:
+			return ""
+		thumb = asset_thumb_path(path)
+		if not thumb_is_fresh(path, thumb):
+			if os.path.exists(path):
+				self._asset_pipeline_for().thumbnail(path)
+				self._schedule_asset_poll()
+			return ""
+		mtime = os.stat(thumb).st_mtime_ns
+		cached = self._asset_thumbs.get(path)
+		if cached is None or cached[0] != mtime:
+			try:
+				cached = (mtime, tk.PhotoImage(master=self.root, file=thumb))
+			except tk.TclError:
+				return ""
+			self._asset_thumbs[path] = cached
+		return cached[1]
+	
+	def _build_asset_list(self, list_frame):
+		"""The asset list: a thumbnail and name per row, row ids are indexes into custom_assets."""
+		scrollbar = tk.Scrollbar(list_frame)
+		scrollbar.pack(side="right", fill="y")
+		
+		ttk.Style(self.root).configure("Assets.Treeview", rowheight=THUMB_SIZE[1] + 4)
+		self.asset_tree = ttk.Treeview(list_frame, show="tree", selectmode="browse", style="Assets.Treeview",
+									   yscrollcommand=scrollbar.set, height=8)
+		self.asset_tree.pack(side="left", fill="both", expand=True)
+		scrollbar.config(command=self.asset_tree.yview)
+		self.asset_tree.bind("<<TreeviewSelect>>", self._on_asset_select)
+	
+	def _selected_asset_index(self):
+		"""Index in custom_assets of the asset selected in the list, or None."""
+		selection = self.asset_tree.selection()
+		if not selection:
+			return None
+		index = int(selection[0])
+		return index if index < len(self.custom_assets) else None
+	
 	def _refresh_asset_list(self):
-		"""Refresh the asset listbox based on selected category filter."""
-		self.asset_listbox.delete(0, tk.END)
+		"""Refresh the asset list based on selected category filter."""
+		self.asset_tree.delete(*self.asset_tree.get_children())
 		
 		# Get filter category
 		filter_cat = self.asset_category_var.get() if hasattr(self, 'asset_category_var') else "All"
 		
-		# Create mapping from listbox index to asset index
-		self._asset_index_map = []
-		
 		for i, asset in enumerate(self.custom_assets):
 			category = asset.get("category", "Other")
 			name = asset.get("name", "Unknown")
@@ -3459,18 +4266,12 @@ class TodoApp:
 				# Add animation indicator
 				anim_indicator = " 🎬" if is_animated else ""
 				display_name = f"[{category}] {name}{anim_indicator}"
-				self.asset_listbox.insert(tk.END, display_name)
-				self._asset_index_map.append(i)
+				self.asset_tree.insert("", "end", iid=str(i), text=display_name, image=self._asset_thumb(asset))
 	
 	def _on_asset_select(self, event):
 		"""Handle asset selection."""
-		selection = self.asset_listbox.curselection()
-		if not selection:
-			return
-		
-		listbox_idx = selection[0]
-		if listbox_idx < len(self._asset_index_map):
-			actual_idx = self._asset_index_map[listbox_idx]
+		actual_idx = self._selected_asset_index()
+		if actual_idx is not None:
 			asset = self.custom_assets[actual_idx]
 			self.asset_x_var.set(asset.get("x", 0.5))
 			self.asset_y_var.set(asset.get("y", 0.5))
@@ -3481,13 +4282,8 @@ class TodoApp:
 	
 	def _update_selected_asset(self, *args):
 		"""Update selected asset position/scale."""
-		selection = self.asset_listbox.curselection()
-		if not selection:
-			return
-		
-		listbox_idx = selection[0]
-		if listbox_idx < len(self._asset_index_map):
-			actual_idx = self._asset_index_map[listbox_idx]
+		actual_idx = self._selected_asset_index()
+		if actual_idx is not None:
 			
 			# Get proposed position
 			new_x = self.asset_x_var.get()
@@ -3525,21 +4321,20 @@ class TodoApp:
 	
 	def _delete_selected_asset(self):
 		"""Delete the selected asset."""
-		selection = self.asset_listbox.curselection()
-		if not selection:
-			return
-		
-		listbox_idx = selection[0]
-		if listbox_idx < len(self._asset_index_map):
-			actual_idx = self._asset_index_map[listbox_idx]
+		actual_idx = self._selected_asset_index()
+		if actual_idx is not None:
 			import os
 			# Delete file
 			filepath = self.custom_assets[actual_idx].get("path")
-			if filepath and os.path.exists(filepath):
-				try:
-					os.remove(filepath)
-				except:
-					pass
+			if filepath:
+				self._asset_image_cache.invalidate(filepath)
+				self._asset_thumbs.pop(filepath, None)
+			for path in (filepath, filepath and asset_thumb_path(filepath)):
+				if path and os.path.exists(path):
+					try:
+						os.remove(path)
+					except:
+						pass
 			
 			# Remove from list
 			self.custom_assets.pop(actual_idx)
@@ -3675,13 +4470,20 @@ class TodoApp:
 		
 		# Draw assets
 		try:
-			from PIL import Image, ImageTk
+			from PIL import ImageTk
 			
 			# Keep reference to prevent garbage collection
 			if not hasattr(self, '_asset_preview_images'):
 				self._asset_preview_images = []
 			self._asset_preview_images.clear()
 			
+			cache = self._asset_image_cache
+			floor_size = (int(width), max(1, int(height - wall_depth)))
+			old_floor_size = getattr(self, '_asset_preview_floor_size', None)
+			if old_floor_size and old_floor_size != floor_size:
+				cache.invalidate(size=old_floor_size)
+			self._asset_preview_floor_size = floor_size
+			
 			# 1) Floor assets stretched across floor area
 			for asset in self.custom_assets:
 				if asset.get("category") != "Floor":
@@ -3689,13 +4491,7 @@ class TodoApp:
 				filepath = asset.get("path")
 				if not filepath:
 					continue
-				img = Image.open(filepath)
-				if img.mode != 'RGBA':
-					img = img.convert('RGBA')
-				new_width = int(width)
-				new_height = max(1, int(height - wall_depth))
-				img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-				photo = ImageTk.PhotoImage(img)
+				photo = cache.image(filepath, size=floor_size, make=ImageTk.PhotoImage)
 				self._asset_preview_images.append(photo)
 				canvas.create_image(0, wall_depth, image=photo, anchor="nw")
 
@@ -3714,30 +4510,14 @@ class TodoApp:
 					
 					x = int(asset.get("x", 0.5) * width)
 					y = int(asset.get("y", 0.5) * height)
-					scale = asset.get("scale", 1.0)
-					
-					# Load image
-					img = Image.open(filepath)
-					
-					# Handle animated GIFs (show first frame in preview)
-					if asset.get("is_animated", False):
-						try:
-							img.seek(0)
-						except Exception:
-							pass
-					
-					# Convert RGBA if needed
-					if img.mode != 'RGBA':
-						img = img.convert('RGBA')
 					
-					# Scale image
-					new_width = int(img.width * scale)
-					new_height = int(img.height * scale)
-					img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-					photo = ImageTk.PhotoImage(img)
+					# Animated GIFs show their first frame in the preview
+					photo = cache.image(filepath, scale=asset.get("scale", 1.0), make=ImageTk.PhotoImage)
 					
 					self._asset_preview_images.append(photo)
 					canvas.create_image(x, y, image=photo, anchor="center")
+			if hasattr(self, 'asset_cache_label'):
+				self.asset_cache_label.config(text=cache.report())
 		except ImportError:
 			canvas.create_text(width//2, height//2, 
 							  text="PIL/Pillow required for PNG/GIF support\nInstall: pip install pillow",
@@ -3753,11 +4533,71 @@ class TodoApp:
 		self.settings['custom_assets'] = self.custom_assets
 		self._save_settings()
 	
+	def _avatar_room_visible(self):
+		"""True while the Avatar Room tab is selected and the window is not minimized."""
+		try:
+			return (self.root.state() not in ("iconic", "withdrawn")
+					and self.notebook.select() == str(self.avatar_room_tab))
+		except Exception:
+			return False
+
+	def _on_root_map_change(self, event):
+		# Bindings on the root also see every child widget's Map/Unmap
+		if event.widget is self.root:
+			self._animate_pets()
+
 	def _animate_pets(self):
-		"""Animate the entire scene: pets, window, avatar idle/walk, and random events."""
+		"""Start the scene animation loop if the Avatar Room is showing.
+
+		Safe to call any time: there is never more than one loop, and it stops
+		by itself once the tab is hidden or the window is minimized.
+		"""
 		if not hasattr(self, 'avatar_canvas'):
 			return
-		import random, time
+		if not self._avatar_room_visible():
+			self._pause_scene()
+			return
+		if self._avatar_animation_id is not None:
+			return
+		# Resume where the scene stopped: time spent hidden is not simulated
+		self._scene_last_tick = time.perf_counter()
+		self._scene_lag = 0.0
+		self._avatar_animation_id = self.avatar_canvas.after(self.SCENE_TICK_MS, self._scene_tick)
+
+	def _pause_scene(self):
+		if getattr(self, '_avatar_animation_id', None) is not None:
+			try:
+				self.avatar_canvas.after_cancel(self._avatar_animation_id)
+			except Exception:
+				pass
+			self._avatar_animation_id = None
+
+	def _scene_tick(self):
+		"""One frame: advance the scene by the wall-clock time since the last frame, then redraw."""
+		self._avatar_animation_id = None
+		if not self._avatar_room_visible():
+			return  # _animate_pets() restarts the loop when the room is shown again
+		now = time.perf_counter()
+		tick = self.SCENE_TICK_MS / 1000.0
+		self._scene_lag += now - self._scene_last_tick
+		self._scene_last_tick = now
+		# Fixed steps keep speeds independent of timer jitter; a long stall is
+		# dropped instead of fast-forwarded
+		steps = min(int(self._scene_lag / tick), self.SCENE_MAX_CATCHUP)
+		self._scene_lag = 0.0 if steps == self.SCENE_MAX_CATCHUP else self._scene_lag - steps * tick
+		for _ in range(steps):
+			self._advance_scene()
+		if steps:
+			# Only the animated items change; the room itself is redrawn on edits and resizes
+			try:
+				self._update_scene()
+			except Exception:
+				pass
+		self._avatar_animation_id = self.avatar_canvas.after(self.SCENE_TICK_MS, self._scene_tick)
+
+	def _advance_scene(self):
+		"""Advance pets, window, avatar idle/walk, and random events by one step."""
+		import random
 		# Determine canvas bounds (no update_idletasks to prevent flashing)
 		canvas = self.avatar_canvas
 		width = canvas.winfo_width() if canvas.winfo_width() > 10 else 600
@@ -3800,13 +4640,6 @@ class TodoApp:
 				if cloud["x"] > 1.2:
 					cloud["x"] = -0.25
 		
-		# 2.5) Animate GIF assets
-		for asset in getattr(self, 'custom_assets', []):
-			if asset.get("is_animated", False):
-				frame_count = asset.get("frame_count", 1)
-				current = asset.get("current_frame", 0)
-				asset["current_frame"] = (current + 1) % frame_count
-		
 		# 3) Avatar idle auto-walk + blinking + random events
 		now = time.time()
 		if getattr(self, '_avatar_auto_move', True) and now - getattr(self, '_last_user_move_time', now) > 3:
@@ -3853,16 +4686,6 @@ class TodoApp:
 					re["ticks_left"] -= 1
 				else:
 					re["type"] = None
-		
-		# Redraw room directly in animation loop (already scheduled at consistent interval)
-		try:
-			self.avatar_canvas.delete("all")
-			self._draw_avatar_room()
-		except Exception:
-			pass
-		
-		# Continue animation at 120ms (smoother than 100ms, reduces flashing)
-		self._avatar_animation_id = self.avatar_canvas.after(120, self._animate_pets)
 
 	def _request_redraw(self):
 		"""Coalesce redraw requests to avoid flicker and duplicate draws."""
@@ -4260,14 +5083,7 @@ class TodoApp:
 		self._ai_suggested_tasks = []
 		
 		# Extract lines that start with "- " (task format)
-		lines = response.split("\n")
-		tasks = []
-		for line in lines:
-			stripped = line.strip()
-			if stripped.startswith("- "):
-				task_text = stripped[2:].strip()
-				if task_text:
-					tasks.append(task_text)
+		tasks = ai_heuristics.extract_tasks(response)
 		
 		if not tasks:
 			return
@@ -4339,175 +5155,15 @@ class TodoApp:
 	
 	def _ai_determine_category(self, task_text):
 		"""Determine appropriate category based on task content and conversation context."""
-		lower_text = task_text.lower()
-		
-		# Get conversation context
-		context_topic = getattr(self, '_ai_context', {}).get("topic")
-		
-		# Fitness/Health category
-		if context_topic == "fitness" or any(word in lower_text for word in [
-			"workout", "exercise", "gym", "fitness", "health", "run", "walk", "cardio",
-			"strength", "yoga", "stretch", "weight", "muscle", "train", "sport",
-			"nutrition", "diet", "meal", "calorie", "water", "sleep"
-		]):
-			return "Fitness"
-		
-		# Learning/Education category
-		if context_topic == "learning" or any(word in lower_text for word in [
-			"learn", "study", "course", "tutorial", "practice", "lesson", "skill",
-			"read", "book", "video", "class", "training", "education", "research",
-			"programming", "code", "python", "language", "instrument"
-		]):
-			return "Learning"
-		
-		# Work/Career category
-		if any(word in lower_text for word in [
-			"project", "meeting", "presentation", "report", "deadline", "client",
-			"email", "call", "interview", "resume", "career", "job", "work",
-			"business", "professional", "office", "team", "manager"
-		]):
-			return "Work"
-		
-		# Writing/Creative category
-		if context_topic == "writing" or any(word in lower_text for word in [
-			"write", "blog", "article", "post", "draft", "edit", "publish",
-			"content", "story", "book", "chapter", "essay", "creative"
-		]):
-			return "Writing"
-		
-		# Home/Organization category
-		if any(word in lower_text for word in [
-			"organize", "clean", "declutter", "tidy", "home", "room", "kitchen",
-			"laundry", "groceries", "shopping", "errand", "maintenance", "repair"
-		]):
-			return "Home"
-		
-		# Personal Development category
-		if any(word in lower_text for word in [
-			"goal", "habit", "routine", "meditate", "journal", "reflect",
-			"mindfulness", "growth", "develop", "improve", "better"
-		]):
-			return "Personal"
-		
-		# Finance category
-		if any(word in lower_text for word in [
-			"budget", "money", "finance", "payment", "bill", "tax", "savings",
-			"invest", "expense", "bank", "insurance"
-		]):
-			return "Finance"
-		
-		# Default: use context topic or AI Generated
-		if context_topic:
-			return context_topic.capitalize()
-		
-		return "AI Generated"
+		return ai_heuristics.suggest_category(task_text, getattr(self, '_ai_context', {}).get("topic"))
 	
 	def _ai_determine_priority(self, task_text):
 		"""Determine task priority based on content analysis."""
-		lower_text = task_text.lower()
-		
-		# High priority indicators
-		high_keywords = [
-			"urgent", "important", "critical", "asap", "immediately", "emergency",
-			"deadline", "must", "required", "essential", "vital", "crucial",
-			"schedule", "book", "appointment", "meeting", "interview",
-			"health check", "doctor", "medical", "safety"
-		]
-		
-		# Low priority indicators
-		low_keywords = [
-			"optional", "consider", "maybe", "eventually", "someday",
-			"explore", "research", "learn about", "read about", "watch",
-			"review", "browse", "organize", "tidy", "label", "sort"
-		]
-		
-		# Check for high priority
-		if any(keyword in lower_text for keyword in high_keywords):
-			return "High"
-		
-		# Check for low priority
-		if any(keyword in lower_text for keyword in low_keywords):
-			return "Low"
-		
-		# Context-based priority
-		context_topic = getattr(self, '_ai_context', {}).get("topic")
-		
-		# First few steps in a plan are usually higher priority
-		if any(word in lower_text for word in ["start", "begin", "first", "initial", "setup", "install", "create account"]):
-			return "High"
-		
-		# Health/fitness immediate tasks
-		if context_topic == "fitness" and any(word in lower_text for word in ["today", "schedule", "plan"]):
-			return "High"
-		
-		# Default to Medium
-		return "Medium"
+		return ai_heuristics.suggest_priority(task_text, getattr(self, '_ai_context', {}).get("topic"))
 	
 	def _ai_determine_deadline_days(self, task_text, priority):
 		"""Determine reasonable deadline offset in days based on task content and priority."""
-		from datetime import date
-		
-		lower_text = task_text.lower()
-		
-		# Immediate/today tasks (0-1 days)
-		if any(word in lower_text for word in ["today", "now", "immediately", "asap", "urgent"]):
-			return 0
-		
-		# This week tasks (1-7 days based on priority)
-		if any(word in lower_text for word in ["this week", "soon", "schedule", "book"]):
-			return 3 if priority == "High" else 7
-		
-		# Research/planning tasks (longer timeframe)
-		if any(word in lower_text for word in ["research", "explore", "learn", "study", "read"]):
-			return 14 if priority == "High" else 30
-		
-		# Installation/setup tasks (quick turnaround)
-		if any(word in lower_text for word in ["install", "download", "setup", "get", "buy", "purchase"]):
-			return 2 if priority == "High" else 7
-		
-		# Daily/routine tasks (short deadline)
-		if any(word in lower_text for word in ["daily", "track", "log", "record", "drink water"]):
-			return 1
-		
-		# Weekly tasks
-		if any(word in lower_text for word in ["weekly", "week", "per week"]):
-			return 7
-		
-		# Practice/habit tasks (recurring concept, shorter deadline)
-		if any(word in lower_text for word in ["practice", "exercise", "workout", "meditate"]):
-			return 3 if priority == "High" else 7
-		
-		# Review/feedback tasks (medium timeframe)
-		if any(word in lower_text for word in ["review", "feedback", "check", "monitor"]):
-			return 7 if priority == "High" else 14
-		
-		# Documentation/writing tasks (longer timeframe)
-		if any(word in lower_text for word in ["document", "write", "draft", "article", "blog"]):
-			return 7 if priority == "High" else 21
-		
-		# Project planning/milestone tasks
-		if any(word in lower_text for word in ["plan", "roadmap", "outline", "design", "brainstorm"]):
-			return 5 if priority == "High" else 14
-		
-		# Implementation tasks (medium timeframe)
-		if any(word in lower_text for word in ["implement", "build", "create", "develop", "code"]):
-			return 14 if priority == "High" else 30
-		
-		# Testing/quality tasks
-		if any(word in lower_text for word in ["test", "debug", "fix", "proofread", "edit"]):
-			return 7 if priority == "High" else 14
-		
-		# Completion/finalization tasks
-		if any(word in lower_text for word in ["complete", "finish", "finalize", "publish", "deploy"]):
-			return 7 if priority == "High" else 21
-		
-		# Default deadlines based on priority
-		if priority == "High":
-			return 7  # 1 week
-		elif priority == "Low":
-			return 30  # 1 month
-		else:
-			return 14  # 2 weeks
+		return ai_heuristics.suggest_deadline_days(task_text, priority)
 	
 	def _ai_clear_chat(self):
 		"""Clear the chat history."""
@@ -4581,14 +5237,13 @@ class TodoApp:
 			var.set(self.current_theme.get(key, "#ffffff"))
 	
 	def _preview_custom_theme(self):
-		"""Apply the custom theme temporarily to preview it."""
-		custom_theme = {key: var.get() for key, var in self.theme_color_vars.items()}
-		self.current_theme = custom_theme
+		"""Apply the editor's colors to the whole app (until another theme is chosen)."""
+		self.current_theme = self._theme_editor_draft()
 		self.apply_theme()
 		self._refresh_all_category_colors()
 		self._update_stats_view()
 		self._update_calendar_view()
-		messagebox.showinfo("Preview", "Theme preview applied! Use 'Save Theme' to keep it.")
+		messagebox.showinfo("Applied", "Theme applied to the app! Use 'Save Theme' to keep it.")
 	
 	def _save_custom_theme(self):
 		"""Save the custom theme to the themes dictionary."""
@@ -4597,7 +5252,7 @@ class TodoApp:
 			messagebox.showwarning("No Name", "Please enter a theme name.")
 			return
 		
-		custom_theme = {key: var.get() for key, var in self.theme_color_vars.items()}
+		custom_theme = self._theme_editor_draft()
 		self.themes[theme_name] = custom_theme
 		
 		# Update the theme combo box
@@ -4646,8 +5301,7 @@ class TodoApp:
 		built_in = ["Light", "Dark", "Solarized Dark", "Nord", "GitHub Light", "GitHub Dark"]
 		custom_themes = {name: theme for name, theme in self.themes.items() if name not in built_in}
 		try:
-			with open(themes_file, 'w') as f:
-				json.dump(custom_themes, f, indent=2)
+			write_json_atomic(themes_file, custom_themes)
 		except Exception as e:
 			messagebox.showerror("Save Error", f"Failed to save themes: {str(e)}")
 	
@@ -4656,9 +5310,8 @@ class TodoApp:
 		themes_file = os.path.join(DATA_DIR, "custom_themes.json")
 		if os.path.exists(themes_file):
 			try:
-				with open(themes_file, 'r') as f:
-					custom_themes = json.load(f)
-					self.themes.update(custom_themes)
+				custom_themes, _ = read_json_verified(themes_file)
+				self.themes.update(custom_themes)
 			except Exception as e:
 				print(f"Failed to load custom themes: {str(e)}")
 	
@@ -4725,9 +5378,10 @@ class TodoApp:
 
 	def change_theme(self):
 		self.current_theme = self.themes[self.theme_var.get()]
+		self._tasks_dirty = True  # theme is saved with the tasks
+		self._backend_append({"op": "theme", "name": self.theme_var.get()})
 		self.apply_theme()
 		self._refresh_all_category_colors()  # Refresh category colors with new theme background
-		self._apply_alternating_rows()  # Refresh overdue highlights with new theme
 		self._update_stats_view()  # Redraw stats graph with new theme colors
 		self._update_calendar_view()  # Redraw calendar with new theme colors
 		# Re-evaluate min window size in case fonts or paddings changed
@@ -4754,23 +5408,8 @@ class TodoApp:
 			canvas.delete("gradient")
 			width = canvas.winfo_width() or 1
 			height = canvas.winfo_height() or 1
-			
-			# Parse colors
-			r1, g1, b1 = int(color1[1:3], 16), int(color1[3:5], 16), int(color1[5:7], 16)
-			r2, g2, b2 = int(color2[1:3], 16), int(color2[3:5], 16), int(color2[5:7], 16)
-			
-			steps = height if vertical else width
-			for i in range(steps):
-				ratio = i / max(steps - 1, 1)
-				r = int(r1 + (r2 - r1) * ratio)
-				g = int(g1 + (g2 - g1) * ratio)
-				b = int(b1 + (b2 - b1) * ratio)
-				color = f'#{r:02x}{g:02x}{b:02x}'
-				
-				if vertical:
-					canvas.create_line(0, i, width, i, fill=color, tags="gradient")
-				else:
-					canvas.create_line(i, 0, i, height, fill=color, tags="gradient")
+			canvas._gradient_image = self._gradient_image(color1, color2, width, height, vertical)
+			canvas.create_image(0, 0, image=canvas._gradient_image, anchor="nw", tags="gradient")
 		
 		canvas.bind("<Configure>", draw_gradient)
 		draw_gradient()
@@ -4784,22 +5423,83 @@ class TodoApp:
 		# Determine size
 		w = canvas.winfo_width() or canvas.winfo_reqwidth() or 300
 		h = canvas.winfo_height() or canvas.winfo_reqheight() or 200
+		# One image item instead of a line per pixel row; the canvas keeps it alive
+		canvas._gradient_image = self._gradient_image(color1, color2, max(1, w), max(1, h), vertical)
+		canvas.create_image(0, 0, image=canvas._gradient_image, anchor="nw", tags="gradient")
+		canvas.tag_lower("gradient")
+
+	def _gradient_image(self, color1, color2, width, height, vertical=True):
+		"""A PhotoImage of a two-color gradient, cached by colors, size and direction.
+
+		Only one column (vertical) or row of colors is computed; Tk tiles it
+		across the image.
+		"""
+		if not hasattr(self, '_gradient_cache'):
+			self._gradient_cache = LRUCache(16 << 20)
+		key = (color1, color2, width, height, vertical)
+		photo = self._gradient_cache.get(key)
+		if photo is not None:
+			return photo
 		# Parse colors
 		r1, g1, b1 = int(color1[1:3], 16), int(color1[3:5], 16), int(color1[5:7], 16)
 		r2, g2, b2 = int(color2[1:3], 16), int(color2[3:5], 16), int(color2[5:7], 16)
-		steps = h if vertical else w
-		steps = max(1, steps)
-		# Draw gradient lines
+		steps = height if vertical else width
+		colors = []
 		for i in range(steps):
 			ratio = i / max(steps - 1, 1)
 			r = int(r1 + (r2 - r1) * ratio)
 			g = int(g1 + (g2 - g1) * ratio)
 			b = int(b1 + (b2 - b1) * ratio)
-			color = f'#{r:02x}{g:02x}{b:02x}'
-			if vertical:
-				canvas.create_line(0, i, w, i, fill=color)
-			else:
-				canvas.create_line(i, 0, i, h, fill=color)
+			colors.append(f'#{r:02x}{g:02x}{b:02x}')
+		if vertical:
+			data = " ".join("{%s}" % color for color in colors)  # one pixel per row
+		else:
+			data = "{%s}" % " ".join(colors)  # a single row
+		photo = tk.PhotoImage(master=self.root, width=width, height=height)
+		photo.put(data, to=(0, 0, width, height))
+		self._gradient_cache.put(key, photo, width * height * 4)
+		return photo
+
+	def _palette(self):
+		"""Derived colors of the current theme (cached per theme, see todo_core.themes)."""
+		return self._palettes.palette(self.current_theme)
+
+	def _set_colors(self, widget, **options):
+		"""Configure only the options whose value differs; unchanged widgets are not redrawn."""
+		changed = {}
+		for key, value in options.items():
+			try:
+				current = widget.cget(key)
+			except tk.TclError:
+				current = None
+			if str(current) != str(value):
+				changed[key] = value
+		if changed:
+			widget.configure(**changed)
+
+	def _set_style(self, name, **options):
+		"""ttk Style.configure, skipping options that already have this value."""
+		applied = self._style_options.setdefault(("configure", name), {})
+		changed = {key: value for key, value in options.items() if applied.get(key) != value}
+		if changed:
+			ttk.Style(self.root).configure(name, **changed)
+			applied.update(changed)
+
+	def _set_style_map(self, name, **options):
+		"""ttk Style.map, skipping options that already have this value."""
+		applied = self._style_options.setdefault(("map", name), {})
+		changed = {key: value for key, value in options.items() if applied.get(key) != value}
+		if changed:
+			ttk.Style(self.root).map(name, **changed)
+			applied.update(changed)
+
+	def _set_tag_colors(self, tag, **options):
+		"""Task tree tag_configure, skipping options that already have this value."""
+		applied = self._tag_options.setdefault(tag, {})
+		changed = {key: value for key, value in options.items() if applied.get(key) != value}
+		if changed:
+			self.tree.tag_configure(tag, **changed)
+			applied.update(changed)
 
 	def apply_theme(self):
 		# Apply theme to root and frames (with gradients if specified)
@@ -4808,358 +5508,486 @@ class TodoApp:
 		
 		if bg_gradient and bg_gradient != bg_color:
 			# Note: Root window doesn't support canvas gradients, use solid color
-			self.root.configure(bg=bg_color)
+			self._set_colors(self.root, bg=bg_color)
 		else:
-			self.root.configure(bg=bg_color)
+			self._set_colors(self.root, bg=bg_color)
         
 		# Update theme label
-		self.theme_label.configure(bg=self.current_theme["bg"],
-								 fg=self.current_theme["fg"])
+		self._set_colors(self.theme_label, bg=self.current_theme["bg"],
+								         fg=self.current_theme["fg"])
+		# Derived colors (alternating rows, overdue, selection) are cached per theme
+		palette = self._palette()
 		# Style ttk Treeview to match theme colors
 		style = ttk.Style(self.root)
-		style.theme_use('clam')  # Use clam theme for better color control
-		style.configure('Treeview',
+		if style.theme_use() != 'clam':
+			style.theme_use('clam')  # Use clam theme for better color control
+		self._set_style('Treeview',
 					  background=self.current_theme["listbox_bg"],
 					  fieldbackground=self.current_theme["listbox_bg"],
 					  foreground=self.current_theme["listbox_fg"],
 					  borderwidth=0,
 					  rowheight=25)
 		
-		# Create alternating row color for better readability
-		def _hex_to_rgb(h):
-			_h = h.lstrip('#')
-			return tuple(int(_h[i:i+2], 16) for i in (0, 2, 4))
-		
-		style.configure('Treeview.Heading',
+		self._set_style('Treeview.Heading',
 					  background=self.current_theme["button_bg"],
 					  foreground=self.current_theme["button_fg"],
 					  borderwidth=1,
 					  relief="groove")
 		
-		bg_rgb = _hex_to_rgb(self.current_theme["listbox_bg"]) if isinstance(self.current_theme.get("listbox_bg"), str) else (255,255,255)
-		# Create a slightly different shade for alternating rows (5% lighter/darker)
-		alt_rgb = tuple(min(255, int(c * 1.05)) if sum(bg_rgb) < 384 else max(0, int(c * 0.95)) for c in bg_rgb)
-		alt_bg = '#{:02x}{:02x}{:02x}'.format(*alt_rgb)
-		
-		# Configure tag for alternating rows
-		self.tree.tag_configure('oddrow', background=alt_bg)
-		
-		# Configure overdue tag (red highlight for tasks past deadline)
-		overdue_bg = self._blend_color_with_bg("#ff0000", 0.25)  # Red with 25% opacity
-		self.tree.tag_configure('overdue', background=overdue_bg)
-		
-		# perceived brightness for selection color
-		brightness = (0.299*bg_rgb[0] + 0.587*bg_rgb[1] + 0.114*bg_rgb[2]) / 255.0
-		# Choose a strong accent based on background brightness
-		accent_bg = "#1976d2" if brightness > 0.5 else "#4a90e2"
-		accent_fg = "#ffffff"
-		style.map('Treeview',
-				 background=[('selected', accent_bg)],
-				 foreground=[('selected', accent_fg)])
+		# Tags for alternating rows and overdue tasks (red highlight at 25% opacity)
+		self._set_tag_colors('oddrow', background=palette.alt_bg)
+		self._set_tag_colors('overdue', background=palette.overdue_bg)
+		
+		self._set_style_map('Treeview',
+				           background=[('selected', palette.accent_bg)],
+				           foreground=[('selected', palette.accent_fg)])
         
 		for frame in self.root.winfo_children():
 			if isinstance(frame, tk.Frame):
-				frame.configure(bg=self.current_theme["bg"])
+				self._set_colors(frame, bg=self.current_theme["bg"])
 				for widget in frame.winfo_children():
 					if isinstance(widget, (ttk.Combobox, ttk.Treeview, ttk.Scrollbar, ttk.Notebook)):
 						continue  # Skip ttk widgets as they handle styling differently
 					elif isinstance(widget, tk.Button):
-						widget.configure(bg=self.current_theme["button_bg"],
-									  fg=self.current_theme["button_fg"],
-									  activebackground=self.current_theme["button_bg"],
-									  activeforeground=self.current_theme["button_fg"])
+						self._set_colors(widget, bg=self.current_theme["button_bg"],
+									          fg=self.current_theme["button_fg"],
+									          activebackground=self.current_theme["button_bg"],
+									          activeforeground=self.current_theme["button_fg"])
 					elif isinstance(widget, tk.Entry):
-						widget.configure(bg=self.current_theme["entry_bg"],
-									  fg=self.current_theme["entry_fg"],
-									  insertbackground=self.current_theme["fg"])
+						self._set_colors(widget, bg=self.current_theme["entry_bg"],
+									          fg=self.current_theme["entry_fg"],
+									          insertbackground=self.current_theme["fg"])
 					elif isinstance(widget, tk.Listbox):
-						widget.configure(bg=self.current_theme["listbox_bg"],
-									  fg=self.current_theme["listbox_fg"],
-									  selectbackground=self.current_theme["button_bg"],
-									  selectforeground=self.current_theme["button_fg"])
+						self._set_colors(widget, bg=self.current_theme["listbox_bg"],
+									          fg=self.current_theme["listbox_fg"],
+									          selectbackground=self.current_theme["button_bg"],
+									          selectforeground=self.current_theme["button_fg"])
 					elif isinstance(widget, tk.Canvas):
 						# For canvas widgets, we draw gradients during render functions
-						widget.configure(bg=self.current_theme.get("bg", "#ffffff"))
+						self._set_colors(widget, bg=self.current_theme.get("bg", "#ffffff"))
 					elif isinstance(widget, tk.Scrollbar):
-						widget.configure(bg=self.current_theme["button_bg"],
-									  troughcolor=self.current_theme["bg"])
+						self._set_colors(widget, bg=self.current_theme["button_bg"],
+									          troughcolor=self.current_theme["bg"])
 					elif isinstance(widget, tk.Label) and widget != self.theme_label:
-						widget.configure(bg=self.current_theme["bg"],
-									  fg=self.current_theme["fg"])
+						self._set_colors(widget, bg=self.current_theme["bg"],
+									          fg=self.current_theme["fg"])
 		
 		# Also apply theme to widgets in notebook tabs
 		for tab_frame in [self.tasks_tab, self.daily_tab, self.ai_tasks_tab, self.stats_tab, self.calendar_tab, self.theme_editor_tab, self.settings_tab, self.avatar_room_tab]:
-			# Use solid background for tab frames to avoid any overlap issues with content
-			tab_bg = self.current_theme.get("bg", "#ffffff")
-			# If a previous gradient canvas exists, remove it to prevent covering content
-			if hasattr(tab_frame, '_gradient_canvas'):
-				try:
-					tab_frame._gradient_canvas.destroy()
-				except Exception:
-					pass
-				try:
-					delattr(tab_frame, '_gradient_canvas')
-				except Exception:
-					pass
-			tab_frame.configure(bg=tab_bg)
-			for widget in tab_frame.winfo_children():
-				if isinstance(widget, tk.Frame):
-					# Solid background for frames
-					frame_bg = self.current_theme.get("bg", "#ffffff")
-					widget.configure(bg=frame_bg)
-					for child in widget.winfo_children():
-						if isinstance(child, (ttk.Combobox, ttk.Treeview, ttk.Scrollbar)):
-							continue
-						elif isinstance(child, tk.Button):
-							child.configure(bg=self.current_theme["button_bg"],
-										 fg=self.current_theme["button_fg"],
-										 activebackground=self.current_theme["button_bg"],
-										 activeforeground=self.current_theme["button_fg"])
-						elif isinstance(child, tk.Entry):
-							# Keep main task entry white, theme others
-							if child != self.entry:
-								child.configure(bg=self.current_theme["entry_bg"],
-											 fg=self.current_theme["entry_fg"],
-											 insertbackground=self.current_theme["fg"])
-						elif isinstance(child, tk.Canvas):
-							# For canvas widgets, we draw gradients during render functions
-							child.configure(bg=self.current_theme.get("bg", "#ffffff"))
-						elif isinstance(child, tk.Label):
-							child.configure(bg=self.current_theme["bg"],
-										 fg=self.current_theme["fg"])
-						elif isinstance(child, tk.Radiobutton):
-							child.configure(bg=self.current_theme["bg"],
-										 fg=self.current_theme["fg"],
-										 activebackground=self.current_theme["bg"],
-										 activeforeground=self.current_theme["fg"],
-										 selectcolor=self.current_theme["button_bg"])
-						elif isinstance(child, tk.Checkbutton):
-							child.configure(bg=self.current_theme["bg"],
-									 fg=self.current_theme["fg"],
-									 activebackground=self.current_theme["bg"],
-									 activeforeground=self.current_theme["fg"],
-									 selectcolor=self.current_theme["button_bg"])
-				elif isinstance(widget, tk.Canvas):
-					# For canvas widgets, we draw gradients during render functions
-					widget.configure(bg=self.current_theme.get("bg", "#ffffff"))
-				elif isinstance(widget, tk.Label):
-					widget.configure(bg=self.current_theme["bg"],
-								  fg=self.current_theme["fg"])
+			self._theme_tab(tab_frame)
 		
 		# Style ttk.Notebook tabs
-		style.configure('TNotebook', background=self.current_theme["bg"], borderwidth=0)
-		style.configure('TNotebook.Tab',
+		self._set_style('TNotebook', background=self.current_theme["bg"], borderwidth=0)
+		self._set_style('TNotebook.Tab',
 					  background=self.current_theme["button_bg"],
 					  foreground=self.current_theme["button_fg"],
 					  padding=[10, 2])
-		style.map('TNotebook.Tab',
-				 background=[('selected', self.current_theme["listbox_bg"])],
-				 foreground=[('selected', self.current_theme["fg"])])
+		self._set_style_map('TNotebook.Tab',
+				           background=[('selected', self.current_theme["listbox_bg"])],
+				           foreground=[('selected', self.current_theme["fg"])])
+		
+		self._theme_tab_widgets()
+		
+		# Theme task input widgets (category, priority, deadline)
+		# Increase font size to make comboboxes taller (match button height)
+		self._set_style('TCombobox',
+					  fieldbackground=self.current_theme["entry_bg"],
+					  background=self.current_theme["button_bg"],
+					  foreground=self.current_theme["entry_fg"],
+					  arrowcolor=self.current_theme["button_fg"],
+					  borderwidth=1,
+					  relief="flat",
+					  font=("", 9),
+					  padding=3)
+		self._set_style_map('TCombobox',
+				           fieldbackground=[('readonly', self.current_theme["entry_bg"])],
+				           selectbackground=[('readonly', self.current_theme["button_bg"])],
+				           selectforeground=[('readonly', self.current_theme["button_fg"])],
+				           foreground=[('readonly', self.current_theme["entry_fg"])])
 		
+		# Theme deadline button
+		if hasattr(self, 'deadline_btn'):
+			self._set_colors(self.deadline_btn, bg=self.current_theme["button_bg"],
+									           fg=self.current_theme["button_fg"],
+									           activebackground=self.current_theme["button_bg"],
+									           activeforeground=self.current_theme["button_fg"])
+
+	def _theme_tab(self, tab_frame):
+		"""Theme one notebook tab's frame and the widgets directly inside it."""
+		# Use solid background for tab frames to avoid any overlap issues with content
+		tab_bg = self.current_theme.get("bg", "#ffffff")
+		# If a previous gradient canvas exists, remove it to prevent covering content
+		if hasattr(tab_frame, '_gradient_canvas'):
+			try:
+				tab_frame._gradient_canvas.destroy()
+			except Exception:
+				pass
+			try:
+				delattr(tab_frame, '_gradient_canvas')
+			except Exception:
+				pass
+		self._set_colors(tab_frame, bg=tab_bg)
+		for widget in tab_frame.winfo_children():
+			if isinstance(widget, tk.Frame):
+				# Solid background for frames
+				frame_bg = self.current_theme.get("bg", "#ffffff")
+				self._set_colors(widget, bg=frame_bg)
+				for child in widget.winfo_children():
+					if isinstance(child, (ttk.Combobox, ttk.Treeview, ttk.Scrollbar)):
+						continue
+					elif isinstance(child, tk.Button):
+						self._set_colors(child, bg=self.current_theme["button_bg"],
+									         fg=self.current_theme["button_fg"],
+									         activebackground=self.current_theme["button_bg"],
+									         activeforeground=self.current_theme["button_fg"])
+					elif isinstance(child, tk.Entry):
+						# Keep main task entry white, theme others
+						if child != self.entry:
+							self._set_colors(child, bg=self.current_theme["entry_bg"],
+										         fg=self.current_theme["entry_fg"],
+										         insertbackground=self.current_theme["fg"])
+					elif isinstance(child, tk.Canvas):
+						# For canvas widgets, we draw gradients during render functions
+						self._set_colors(child, bg=self.current_theme.get("bg", "#ffffff"))
+					elif isinstance(child, tk.Label):
+						self._set_colors(child, bg=self.current_theme["bg"],
+									         fg=self.current_theme["fg"])
+					elif isinstance(child, tk.Radiobutton):
+						self._set_colors(child, bg=self.current_theme["bg"],
+									         fg=self.current_theme["fg"],
+									         activebackground=self.current_theme["bg"],
+									         activeforeground=self.current_theme["fg"],
+									         selectcolor=self.current_theme["button_bg"])
+					elif isinstance(child, tk.Checkbutton):
+						self._set_colors(child, bg=self.current_theme["bg"],
+								         fg=self.current_theme["fg"],
+								         activebackground=self.current_theme["bg"],
+								         activeforeground=self.current_theme["fg"],
+								         selectcolor=self.current_theme["button_bg"])
+			elif isinstance(widget, tk.Canvas):
+				# For canvas widgets, we draw gradients during render functions
+				self._set_colors(widget, bg=self.current_theme.get("bg", "#ffffff"))
+			elif isinstance(widget, tk.Label):
+				self._set_colors(widget, bg=self.current_theme["bg"],
+							          fg=self.current_theme["fg"])
+
+	def _theme_tab_widgets(self):
+		"""Theme the Calendar and Stats controls nested too deep for _theme_tab."""
 		# Explicitly theme Calendar navigation widgets
 		if hasattr(self, 'cal_prev_btn'):
-			self.cal_prev_btn.configure(bg=self.current_theme["button_bg"],
-									   fg=self.current_theme["button_fg"],
-									   activebackground=self.current_theme["button_bg"],
-									   activeforeground=self.current_theme["button_fg"],
-									   highlightbackground=self.current_theme["bg"],
-									   highlightcolor=self.current_theme["bg"])
+			self._set_colors(self.cal_prev_btn, bg=self.current_theme["button_bg"],
+									           fg=self.current_theme["button_fg"],
+									           activebackground=self.current_theme["button_bg"],
+									           activeforeground=self.current_theme["button_fg"],
+									           highlightbackground=self.current_theme["bg"],
+									           highlightcolor=self.current_theme["bg"])
 		if hasattr(self, 'cal_next_btn'):
-			self.cal_next_btn.configure(bg=self.current_theme["button_bg"],
-									   fg=self.current_theme["button_fg"],
-									   activebackground=self.current_theme["button_bg"],
-									   activeforeground=self.current_theme["button_fg"],
-									   highlightbackground=self.current_theme["bg"],
-									   highlightcolor=self.current_theme["bg"])
+			self._set_colors(self.cal_next_btn, bg=self.current_theme["button_bg"],
+									           fg=self.current_theme["button_fg"],
+									           activebackground=self.current_theme["button_bg"],
+									           activeforeground=self.current_theme["button_fg"],
+									           highlightbackground=self.current_theme["bg"],
+									           highlightcolor=self.current_theme["bg"])
 		if hasattr(self, 'cal_today_btn'):
-			self.cal_today_btn.configure(bg=self.current_theme["button_bg"],
-										fg=self.current_theme["button_fg"],
-										activebackground=self.current_theme["button_bg"],
-										activeforeground=self.current_theme["button_fg"],
-										highlightbackground=self.current_theme["bg"],
-										highlightcolor=self.current_theme["bg"])
+			self._set_colors(self.cal_today_btn, bg=self.current_theme["button_bg"],
+										        fg=self.current_theme["button_fg"],
+										        activebackground=self.current_theme["button_bg"],
+										        activeforeground=self.current_theme["button_fg"],
+										        highlightbackground=self.current_theme["bg"],
+										        highlightcolor=self.current_theme["bg"])
 		if hasattr(self, 'cal_date_label'):
-			self.cal_date_label.configure(bg=self.current_theme["button_bg"],
-										 fg=self.current_theme["button_fg"])
+			self._set_colors(self.cal_date_label, bg=self.current_theme["button_bg"],
+										         fg=self.current_theme["button_fg"])
 		
 		# Theme Calendar frames
 		if hasattr(self, 'cal_header'):
-			self.cal_header.configure(bg=self.current_theme["bg"])
+			self._set_colors(self.cal_header, bg=self.current_theme["bg"])
 		if hasattr(self, 'nav_frame'):
-			self.nav_frame.configure(bg=self.current_theme["bg"])
+			self._set_colors(self.nav_frame, bg=self.current_theme["bg"])
 		if hasattr(self, 'view_toggle_frame'):
-			self.view_toggle_frame.configure(bg=self.current_theme["bg"])
+			self._set_colors(self.view_toggle_frame, bg=self.current_theme["bg"])
 		
 		if hasattr(self, 'cal_weekly_radio'):
-			self.cal_weekly_radio.configure(bg=self.current_theme["bg"],
-										   fg=self.current_theme["fg"],
-										   activebackground=self.current_theme["bg"],
-										   activeforeground=self.current_theme["fg"],
-										   selectcolor=self.current_theme["bg"],
-										   highlightbackground=self.current_theme["bg"],
-										   highlightcolor=self.current_theme["bg"])
+			self._set_colors(self.cal_weekly_radio, bg=self.current_theme["bg"],
+										           fg=self.current_theme["fg"],
+										           activebackground=self.current_theme["bg"],
+										           activeforeground=self.current_theme["fg"],
+										           selectcolor=self.current_theme["bg"],
+										           highlightbackground=self.current_theme["bg"],
+										           highlightcolor=self.current_theme["bg"])
 		if hasattr(self, 'cal_monthly_radio'):
-			self.cal_monthly_radio.configure(bg=self.current_theme["bg"],
-											fg=self.current_theme["fg"],
-											activebackground=self.current_theme["bg"],
-											activeforeground=self.current_theme["fg"],
-											selectcolor=self.current_theme["bg"],
-											highlightbackground=self.current_theme["bg"],
-											highlightcolor=self.current_theme["bg"])
+			self._set_colors(self.cal_monthly_radio, bg=self.current_theme["bg"],
+											        fg=self.current_theme["fg"],
+											        activebackground=self.current_theme["bg"],
+											        activeforeground=self.current_theme["fg"],
+											        selectcolor=self.current_theme["bg"],
+											        highlightbackground=self.current_theme["bg"],
+											        highlightcolor=self.current_theme["bg"])
 		
 		# Explicitly theme Stats radiobuttons
 		if hasattr(self, 'stats_bar_radio'):
-			self.stats_bar_radio.configure(bg=self.current_theme["bg"],
-										  fg=self.current_theme["fg"],
-										  activebackground=self.current_theme["bg"],
-										  activeforeground=self.current_theme["fg"],
-										  selectcolor=self.current_theme["bg"],
-										  highlightbackground=self.current_theme["bg"],
-										  highlightcolor=self.current_theme["bg"])
+			self._set_colors(self.stats_bar_radio, bg=self.current_theme["bg"],
+										          fg=self.current_theme["fg"],
+										          activebackground=self.current_theme["bg"],
+										          activeforeground=self.current_theme["fg"],
+										          selectcolor=self.current_theme["bg"],
+										          highlightbackground=self.current_theme["bg"],
+										          highlightcolor=self.current_theme["bg"])
 		if hasattr(self, 'stats_line_radio'):
-			self.stats_line_radio.configure(bg=self.current_theme["bg"],
-										   fg=self.current_theme["fg"],
-										   activebackground=self.current_theme["bg"],
-										   activeforeground=self.current_theme["fg"],
-										   selectcolor=self.current_theme["bg"],
-										   highlightbackground=self.current_theme["bg"],
-										   highlightcolor=self.current_theme["bg"])
+			self._set_colors(self.stats_line_radio, bg=self.current_theme["bg"],
+										           fg=self.current_theme["fg"],
+										           activebackground=self.current_theme["bg"],
+										           activeforeground=self.current_theme["fg"],
+										           selectcolor=self.current_theme["bg"],
+										           highlightbackground=self.current_theme["bg"],
+										           highlightcolor=self.current_theme["bg"])
 		
 		# Theme Stats frames
 		if hasattr(self, 'stats_header'):
-			self.stats_header.configure(bg=self.current_theme["bg"])
+			self._set_colors(self.stats_header, bg=self.current_theme["bg"])
 		if hasattr(self, 'stats_type_frame'):
-			self.stats_type_frame.configure(bg=self.current_theme["bg"])
-		
-		# Theme task input widgets (category, priority, deadline)
-		# Increase font size to make comboboxes taller (match button height)
-		style.configure('TCombobox',
-					  fieldbackground=self.current_theme["entry_bg"],
-					  background=self.current_theme["button_bg"],
-					  foreground=self.current_theme["entry_fg"],
-					  arrowcolor=self.current_theme["button_fg"],
-					  borderwidth=1,
-					  relief="flat",
-					  font=("", 9),
-					  padding=3)
-		style.map('TCombobox',
-				 fieldbackground=[('readonly', self.current_theme["entry_bg"])],
-				 selectbackground=[('readonly', self.current_theme["button_bg"])],
-				 selectforeground=[('readonly', self.current_theme["button_fg"])],
-				 foreground=[('readonly', self.current_theme["entry_fg"])])
-		
-		# Theme deadline button
-		if hasattr(self, 'deadline_btn'):
-			self.deadline_btn.configure(bg=self.current_theme["button_bg"],
-									   fg=self.current_theme["button_fg"],
-									   activebackground=self.current_theme["button_bg"],
-									   activeforeground=self.current_theme["button_fg"])
+			self._set_colors(self.stats_type_frame, bg=self.current_theme["bg"])
 
 	def _ensure_category(self, name, open_state=True, color=None):
+		cat = self.store.ensure_category(name, open_state, color)
+		if color:
+			self.store.set_category_meta(name, color=color)
+		self._assign_category_color(cat)
 		if name in self.categories:
-			self._update_category_count(name)
-			self._update_category_choices()
+			# Existing category: counts are maintained on mutation and the
+			# choices already contain it
+			if color:
+				self._apply_category_tag(name)
 			return self.categories[name]
-		cat_id = self.tree.insert("", "end", text=name, values=("",), open=open_state)
+		cat_id = self.tree.insert("", "end", text=name, values=("",), open=cat.open)
 		self.categories[name] = cat_id
-		# Color assignment
-		if color:
-			self.category_colors[name] = color
-		if name not in self.category_colors:
-			self.category_colors[name] = self._color_palette[len(self.category_colors) % len(self._color_palette)]
+		self._count_labels.pop(name, None)
+		if cat.open:
+			self._materialized.add(name)
 		self._apply_category_tag(name)
 		self._update_category_count(name)
 		self._update_category_choices()
 		return cat_id
 
-	def _apply_category_tag(self, name):
-		color = self.category_colors.get(name)
+	def _assign_category_color(self, cat):
+		"""Give a category without a saved color the next palette color."""
+		if not cat.color:
+			index = list(self.store.categories).index(cat.name)
+			self.store.set_category_meta(cat.name, color=self._color_palette[index % len(self._color_palette)])
+
+	def _apply_category_tag(self, name, palette=None):
+		cat = self.store.categories.get(name)
+		color = cat.color if cat else None
 		if not color:
 			return
-		# Create a lighter background version of the color for better distinction
-		# Calculate a semi-transparent effect by blending with theme background
-		bg_color = self._blend_color_with_bg(color, 0.25)  # 25% opacity for more visible pastel
+		# Create a lighter background version of the color for better distinction:
+		# the color at 25% opacity over the theme background, from the theme's palette
+		bg_color = (palette or self._palette()).category_bg(color)
+		cat_id = self.categories.get(name)
+		if self._category_tags.get(name) == (cat_id, color, bg_color):
+			return  # Row already shows these colors
 		# Color the category row with both foreground and background
 		self.tree.tag_configure(f"cat:{name}", foreground=color, background=bg_color)
-		cat_id = self.categories.get(name)
 		if cat_id:
 			self.tree.item(cat_id, tags=(f"cat:{name}",))
+		self._category_tags[name] = (cat_id, color, bg_color)
 	
 	def _refresh_all_category_colors(self):
 		"""Refresh all category tag colors to ensure consistent 25% opacity."""
-		for cat_name in self.category_colors.keys():
-			self._apply_category_tag(cat_name)
+		palette = self._palette()
+		for cat_name in self.store.category_names():
+			self._apply_category_tag(cat_name, palette)
+
+	def _item_category(self, item):
+		"""Return the category name for a tree row (category or task)."""
+		task = self.store.get(item)
+		if task is not None:
+			return task.category
+		for name, cat_id in self.categories.items():
+			if cat_id == item:
+				return name
+		return None
+
+	def _task_values(self, task):
+		return (task.status, task.priority, task.deadline)
+
+	def _insert_task_row(self, task, index="end"):
+		"""Mirror a store task into the tree under its category row."""
+		cat_id = self._ensure_category(task.category)
+		if task.category not in self._materialized:
+			# Rows are created when the category is expanded
+			self._sync_placeholder(task.category)
+			return None
+		return self.tree.insert(cat_id, index, iid=task.id, text=task.text, values=self._task_values(task))
+
+	def _refresh_task_row(self, task):
+		"""Rewrite a task row's text and columns from the store."""
+		if self.tree.exists(task.id):
+			self.tree.item(task.id, text=task.text, values=self._task_values(task))
+
+	def _sync_category_rows(self, name):
+		"""Reorder a category's task rows to match the store order."""
+		cat_id = self.categories.get(name)
+		if not cat_id or name not in self._materialized:
+			return
+		ids = self.store.categories[name].task_ids
+		if list(self.tree.get_children(cat_id)) == ids:
+			return
+		for idx, task_id in enumerate(ids):
+			self.tree.move(task_id, cat_id, idx)
+
+	def _move_task_row(self, task):
+		"""Mirror a store move: reparent the row, or drop it if the target is not materialized."""
+		if not self.tree.exists(task.id):
+			self._insert_task_row(task, self.store.categories[task.category].task_ids.index(task.id))
+			return
+		if task.category in self._materialized:
+			index = self.store.categories[task.category].task_ids.index(task.id)
+			self.tree.move(task.id, self.categories[task.category], index)
+		else:
+			self.tree.delete(task.id)
+			self._row_tags.pop(task.id, None)
+			self._sync_placeholder(task.category)
+
+	def _delete_task_row(self, task_id):
+		if self.tree.exists(task_id):
+			self.tree.delete(task_id)
+		self._row_tags.pop(task_id, None)
+
+	def _placeholder_iid(self, cat_id):
+		return f"{cat_id}:placeholder"
+
+	def _sync_placeholder(self, name):
+		"""Give a collapsed, unmaterialized category an expand arrow iff it has tasks."""
+		cat_id = self.categories.get(name)
+		if not cat_id or name in self._materialized:
+			return
+		iid = self._placeholder_iid(cat_id)
+		if self.store.categories[name].task_ids:
+			if not self.tree.exists(iid):
+				self.tree.insert(cat_id, "end", iid=iid, text="…")
+		elif self.tree.exists(iid):
+			self.tree.delete(iid)
+
+	def _materialize_category(self, name):
+		"""Insert a category's task rows (with tags) the first time it is shown."""
+		cat_id = self.categories.get(name)
+		if not cat_id or name in self._materialized:
+			return
+		iid = self._placeholder_iid(cat_id)
+		if self.tree.exists(iid):
+			self.tree.delete(iid)
+		self._materialized.add(name)
+		tasks = self.store.tasks
+		for idx, task_id in enumerate(self.store.categories[name].task_ids):
+			task = tasks[task_id]
+			tag = self._row_tag_for(task, idx)
+			self._row_tags[task_id] = tag
+			self.tree.insert(cat_id, "end", iid=task_id, text=task.text,
+							 values=self._task_values(task), tags=(tag,) if tag else ())
+
+	def _dematerialize_category(self, name):
+		"""Drop the task rows of a collapsed category, keeping only a placeholder."""
+		self._collapse_timers.pop(name, None)
+		cat_id = self.categories.get(name)
+		if not cat_id or name not in self._materialized or self.tree.item(cat_id, "open"):
+			return
+		children = self.tree.get_children(cat_id)
+		if set(children) & set(self.tree.selection()):
+			return
+		if children:
+			self.tree.delete(*children)
+		for task_id in children:
+			self._row_tags.pop(task_id, None)
+		self._materialized.discard(name)
+		self._sync_placeholder(name)
+
+	def _on_category_open_state(self, is_open):
+		"""Remember expanded/collapsed state in the store and (de)materialize rows."""
+		item = self.tree.focus()
+		name = self._item_category(item)
+		cat = self.store.categories.get(name)
+		if cat is None or item != self.categories.get(name):
+			return
+		self.store.set_category_meta(name, open_state=is_open)
+		timer = self._collapse_timers.pop(name, None)
+		if timer:
+			self.root.after_cancel(timer)
+		if is_open:
+			self._materialize_category(name)
+		else:
+			self._collapse_timers[name] = self.root.after(
+				self.COLLAPSED_ROWS_TTL_MS, lambda n=name: self._dematerialize_category(n))
 	
 	def _blend_color_with_bg(self, color, alpha):
 		"""Blend a color with the current theme's listbox background at given alpha."""
-		try:
-			# Parse hex colors
-			if color.startswith('#'):
-				r1, g1, b1 = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
-			else:
-				return self.current_theme.get("listbox_bg", "#ffffff")
-			
-			bg = self.current_theme.get("listbox_bg", "#ffffff")
-			if bg.startswith('#'):
-				r2, g2, b2 = int(bg[1:3], 16), int(bg[3:5], 16), int(bg[5:7], 16)
-			else:
-				return bg
-			
-			# Blend: result = color * alpha + bg * (1 - alpha)
-			r = int(r1 * alpha + r2 * (1 - alpha))
-			g = int(g1 * alpha + g2 * (1 - alpha))
-			b = int(b1 * alpha + b2 * (1 - alpha))
-			return f"#{r:02x}{g:02x}{b:02x}"
-		except:
-			return self.current_theme.get("listbox_bg", "#ffffff")
+		return self._palette().blend(color, alpha)
+
+	def _row_tag_for(self, task, idx):
+		# Overdue takes precedence over oddrow (ISO dates compare as strings)
+		if task.deadline and not task.done and task.deadline < self._tag_today:
+			return 'overdue'
+		if idx % 2 == 1:
+			return 'oddrow'
+		return None
+
+	def _set_row_tag(self, task, tag):
+		"""Write a row's tag to Tk only when it differs from what is applied."""
+		if self._row_tags.get(task.id) == tag:
+			return
+		self._row_tags[task.id] = tag
+		self.tree.item(task.id, tags=(tag,) if tag else ())
+
+	def _retag_rows(self, name, start=0):
+		"""Retag a category's rows from index start (rows before it kept their parity)."""
+		cat = self.store.categories.get(name)
+		if cat is None or name not in self._materialized:
+			return
+		tasks = self.store.tasks
+		for idx in range(max(0, start), len(cat.task_ids)):
+			task = tasks[cat.task_ids[idx]]
+			self._set_row_tag(task, self._row_tag_for(task, idx))
+
+	def _retag_task(self, task):
+		"""Retag a single row after its status or deadline changed."""
+		cat = self.store.categories.get(task.category)
+		if cat is None or task.category not in self._materialized:
+			return
+		self._set_row_tag(task, self._row_tag_for(task, cat.task_ids.index(task.id)))
 
 	def _apply_alternating_rows(self):
 		"""Apply alternating row colors to all tasks for better readability."""
-		today = date.today()
-		for cat_id in self.categories.values():
-			children = self.tree.get_children(cat_id)
-			for idx, child in enumerate(children):
-				current_tags = list(self.tree.item(child, "tags"))
-				# Remove old oddrow and overdue tags if present
-				if 'oddrow' in current_tags:
-					current_tags.remove('oddrow')
-				if 'overdue' in current_tags:
-					current_tags.remove('overdue')
-				
-				# Check if task is overdue
-				deadline_str = self.tree.set(child, "#3")
-				status = self.tree.set(child, "#1")
-				is_completed = status in ["[x]", "[✓]"]
-				is_overdue = False
-				
-				if deadline_str and not is_completed:
-					try:
-						deadline_date = date.fromisoformat(deadline_str)
-						if deadline_date < today:
-							is_overdue = True
-					except:
-						pass
-				
-				# Add tags in priority order (overdue takes precedence over oddrow)
-				if is_overdue:
-					current_tags.append('overdue')
-				elif idx % 2 == 1:
-					current_tags.append('oddrow')
-				
-				self.tree.item(child, tags=tuple(current_tags))
+		for name in self.store.category_names():
+			self._retag_rows(name)
+
+	def _schedule_day_rollover(self):
+		"""Arrange for _on_day_rollover to run just after the next midnight."""
+		now = datetime.now()
+		midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+		delay_ms = int((midnight - now).total_seconds() * 1000) + 1000
+		self._rollover_after_id = self.root.after(delay_ms, self._on_day_rollover)
+
+	def _on_day_rollover(self):
+		"""Flip rows that became overdue since the last check, using the deadline index."""
+		old_today = self._tag_today
+		self._tag_today = date.today().isoformat()
+		if self._tag_today > old_today:
+			for task in self.store.tasks_due_between(old_today, self._tag_today):
+				if not task.done:
+					self._retag_task(task)
+		self._schedule_day_rollover()
 
 	def _update_category_count(self, name):
 		cat_id = self.categories.get(name)
 		if not cat_id:
 			return
-		children = self.tree.get_children(cat_id)
-		total = len(children)
-		done = 0
-		for ch in children:
-			vals = self.tree.item(ch).get("values") or ["", ""]
-			if len(vals) > 0 and vals[0] == "[x]":
-				done += 1
-		label = f"{name} ({done}/{total})"
+		counts = self.store.category_counts(name)
+		if self._count_labels.get(name) == counts:
+			return
+		if counts[1] == 0 or self._count_labels.get(name, (0, 0))[1] == 0:
+			self._sync_placeholder(name)
+		self._count_labels[name] = counts
+		label = f"{name} ({counts[0]}/{counts[1]})"
 		# Keep tag when updating text
 		cur_tags = self.tree.item(cat_id, "tags")
 		self.tree.item(cat_id, text=label, tags=cur_tags)
@@ -5263,12 +6091,9 @@ class TodoApp:
 		selection = self.tree.selection()
 		if not selection:
 			return
-		sel = selection[0]
-		parent = self.tree.parent(sel)
-		if parent:
-			cat = self.tree.item(parent, "text").split(" (")[0]
-		else:
-			cat = self.tree.item(sel, "text").split(" (")[0]
+		cat = self._item_category(selection[0])
+		if not cat:
+			return
 		self.category_var.set(cat)
 		self._last_category = cat
 
@@ -5315,14 +6140,16 @@ class TodoApp:
 		item = self._selected_item()
 		if not item or self.tree.parent(item):
 			return
-		cat_label = self.tree.item(item, "text")
-		cat_name = cat_label.split(" (")[0]
-		current_color = self.category_colors.get(cat_name, "#000000")
+		cat_name = self._item_category(item)
+		cat = self.store.categories.get(cat_name)
+		if cat is None:
+			return
+		current_color = cat.color or "#000000"
 		
 		# Open color picker
 		color = colorchooser.askcolor(initialcolor=current_color, parent=self.root, title="Choose Category Color")
 		if color and color[1]:  # color[1] is the hex string
-			self.category_colors[cat_name] = color[1]
+			self.store.set_category_meta(cat_name, color=color[1])
 			self._apply_category_tag(cat_name)
 
 	def _selected_item(self):
@@ -5334,21 +6161,28 @@ class TodoApp:
 
 	def _priority_symbol(self, priority):
 		# Return the priority text directly (Low, Medium, High)
-		return priority if priority in ["High", "Medium", "Low"] else "Medium"
+		return normalize_priority(priority)
 
 	def _priority_order(self, priority):
-		order = {"High": 0, "Medium": 1, "Low": 2}
-		return order.get(priority, 1)
+		return priority_order(priority)
 
 	def _today_str(self):
 		return date.today().isoformat()
 
 	def _inc_daily(self, day_str):
-		self.stats_daily[day_str] = self.stats_daily.get(day_str, 0) + 1
+		count = completion_stats.increment(self.stats_daily, day_str)
+		self._stats_day_changed(day_str)
+		self._backend_append({"op": "stats", "day": day_str, "count": count})
 
-	def _dec_daily(self, day_str):
-		if day_str in self.stats_daily:
-			self.stats_daily[day_str] = max(0, self.stats_daily.get(day_str, 0) - 1)
+	def _daily_series(self):
+		"""stats_daily as a DailySeries (built on first use, then kept in step)."""
+		if self._stats_series is None:
+			self._stats_series = completion_stats.DailySeries(self.stats_daily)
+		return self._stats_series
+
+	def _stats_day_changed(self, day_str):
+		if self._stats_series is not None:
+			self._stats_series.set(day_str, self.stats_daily.get(day_str, 0))
 
 	def _calendar_prev(self):
 		"""Navigate to previous week or month."""
@@ -5390,13 +6224,13 @@ class TodoApp:
 				self._render_calendar_weekly()
 
 	def _stats_prev_day(self):
-		"""Move stats center one day back and refresh graph."""
-		self.stats_center_date = getattr(self, 'stats_center_date', date.today()) - timedelta(days=1)
+		"""Move the stats range one step (a day, or a week for long ranges) back and refresh graph."""
+		self.stats_center_date = getattr(self, 'stats_center_date', date.today()) - timedelta(days=self._stats_pan_days())
 		self._update_stats_view()
 
 	def _stats_next_day(self):
-		"""Move stats center one day forward and refresh graph."""
-		self.stats_center_date = getattr(self, 'stats_center_date', date.today()) + timedelta(days=1)
+		"""Move the stats range one step (a day, or a week for long ranges) forward and refresh graph."""
+		self.stats_center_date = getattr(self, 'stats_center_date', date.today()) + timedelta(days=self._stats_pan_days())
 		self._update_stats_view()
 
 	def _stats_today(self):
@@ -5404,26 +6238,68 @@ class TodoApp:
 		self.stats_center_date = date.today()
 		self._update_stats_view()
 	
+	def _stats_range(self):
+		"""Days shown in the stats graph."""
+		try:
+			return int(self.stats_range_var.get().split()[0])
+		except (AttributeError, ValueError, IndexError):
+			return 7
+
+	def _stats_pan_days(self):
+		return 1 if self._stats_range() <= 7 else 7
+
+	def _stats_window(self):
+		"""(first day, day after the last) of the graph: up to the center date plus the next 3 days."""
+		center = getattr(self, 'stats_center_date', date.today())
+		return center - timedelta(days=self._stats_range() - 4), center + timedelta(days=4)
+
 	def _update_stats_view(self):
-		# Draw 7-day bar/line graph
+		# Draw the completion graph for the chosen range
 		if hasattr(self, 'stats_canvas') and self.stats_canvas:
-			self._render_stats_7day_graph()
-			# Update nav label with range centered on current center date
+			self._render_stats_graph()
+			# Update nav label with the range around the current center date
 			if hasattr(self, 'stats_center_date') and hasattr(self, 'stats_center_label'):
-				center = self.stats_center_date
-				start = center - timedelta(days=3)
-				end = center + timedelta(days=3)
+				start, end = self._stats_window()
+				end -= timedelta(days=1)
 				range_text = f"{start.strftime('%b %d')} - {end.strftime('%b %d, %Y')}"
+				if start.year != end.year:
+					range_text = f"{start.strftime('%b %d, %Y')} - {end.strftime('%b %d, %Y')}"
 				self.stats_center_label.config(text=range_text)
+			self._update_stats_summary()
 
-	def _render_stats_7day_graph(self):
-		"""Render a 7-day graph (bar or line) showing task completions."""
+	def _update_stats_summary(self):
+		"""Totals for the shown range plus streaks and this week/month/year, from prefix sums."""
+		series = self._daily_series()
+		start, end = self._stats_window()
+		today = date.today()
+		days = (end - start).days
+		total = series.total(start, end)
+		current, longest = series.streaks(today)
+		tomorrow = today + timedelta(days=1)
+		week = series.total(today - timedelta(days=today.weekday()), tomorrow)
+		month = series.total(today.replace(day=1), tomorrow)
+		year = series.total(today.replace(month=1, day=1), tomorrow)
+		self.stats_title_label.config(text=f"Task Completion ({days} Days)")
+		self.stats_hint_label.config(text=f"Past {days - 4} / Today / Next 3" + (" · weekly totals" if days >= 365 else ""))
+		self.stats_summary_label.config(
+			text=f"{total} completed in range ({total / days:.1f}/day)   ·   streak {current} day(s), best {longest}"
+				 f"   ·   this week {week}, this month {month}, this year {year}")
+
+	def _render_stats_graph(self):
+		"""Render the completion graph (bar or line) for the chosen range.
+
+		Values come from the DailySeries: a slice of days, or weekly rollups
+		for a year. Ranges of a month or more also get a 7-day moving average.
+		The canvas keeps three layers: "frame" (background and axes, redrawn
+		when the size or theme changes), "yaxis" (ticks, redrawn when the
+		scale changes) and "series" (bars/line, labels, average). Panning
+		only replaces the series layer.
+		"""
 		canvas = self.stats_canvas
-		canvas.delete("all")
-		# Draw background gradient if configured
 		bg = self.current_theme.get("bg", "#ffffff")
 		bg_grad = self.current_theme.get("bg_gradient")
-		self._draw_canvas_gradient(canvas, bg, bg_grad, vertical=True)
+		fg = self.current_theme.get("fg", "#000000")
+		accent = self.current_theme.get("button_bg", "#4a90e2")
 		
 		w = canvas.winfo_width() or canvas.winfo_reqwidth()
 		h = canvas.winfo_height() or 300
@@ -5431,23 +6307,37 @@ class TodoApp:
 		inner_w = max(1, w - 2 * margin)
 		inner_h = max(1, h - 2 * margin)
 		
-		# Get 7-day window centered on stats_center_date (center-3 .. center+3)
-		center_day = getattr(self, 'stats_center_date', date.today())
-		today = date.today()
-		days = [center_day + timedelta(days=i) for i in range(-3, 4)]
-		
-		# Get theme colors
-		fg = self.current_theme.get("fg", "#000000")
-		accent = self.current_theme.get("button_bg", "#4a90e2")
+		# Blended with the theme's listbox_bg, so it is part of the key too
 		grid = self._blend_color_with_bg(fg, 0.15)
+		frame_key = (w, h, bg, bg_grad, fg, grid)
+		if getattr(self, '_stats_frame_key', None) != frame_key:
+			self._stats_frame_key = frame_key
+			self._stats_axis_key = None
+			canvas.delete("all")
+			# Draw background gradient if configured
+			self._draw_canvas_gradient(canvas, bg, bg_grad, vertical=True)
+			# Draw axes
+			canvas.create_line(margin, h - margin, w - margin, h - margin, fill=fg, width=2, tags="frame")
+			canvas.create_line(margin, margin, margin, h - margin, fill=fg, width=2, tags="frame")
+		canvas.delete("series")
+		
+		# Days (or weeks) from the window start up to center+3
+		series = self._daily_series()
+		start, end = self._stats_window()
+		today = date.today()
+		weekly = (end - start).days >= 365
+		if weekly:
+			rows = series.rollup("week", start, end)
+			days = [first for first, _ in rows]
+			vals = [total for _, total in rows]
+			current = today - timedelta(days=today.weekday())
+		else:
+			days = [start + timedelta(days=i) for i in range((end - start).days)]
+			vals = series.window(start, len(days))
+			current = today
+		average = series.moving_average(start, len(days)) if len(days) >= 30 and not weekly else None
 		
-		# Get data
-		vals = [self.stats_daily.get(d.isoformat(), 0) for d in days]
 		max_v = max(vals) if vals and max(vals) > 0 else 10
-		
-		# Draw axes
-		canvas.create_line(margin, h - margin, w - margin, h - margin, fill=fg, width=2)
-		canvas.create_line(margin, margin, margin, h - margin, fill=fg, width=2)
 
 		# Y-axis ticks and labels (left side)
 		# Determine nice step (aim for ~4 ticks)
@@ -5461,20 +6351,36 @@ class TodoApp:
 			step = 10
 		else:
 			step = max(1, (max_v // 5))
-		# Extend top to next step for clean headroom
+		# Extend top to next step for clean headroom; bars, line and average all scale to it
 		axis_max = ((max_v + step - 1) // step) * step if max_v > 0 else step
-		for yv in range(0, axis_max + 1, step):
-			frac = (yv / axis_max) if axis_max > 0 else 0
-			y = h - margin - frac * inner_h
-			# grid line
-			canvas.create_line(margin, y, w - margin, y, fill=grid, width=1, dash=(2,4))
-			# tick
-			canvas.create_line(margin - 5, y, margin, y, fill=fg, width=1)
-			# label
-			canvas.create_text(margin - 8, y, text=str(yv), fill=fg, font=("Arial", 9), anchor="e")
+		if self._stats_axis_key != (axis_max, step):
+			self._stats_axis_key = (axis_max, step)
+			canvas.delete("yaxis")
+			for yv in range(0, axis_max + 1, step):
+				frac = (yv / axis_max) if axis_max > 0 else 0
+				y = h - margin - frac * inner_h
+				# grid line
+				canvas.create_line(margin, y, w - margin, y, fill=grid, width=1, dash=(2,4), tags="yaxis")
+				# tick
+				canvas.create_line(margin - 5, y, margin, y, fill=fg, width=1, tags="yaxis")
+				# label
+				canvas.create_text(margin - 8, y, text=str(yv), fill=fg, font=("Arial", 9), anchor="e", tags="yaxis")
+		
+		def y_of(value):
+			return h - margin - (value / axis_max) * inner_h
 		
 		spacing = inner_w / len(days)
 		graph_type = self.stats_graph_type.get()
+		# Long ranges: label about ten days and skip per-value text
+		label_every = max(1, -(-len(days) // 10))
+		show_values = len(days) <= 31
+		
+		def date_label(i, day):
+			if day == current:
+				return "This week" if weekly else "Today"
+			if i % label_every:
+				return None
+			return day.strftime('%m/%d')
 		
 		if graph_type == "bar":
 			# Draw bars
@@ -5482,43 +6388,43 @@ class TodoApp:
 			
 			for i, (day, val) in enumerate(zip(days, vals)):
 				x_center = margin + i * spacing + spacing / 2
-				bar_h = (val / max_v) * inner_h if max_v > 0 else 0
 				
 				x0 = x_center - bar_width / 2
-				y0 = h - margin - bar_h
+				y0 = y_of(val)
 				x1 = x_center + bar_width / 2
 				y1 = h - margin
 				
 				# Draw bar
-				color = accent if day == today else self.current_theme.get("listbox_bg", "#cccccc")
-				canvas.create_rectangle(x0, y0, x1, y1, fill=color, outline=fg, width=1)
+				color = accent if day == current else self.current_theme.get("listbox_bg", "#cccccc")
+				canvas.create_rectangle(x0, y0, x1, y1, fill=color, outline=fg, width=1 if show_values else 0,
+										tags="series")
 				
 				# Draw value on top
-				if val > 0:
-					canvas.create_text(x_center, y0 - 10, text=str(val), fill=fg, font=("Arial", 10, "bold"))
+				if val > 0 and show_values:
+					canvas.create_text(x_center, y0 - 10, text=str(val), fill=fg, font=("Arial", 10, "bold"),
+									   tags="series")
 				
 				# Draw date label
-				label = day.strftime('%m/%d')
-				if day == today:
-					label = "Today"
-				canvas.create_text(x_center, h - margin + 15, text=label, fill=fg, font=("Arial", 9))
+				label = date_label(i, day)
+				if label:
+					canvas.create_text(x_center, h - margin + 15, text=label, fill=fg, font=("Arial", 9),
+									   tags="series")
 		else:
 			# Draw line graph
-			# Use axis_max for scaling to match y-axis
 			points = []
 			for i, (day, val) in enumerate(zip(days, vals)):
 				x_center = margin + i * spacing + spacing / 2
-				frac = (val / axis_max) if axis_max > 0 else 0
-				y_val = h - margin - frac * inner_h
+				y_val = y_of(val)
 				points.append((x_center, y_val))
 				# Date label
-				label = day.strftime('%m/%d')
-				if day == today:
-					label = "Today"
-				canvas.create_text(x_center, h - margin + 15, text=label, fill=fg, font=("Arial", 9))
+				label = date_label(i, day)
+				if label:
+					canvas.create_text(x_center, h - margin + 15, text=label, fill=fg, font=("Arial", 9),
+									   tags="series")
 				# Optional value labels near points
-				if val > 0:
-					canvas.create_text(x_center, y_val - 12, text=str(val), fill=fg, font=("Arial", 9))
+				if val > 0 and show_values:
+					canvas.create_text(x_center, y_val - 12, text=str(val), fill=fg, font=("Arial", 9),
+									   tags="series")
 
 			# Subtle fill under the line
 			if points:
@@ -5528,19 +6434,29 @@ class TodoApp:
 				coords = []
 				for x, y in poly:
 					coords.extend([x, y])
-				canvas.create_polygon(*coords, fill=fill_color, outline="")
+				canvas.create_polygon(*coords, fill=fill_color, outline="", tags="series")
 
-			# Dotted line and point markers
+			# Dotted line (one item for the whole series) and point markers
 			if len(points) > 1:
-				for i in range(len(points) - 1):
-					canvas.create_line(points[i][0], points[i][1], points[i+1][0], points[i+1][1],
-										 fill=accent, width=2, dash=(3, 4), smooth=True)
+				coords = [c for point in points for c in point]
+				canvas.create_line(*coords, fill=accent, width=2, dash=(3, 4), tags="series")
 			# Points on top
-			for i, (day, val) in enumerate(zip(days, vals)):
-				x, y = points[i]
-				r = 4
-				pt_color = accent if day == today else fg
-				canvas.create_oval(x - r, y - r, x + r, y + r, fill=pt_color, outline=fg, width=1)
+			if show_values:
+				for i, (day, val) in enumerate(zip(days, vals)):
+					x, y = points[i]
+					r = 4
+					pt_color = accent if day == current else fg
+					canvas.create_oval(x - r, y - r, x + r, y + r, fill=pt_color, outline=fg, width=1,
+									   tags="series")
+		
+		# 7-day moving average as one line
+		if average:
+			coords = []
+			for i, avg in enumerate(average):
+				coords.extend([margin + i * spacing + spacing / 2, y_of(avg)])
+			canvas.create_line(*coords, fill=fg, width=2, tags="series")
+			canvas.create_text(w - margin, margin - 10, text="— 7-day average", fill=fg, font=("Arial", 9),
+							   anchor="e", tags="series")
 	
 	def _render_calendar_weekly(self):
 		"""Render weekly calendar view with deadlines."""
@@ -5660,22 +6576,12 @@ class TodoApp:
 			y = margin
 			canvas.create_text(x + cell_w/2, y + cell_h/4, text=day, fill=fg, font=("Arial", 9, "bold"))
 		
-		# Collect tasks with deadlines for this month
+		# Collect tasks with deadlines for this month (range query on the deadline index)
 		deadline_tasks = {}  # date_str -> [task_texts]
-		for cat_id in self.categories.values():
-			for child in self.tree.get_children(cat_id):
-				meta = self.task_meta.get(child, {})
-				deadline = meta.get("deadline")
-				if deadline:
-					try:
-						deadline_date = date.fromisoformat(deadline)
-						if deadline_date.year == year and deadline_date.month == month:
-							if deadline not in deadline_tasks:
-								deadline_tasks[deadline] = []
-							task_text = self.tree.item(child, "text")
-							deadline_tasks[deadline].append(task_text[:15])  # Truncate for display
-					except:
-						pass
+		month_start = date(year, month, 1)
+		month_end = month_start + timedelta(days=num_days)
+		for task in self._task_query().tasks_due_between(month_start.isoformat(), month_end.isoformat()):
+			deadline_tasks.setdefault(task.deadline, []).append(task.text[:15])  # Truncate for display
 		
 		# Draw calendar days
 		row = 1
@@ -5723,13 +6629,7 @@ class TodoApp:
 		if not category:
 			selection = self.tree.selection()
 			if selection:
-				sel = selection[0]
-				parent = self.tree.parent(sel)
-				if parent:  # a task is selected
-					cat_label = self.tree.item(parent, "text").split(" (")[0]
-					category = cat_label
-				else:  # a category is selected
-					category = self.tree.item(sel, "text").split(" (")[0]
+				category = self._item_category(selection[0]) or ""
 			elif getattr(self, '_last_category', None):
 				category = self._last_category
 		if not category:
@@ -5737,25 +6637,24 @@ class TodoApp:
 		priority = self.priority_var.get() or "Medium"
 		if not text:
 			return
-		cat_id = self._ensure_category(category)
-		priority_display = self._priority_symbol(priority)
+		self._ensure_category(category)
 		deadline_val = self.add_deadline_var.get().strip()
 		# Extract actual date if not the default button text
 		deadline = deadline_val if deadline_val and deadline_val != "📅 Deadline" else ""
-		item = self.tree.insert(cat_id, "end", text=text, values=("[ ]", priority_display, deadline))
-		# Store priority and deadline in item tags
-		self.tree.set(item, "#1", "[ ]")
-		self.tree.set(item, "#2", priority_display)
-		self.tree.set(item, "#3", deadline)
-		# Store deadline in task metadata
-		if deadline:
-			if item not in self.task_meta:
-				self.task_meta[item] = {}
-			self.task_meta[item]["deadline"] = deadline
-		# Sort tasks by priority within category
-		self._sort_category_by_priority(cat_id)
-		# Apply alternating row colors
-		self._apply_alternating_rows()
+		task = self.store.add_task(category, text, priority=self._priority_symbol(priority), deadline=deadline)
+		# Sort tasks by priority within category; if the other rows keep their
+		# order only the new row is inserted and rows below it retagged
+		ids = self.store.categories[category].task_ids
+		before = ids[:-1]
+		self.store.sort_category(category)
+		idx = ids.index(task.id)
+		if ids[:idx] + ids[idx + 1:] == before:
+			self._insert_task_row(task, idx)
+			self._retag_rows(category, idx)
+		else:
+			self._insert_task_row(task)
+			self._sync_category_rows(category)
+			self._retag_rows(category)
 		# Clear inputs, keep last used category for faster subsequent adds
 		self.entry.delete(0, "end")
 		# Reset placeholder
@@ -5768,9 +6667,6 @@ class TodoApp:
 		# keep category_var as-is to allow rapid multiple entries
 		self.priority_var.set("Medium")
 		self._update_category_count(category)
-		
-		# Refresh current view if not in Tree mode
-		self._refresh_current_view()
 
 	def _seed_test_tasks(self):
 		"""Populate the app with a set of demo categories and tasks, plus sample stats."""
@@ -5806,58 +6702,35 @@ class TodoApp:
 		}
 		
 		for cat, items in cats.items():
-			cat_id = self._ensure_category(cat)
+			self._ensure_category(cat)
 			for (text, prio, deadline_offset, completed_offset) in items:
 				deadline = ""
 				if isinstance(deadline_offset, int):
 					deadline = (date.today() + timedelta(days=deadline_offset)).isoformat()
-				prio_display = self._priority_symbol(prio)
-				status = "[ ]"
+				completed_date = None
 				if isinstance(completed_offset, int):
-					status = "[x]"
-				item = self.tree.insert(cat_id, "end", text=text, values=(status, prio_display, deadline))
-				# metadata
-				if item not in self.task_meta:
-					self.task_meta[item] = {}
-				if deadline:
-					self.task_meta[item]["deadline"] = deadline
-				if status == "[x]":
-					day_str = (date.today() + timedelta(days=completed_offset)).isoformat()
-					self.task_meta[item]["last_completed_date"] = day_str
-					self._inc_daily(day_str)
+					completed_date = (date.today() + timedelta(days=completed_offset)).isoformat()
+					self._inc_daily(completed_date)
+				task = self.store.add_task(cat, text, done=completed_date is not None,
+										   priority=self._priority_symbol(prio), deadline=deadline,
+										   completed_date=completed_date)
+				self._insert_task_row(task)
 			# Update counts per category after inserts
 			self._update_category_count(cat)
 		
 		# Refresh visuals
-		self._apply_alternating_rows()
+		for cat in cats:
+			self._retag_rows(cat)
 		self._refresh_all_category_colors()
 		self._update_stats_view()
 		self._update_calendar_view()
 		self._demo_seeded = True
 
-	def _sort_category_by_priority(self, cat_id, reverse=False):
+	def _sort_category_by_priority(self, name, reverse=False):
 		"""Sort tasks within a category by priority (High -> Medium -> Low, or reverse)"""
-		children = list(self.tree.get_children(cat_id))
-		if not children:
-			return
-		# Get task data with priority
-		tasks_data = []
-		for child in children:
-			text = self.tree.item(child, "text")
-			vals = self.tree.item(child).get("values") or ["[ ]", "Medium"]
-			status = vals[0] if len(vals) > 0 else "[ ]"
-			priority = vals[1] if len(vals) > 1 else "Medium"
-			# Priority is now text: "High", "Medium", or "Low"
-			if priority not in ["High", "Medium", "Low"]:
-				priority = "Medium"
-			tasks_data.append((child, text, status, priority))
-		
-		# Sort by priority order
-		tasks_data.sort(key=lambda x: self._priority_order(x[3]), reverse=reverse)
-		
-		# Reinsert in sorted order
-		for idx, (child, text, status, priority) in enumerate(tasks_data):
-			self.tree.move(child, cat_id, idx)
+		self.store.sort_category(name, reverse=reverse)
+		self._sync_category_rows(name)
+		self._retag_rows(name)
 
 	def _sort_categories_alphabetically(self):
 		"""Toggle between A->Z and Z->A alphabetical category sort"""
@@ -5872,44 +6745,13 @@ class TodoApp:
 			# A to Z
 			self.tree.heading("#0", text="Tasks ▲")
 		
-		# Get all categories with their current data
-		cat_data = []
-		for name, cat_id in list(self.categories.items()):
-			# Get category info
-			cat_text = self.tree.item(cat_id, "text")
-			cat_open = self.tree.item(cat_id, "open")
-			
-			# Get all tasks in this category
-			tasks = []
-			for child_id in self.tree.get_children(cat_id):
-				task_text = self.tree.item(child_id, "text")
-				task_values = self.tree.item(child_id, "values")
-				tasks.append((task_text, task_values))
-			
-			cat_data.append((name, cat_text, cat_open, tasks))
-		
-		# Sort categories alphabetically by name
-		cat_data.sort(key=lambda x: x[0].lower(), reverse=self._category_sort_reverse)
-		
-		# Delete all categories from tree
-		for cat_id in self.categories.values():
-			self.tree.delete(cat_id)
-		
-		# Re-insert categories in alphabetical order
-		self.categories.clear()
-		for name, cat_text, cat_open, tasks in cat_data:
-			cat_id = self.tree.insert("", "end", text=cat_text, values=("",), open=cat_open)
-			self.categories[name] = cat_id
-			
-			# Re-insert all tasks for this category
-			for task_text, task_values in tasks:
-				self.tree.insert(cat_id, "end", text=task_text, values=task_values)
-			
-			# Reapply category tag for colors
-			self._apply_category_tag(name)
-		
-		# Apply alternating row colors after rebuilding tree
-		self._apply_alternating_rows()
+		# Sort categories alphabetically by name and move the existing rows
+		names = sorted(self.store.category_names(), key=str.lower, reverse=self._category_sort_reverse)
+		self.store.reorder_categories(names)
+		for idx, name in enumerate(names):
+			cat_id = self.categories.get(name)
+			if cat_id:
+				self.tree.move(cat_id, "", idx)
 	
 	def _sort_all_by_priority(self):
 		"""Toggle between High->Low and Low->High priority sort"""
@@ -5924,12 +6766,9 @@ class TodoApp:
 			# High to Low
 			self.tree.heading("priority", text="Priority ▼")
 		
-		# Sort all categories
-		for name, cat_id in self.categories.items():
-			self._sort_category_by_priority(cat_id, reverse=self._priority_sort_reverse)
-		
-		# Apply alternating row colors after sorting
-		self._apply_alternating_rows()
+		# Sort all categories (rows are retagged as each category is sorted)
+		for name in self.store.category_names():
+			self._sort_category_by_priority(name, reverse=self._priority_sort_reverse)
 
 
 	# Removed index-based selection; using Treeview selection via _selected_item
@@ -5938,28 +6777,27 @@ class TodoApp:
 		item = self._selected_item()
 		if not item:
 			return
-		parent = self.tree.parent(item)
-		if not parent:
+		task = self.store.get(item)
+		if task is None:
 			# Category node
-			label = self.tree.item(item, "text")
-			name = label.split(" (")[0]
+			name = self._item_category(item)
 			if messagebox.askyesno("Remove Category", f"Remove category '{name}' and all its tasks?"):
 				self.tree.delete(item)
 				self.categories.pop(name, None)
-				self.category_colors.pop(name, None)
+				self._count_labels.pop(name, None)
+				self._materialized.discard(name)
+				for removed in self.store.remove_category(name):
+					self._row_tags.pop(removed.id, None)
 				self._update_category_choices()
 			return
 		# Task node
-		cat_id = parent
-		cat_label = self.tree.item(cat_id, "text").split(" (")[0]
 		if messagebox.askyesno("Remove", "Remove selected task?"):
-			self.tree.delete(item)
-			self._update_category_count(cat_label)
-			# Apply alternating rows after removing task
-			self._apply_alternating_rows()
-			
-			# Refresh current view if not in Tree mode
-			self._refresh_current_view()
+			idx = self.store.categories[task.category].task_ids.index(task.id)
+			self.store.remove_task(task.id)
+			self._delete_task_row(task.id)
+			self._update_category_count(task.category)
+			# Only rows below the removed one change parity
+			self._retag_rows(task.category, idx)
 
 	def _update_deadline_display(self):
 		"""Update the deadline button text based on whether a date is selected"""
@@ -6091,38 +6929,51 @@ class TodoApp:
 		item = self._selected_item()
 		if not item:
 			return
-		parent = self.tree.parent(item)
-		if not parent:
+		task = self.store.get(item)
+		if task is None:
 			# Edit category name only
-			old_label = self.tree.item(item, "text")
-			old_name = old_label.split(" (")[0]
+			old_name = self._item_category(item)
 			new_name = simpledialog.askstring("Edit category", "New category name:", initialvalue=old_name, parent=self.root)
 			if new_name:
 				new_name = new_name.strip() or old_name
-				# Update mapping
+				if new_name == old_name:
+					return
+				self.store.rename_category(old_name, new_name)
 				self.categories.pop(old_name, None)
-				self.categories[new_name] = item
-				# Preserve color
-				if old_name in self.category_colors:
-					self.category_colors[new_name] = self.category_colors.pop(old_name)
+				self._count_labels.pop(old_name, None)
+				self._count_labels.pop(new_name, None)
+				was_materialized = old_name in self._materialized
+				self._materialized.discard(old_name)
+				timer = self._collapse_timers.pop(old_name, None)
+				if timer:
+					self.root.after_cancel(timer)
+				if new_name in self.categories:
+					# Merge into the existing category row (its old rows go with it)
+					for task_id in self.tree.get_children(item):
+						self._row_tags.pop(task_id, None)
+					self.tree.delete(item)
+					if new_name in self._materialized:
+						for idx, task in enumerate(self.store.tasks_in(new_name)):
+							if not self.tree.exists(task.id):
+								self._insert_task_row(task, idx)
+					self._sync_category_rows(new_name)
+					self._sync_placeholder(new_name)
+				else:
+					self.categories[new_name] = item
+					if was_materialized:
+						self._materialized.add(new_name)
 				# Update label and tags/colors
 				self._apply_category_tag(new_name)
 				self._update_category_count(new_name)
 				self._update_category_choices()
+				self._retag_rows(new_name)
 			return
 		
 		# Editing a task - unified dialog with all fields
-		old_text = self.tree.item(item, "text")
-		cat_label = self.tree.item(parent, "text")
-		old_cat = cat_label.split(" (")[0]
-		vals = self.tree.item(item).get("values") or ["[ ]", "Medium", ""]
-		old_priority = vals[1] if len(vals) > 1 else "Medium"
-		# Priority is now stored as text directly ("High", "Medium", "Low")
-		if old_priority not in ["High", "Medium", "Low"]:
-			# Handle legacy arrow symbols if any exist
-			priority_map = {"⬆️": "High", "➡️": "Medium", "⬇️": "Low"}
-			old_priority = priority_map.get(old_priority, "Medium")
-		old_deadline = vals[2] if len(vals) > 2 else ""
+		old_text = task.text
+		old_cat = task.category
+		old_priority = task.priority
+		old_deadline = task.deadline
 		
 		# Create unified edit dialog
 		edit_window = tk.Toplevel(self.root)
@@ -6361,90 +7212,71 @@ class TodoApp:
 				return
 		
 		# Update text, priority, and deadline
-		self.tree.item(item, text=new_text)
-		current_vals = list(self.tree.item(item).get("values") or ["[ ]", "➡️", ""])
-		while len(current_vals) < 3:
-			current_vals.append("")
-		current_vals[1] = new_priority_symbol
-		current_vals[2] = new_deadline
-		self.tree.item(item, values=tuple(current_vals))
-		
-		# Store deadline in task metadata
-		if item not in self.task_meta:
-			self.task_meta[item] = {}
-		self.task_meta[item]["deadline"] = new_deadline if new_deadline else None
+		self.store.update_task(task.id, text=new_text, priority=new_priority_symbol, deadline=new_deadline)
+		self._refresh_task_row(task)
 		
 		# Move category if changed
 		if new_cat != old_cat:
-			new_cat_id = self._ensure_category(new_cat)
-			self.tree.move(item, new_cat_id, "end")
-			self._sort_category_by_priority(new_cat_id)
+			self._ensure_category(new_cat)
+			old_idx = self.store.categories[old_cat].task_ids.index(task.id)
+			self.store.move_task(task.id, new_cat)
+			self._move_task_row(task)
+			self._sort_category_by_priority(new_cat)
+			self._retag_rows(old_cat, old_idx)
 			self._update_category_count(old_cat)
 			self._update_category_count(new_cat)
 			self._update_category_choices()
 		else:
-			# Re-sort if priority changed
-			self._sort_category_by_priority(parent)
+			# Re-sort if priority changed (retags the category)
+			self._sort_category_by_priority(old_cat)
 			self._update_category_count(old_cat)
 		
-		# Apply alternating rows after editing
-		self._apply_alternating_rows()
-		
 		# Refresh stats and calendar views to show updated deadlines
 		self._update_stats_view()
 		self._update_calendar_view()
 
 	def toggle_complete(self):
-		# Track XP gains
-		xp_gained = 0
-		
 		selection = self.tree.selection()
 		if not selection:
 			return
 		
-		def set_status_and_stats(it, new_val):
-			# Update tree values - preserve all columns including deadline
-			vals = self.tree.item(it).get("values") or ["[ ]", "➡️", ""]
-			priority = vals[1] if len(vals) > 1 else "➡️"
-			deadline = vals[2] if len(vals) > 2 else ""
-			self.tree.item(it, values=(new_val, priority, deadline))
-			# Stats adjustment
-			if new_val == "[x]":
-				# Award XP for completing task
-				nonlocal xp_gained
-				xp_gained += self.XP_PER_TASK
-				# mark completion today
-				meta = self.task_meta.setdefault(it, {"last_completed_date": None})
-				# If previously completed on another day and now re-completing, we don't auto-decrement past day here
-				# We only set the new completed date and increment today's count
-				meta["last_completed_date"] = self._today_str()
-				self._inc_daily(meta["last_completed_date"])
+		changes = []  # (task id, new done state)
+		for item in selection:
+			task = self.store.get(item)
+			if task is None:
+				# category node: complete all, or reopen all if already complete
+				tasks = self.store.tasks_in(self._item_category(item))
+				new_done = any(not t.done for t in tasks)
+				changes.extend((t.id, new_done) for t in tasks)
 			else:
-				# un-completing: decrement the day it was last completed
-				meta = self.task_meta.get(it)
-				if meta and meta.get("last_completed_date"):
-					self._dec_daily(meta["last_completed_date"])
-					meta["last_completed_date"] = None
+				changes.append((task.id, not task.done))
+		self._set_tasks_done(changes)
 
+	def _toggle_tasks(self, task_ids):
+		"""Toggle completion of the given tasks (used by the alternate views)."""
+		self._set_tasks_done([(tid, not self.store.tasks[tid].done) for tid in task_ids if tid in self.store])
+
+	def _set_tasks_done(self, changes):
+		"""Apply (task id, done) changes to the store, stats, XP and the tree."""
+		# Track XP gains
+		xp_gained = 0
 		categories_to_update = set()
-		for item in selection:
-			parent = self.tree.parent(item)
-			if not parent:
-				# category node
-				cat_label = self.tree.item(item, "text").split(" (")[0]
-				children = self.tree.get_children(item)
-				any_incomplete = any((self.tree.item(ch).get("values") or ["[ ]"])[0] == "[ ]" for ch in children)
-				new_val = "[x]" if any_incomplete else "[ ]"
-				for ch in children:
-					set_status_and_stats(ch, new_val)
-				categories_to_update.add(cat_label)
-			else:
-				# task node
-				cur = (self.tree.item(item).get("values") or ["[ ]"])[0]
-				new_val = "[x]" if cur == "[ ]" else "[ ]"
-				set_status_and_stats(item, new_val)
-				cat_label = self.tree.item(parent, "text").split(" (")[0]
-				categories_to_update.add(cat_label)
+		for task_id, done in changes:
+			# Completing counts for today; un-completing decrements the day it was completed
+			changed, stats_day = completion_stats.set_done(self.store, self.stats_daily, task_id, done,
+														   self._today_str())
+			if not changed:
+				continue
+			if done:
+				# Award XP for completing task
+				xp_gained += self.XP_PER_TASK
+			if stats_day:
+				self._stats_day_changed(stats_day)
+				self._backend_append({"op": "stats", "day": stats_day, "count": self.stats_daily[stats_day]})
+			task = self.store.get(task_id)
+			self._refresh_task_row(task)
+			self._retag_task(task)
+			categories_to_update.add(task.category)
 		
 		for cat in categories_to_update:
 			self._update_category_count(cat)
@@ -6453,27 +7285,32 @@ class TodoApp:
 		if xp_gained > 0:
 			self._award_xp(xp_gained)
 		self._update_stats_view()
-		# Apply alternating rows after toggling tasks
-		self._apply_alternating_rows()
-		
-		# Refresh current view if not in Tree mode
-		self._refresh_current_view()
 
 	def clear_completed(self):
 		if not messagebox.askyesno("Clear", "Remove all completed tasks?"):
 			return
 		# Iterate categories
-		for name, cat_id in list(self.categories.items()):
-			for child in list(self.tree.get_children(cat_id)):
-				vals = self.tree.item(child).get("values") or [""]
-				if vals[0] == "[x]":
-					self.tree.delete(child)
+		for name in self.store.category_names():
+			first_removed = None
+			for idx, task in enumerate(self.store.tasks_in(name)):
+				if task.done:
+					if first_removed is None:
+						first_removed = idx
+					self.store.remove_task(task.id)
+					self._delete_task_row(task.id)
+			if first_removed is None:
+				continue
 			self._update_category_count(name)
 			# Remove empty category
-			if not self.tree.get_children(cat_id):
-				self.tree.delete(cat_id)
-				self.categories.pop(name, None)
-				self.category_colors.pop(name, None)
+			if not self.store.categories[name].task_ids:
+				self.store.remove_category(name)
+				cat_id = self.categories.pop(name, None)
+				self._count_labels.pop(name, None)
+				self._materialized.discard(name)
+				if cat_id:
+					self.tree.delete(cat_id)
+			else:
+				self._retag_rows(name, first_removed)
 		self._update_category_choices()
 
 	def save_tasks(self, path=None, show_error=True):
@@ -6485,188 +7322,130 @@ class TodoApp:
 				return False
 
 		try:
-			# Collect tasks by category from tree
-			tasks_by_category = {}
-			categories_meta = []
-			for name, cat_id in self.categories.items():
-				clean_name = name  # internal key name
-				# derive original name from label
-				clean_name = name
-				# read open state
-				open_state = bool(self.tree.item(cat_id, 'open'))
-				categories_meta.append({
-					"name": clean_name,
-					"open": open_state,
-					"color": self.category_colors.get(clean_name)
-				})
-				items = []
-				for child in self.tree.get_children(cat_id):
-					text = self.tree.item(child, "text")
-					vals = self.tree.item(child).get("values") or ["[ ]", "➡️", ""]
-					priority_symbol = vals[1] if len(vals) > 1 else "➡️"
-					deadline = vals[2] if len(vals) > 2 else ""
-					priority_map = {"⬆️": "High", "➡️": "Medium", "⬇️": "Low"}
-					priority = priority_map.get(priority_symbol, "Medium")
-					item_data = {
-						"text": text,
-						"done": vals[0] == "[x]",
-						"priority": priority,
-						"deadline": deadline if deadline else None
-					}
-					# Persist last completed date if available
-					meta = self.task_meta.get(child)
-					if meta and meta.get("last_completed_date") and item_data["done"]:
-						item_data["completed_date"] = meta["last_completed_date"]
-					items.append(item_data)
-				tasks_by_category[clean_name] = items
-			data = {
-				"theme": self.theme_var.get(),
-				"tasks_by_category": tasks_by_category,
-				"categories": categories_meta,
-				"stats": {"daily_counts": self.stats_daily}
-			}
-			with open(path, "w", encoding="utf-8") as f:
-				json.dump(data, f, ensure_ascii=False, indent=2)
+			# Streamed from the store, without building the whole document first
+			save_file(path, self.store, self._tasks_extras(), compact=self.settings.get("compact_json", False))
 			return True
 		except Exception as e:
 			if show_error:
 				messagebox.showerror("Error", f"Failed to save: {e}")
 			return False
 
+	def _rebuild_tree(self):
+		"""Recreate every tree row from the store in one batch.
+		
+		Category rows are detached while their children are inserted so Tk
+		does not lay out the tree per row; tags and count labels are written
+		at insert time instead of in separate passes.
+		"""
+		tree = self.tree
+		old_rows = tree.get_children("")
+		if old_rows:
+			tree.delete(*old_rows)
+		self.categories.clear()
+		self._category_tags.clear()
+		self._row_tags.clear()
+		self._count_labels.clear()
+		self._materialized.clear()
+		for timer in self._collapse_timers.values():
+			self.root.after_cancel(timer)
+		self._collapse_timers.clear()
+		self._tag_today = date.today().isoformat()
+		for name, cat in self.store.categories.items():
+			self._assign_category_color(cat)
+			counts = (cat.done, len(cat.task_ids))
+			cat_id = tree.insert("", "end", text=f"{name} ({counts[0]}/{counts[1]})", values=("",),
+								 open=cat.open, tags=(f"cat:{name}",))
+			tree.detach(cat_id)
+			self.categories[name] = cat_id
+			self._count_labels[name] = counts
+			# Only expanded categories get their rows now
+			if cat.open:
+				self._materialize_category(name)
+			else:
+				self._sync_placeholder(name)
+		for idx, cat_id in enumerate(self.categories.values()):
+			tree.move(cat_id, "", idx)
+		self._refresh_all_category_colors()
+		self._update_category_choices()
+
+	def _apply_loaded_fields(self, fields):
+		"""Take stats and theme from a freshly loaded document and rebuild the tree.
+
+		fields holds the document's top-level keys, or None for a bare task list.
+		"""
+		theme = None
+		if fields is not None:
+			stats = fields.get("stats", {})
+			self.stats_daily = dict(stats.get("daily_counts", {}))
+			self._stats_series = None
+			theme = fields.get("theme") or DEFAULT_THEME
+		theme_changed = theme in self.themes and theme != self.theme_var.get()
+		if theme_changed:
+			self.theme_var.set(theme)
+			self.current_theme = self.themes[theme]
+		self._rebuild_tree()
+		if theme_changed:
+			self.change_theme()
+		else:
+			self._update_stats_view()
+
 	def load_tasks(self, startup=False):
-		def populate_from_tasks_list(tasks_list):
-			# Backward compatibility: list of tasks with optional category
-			for t in tasks_list:
-				name = t.get("category", "General")
-				cat_id = self._ensure_category(name)
-				status = "[x]" if bool(t.get("done", False)) else "[ ]"
-				priority = t.get("priority", "Medium")
-				priority_symbol = self._priority_symbol(priority)
-				child = self.tree.insert(cat_id, "end", text=t.get("text", ""), values=(status, priority_symbol))
-				completed_date = t.get("completed_date")
-				if completed_date:
-					self.task_meta[child] = {"last_completed_date": completed_date}
-				self._update_category_count(name)
-		def clear_tree():
-			for it in self.tree.get_children(""):
-				self.tree.delete(it)
-			self.categories.clear()
-			self.category_colors = {}
-			self.task_meta = {}
 		if startup:
-			try:
-				with open(TASKS_FILE, "r", encoding="utf-8") as f:
-					data = json.load(f)
-					clear_tree()
-					if isinstance(data, dict):
-						# New hierarchical format
-						if "tasks_by_category" in data:
-							for cat in data.get("categories", []):
-								name = cat.get("name", "General")
-								open_state = bool(cat.get("open", True))
-								color = cat.get("color")
-								self._ensure_category(name, open_state=open_state, color=color)
-							for name, items in data.get("tasks_by_category", {}).items():
-								cat_id = self._ensure_category(name)
-								for it in items:
-									status = "[x]" if bool(it.get("done", False)) else "[ ]"
-									priority = it.get("priority", "Medium")
-									priority_symbol = self._priority_symbol(priority)
-									deadline = it.get("deadline", "")
-									child = self.tree.insert(cat_id, "end", text=it.get("text", ""), 
-														   values=(status, priority_symbol, deadline))
-									# Restore metadata
-									if child not in self.task_meta:
-										self.task_meta[child] = {}
-									comp = it.get("completed_date")
-									if comp:
-										self.task_meta[child]["last_completed_date"] = comp
-									if deadline:
-										self.task_meta[child]["deadline"] = deadline
-								self._sort_category_by_priority(cat_id)
-								self._update_category_count(name)
-						elif "tasks" in data:
-							populate_from_tasks_list(data.get("tasks", []))
-						# Apply alternating row colors after loading
-						self._apply_alternating_rows()
-						# Theme
-						theme = data.get("theme", DEFAULT_THEME)
-						if theme in self.themes:
-							self.theme_var.set(theme)
-							self.change_theme()
-						# Stats
-						stats = data.get("stats", {})
-						self.stats_daily = dict(stats.get("daily_counts", {}))
-					elif isinstance(data, list):
-						populate_from_tasks_list(data)
-			except Exception:
-				# Start with empty
-				clear_tree()
-			self._update_category_choices()
-			self._update_stats_view()
+			# Same loader as the command line: tasks.db or tasks.json plus its journal
+			loaded, fields, self._journal_replayed = workspace.load_tasks(
+				TASKS_FILE, TASKS_DB, self.settings.get("storage_backend", "json"))
+			self.store.adopt(loaded)
+			self._apply_loaded_fields(fields)
 			return
-
 		path = filedialog.askopenfilename(defaultextension=".json",
 										  filetypes=[("JSON files","*.json"),("All files","*.*")])
 		if not path:
 			return
 		try:
-			with open(path, "r", encoding="utf-8") as f:
-				data = json.load(f)
-				clear_tree()
-				if isinstance(data, dict):
-					if "tasks_by_category" in data:
-						for cat in data.get("categories", []):
-							name = cat.get("name", "General")
-							open_state = bool(cat.get("open", True))
-							color = cat.get("color")
-							self._ensure_category(name, open_state=open_state, color=color)
-						for name, items in data.get("tasks_by_category", {}).items():
-							cat_id = self._ensure_category(name)
-							for it in items:
-								status = "[x]" if bool(it.get("done", False)) else "[ ]"
-								priority = it.get("priority", "Medium")
-								priority_symbol = self._priority_symbol(priority)
-								deadline = it.get("deadline", "")
-								child = self.tree.insert(cat_id, "end", text=it.get("text", ""), 
-													   values=(status, priority_symbol, deadline))
-								# Restore metadata
-								if child not in self.task_meta:
-									self.task_meta[child] = {}
-								comp = it.get("completed_date")
-								if comp:
-									self.task_meta[child]["last_completed_date"] = comp
-								if deadline:
-									self.task_meta[child]["deadline"] = deadline
-							self._sort_category_by_priority(cat_id)
-							self._update_category_count(name)
-					elif "tasks" in data:
-						populate_from_tasks_list(data.get("tasks", []))
-					# Theme
-					theme = (data.get("theme") if isinstance(data, dict) else DEFAULT_THEME) or DEFAULT_THEME
-					if theme in self.themes:
-						self.theme_var.set(theme)
-						self.change_theme()
-					# Stats
-					stats = data.get("stats", {})
-					self.stats_daily = dict(stats.get("daily_counts", {}))
-				elif isinstance(data, list):
-					populate_from_tasks_list(data)
+			# Streams tasks into a fresh store (the current one stays intact if
+			# this fails); falls back to the newest good backup if the file is damaged
+			loaded, fields, source = load_file(path)
+			if source != path:
+				print(f"{path} could not be read; loaded backup {source}")
 		except Exception as e:
 			messagebox.showerror("Error", f"Failed to load: {e}")
-		self._update_category_choices()
-		self._update_stats_view()
+			return
+		self.store.adopt(loaded)
+		self._apply_loaded_fields(fields)
+		if hasattr(self.task_backend, "write_document_extras"):
+			# Loaded tasks reach the database via the store's reset event
+			self.task_backend.write_document_extras(self.theme_var.get(), self.stats_daily)
 
 	def on_closing(self):
 		"""Handle window closing event"""
-		# Automatically save to the default tasks file
-		if self.save_tasks(TASKS_FILE, show_error=False):
+		# Bank a running timer's time so it is saved and logged
+		if getattr(self, '_daily_timer_running', False):
+			self._daily_pause()
+		# Flush pending autosaves (tasks and settings) before quitting
+		self._queue_autosave()
+		saved = True
+		if self.task_backend is not None:
+			try:
+				saved = self.task_backend.close(timeout=10)
+			except Exception:
+				saved = False
+			self.task_backend = None
+		if self._asset_pipeline is not None:
+			self._asset_pipeline.shutdown()
+			self._asset_pipeline = None
+		if self.autosaver.stop(timeout=10) and saved:
 			self.root.destroy()
 		else:
 			# If auto-save fails, ask user if they want to quit anyway
 			if messagebox.askyesno("Save Failed", 
 								"Failed to save tasks automatically. Quit anyway?"):
 				self.root.destroy()
+			else:
+				# Keep running with a fresh worker and retry on the next tick
+				self.autosaver = Autosaver(interval=3.0)
+				self._open_task_backend(resync=True)
+				self._tasks_dirty = True
+				self._settings_dirty = True
 
 	# --- Drag & drop handlers ---
 	def _on_tree_press(self, event):
@@ -6703,18 +7482,25 @@ class TodoApp:
 			if not t_parent:
 				index = self.tree.index(target)
 				self.tree.move(source, "", index)
+				self.store.reorder_categories([self._item_category(c) for c in self.tree.get_children("")])
 			return
 		# Source is task; move under target category
-		cat_label = self.tree.item(target_cat_id, "text").split(" (")[0]
-		self.tree.move(source, target_cat_id, "end")
+		cat_label = self._item_category(target_cat_id)
+		old_cat = self.store.tasks[source].category
+		old_idx = self.store.categories[old_cat].task_ids.index(source)
+		task = self.store.move_task(source, cat_label)
+		self._move_task_row(task)
 		# Tasks keep theme text color (do not tag tasks with category color)
 		# Update counts for both categories
-		if s_parent:
-			old_cat = self.tree.item(s_parent, "text").split(" (")[0]
-			self._update_category_count(old_cat)
+		self._update_category_count(old_cat)
 		self._update_category_count(cat_label)
+		self._retag_rows(old_cat, old_idx)
+		self._retag_rows(cat_label, len(self.store.categories[cat_label].task_ids) - 1)
 
 if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		from todo_core.cli import main
+		sys.exit(main(sys.argv[1:], data_dir=DATA_DIR))
 	root = tk.Tk()
 	# Set minimum window size to ensure all buttons are visible
 	root.minsize(600, 400)